@@ -0,0 +1,57 @@
+#!/usr/bin/python
+
+'''
+Regression benchmark of the iterative METE SAR (mete_sar_iter).
+
+Usage: python bench_mete_sar_iter.py
+
+Upscales 20 doublings from N = 1e5, so that the largest area has about 1e11
+individuals. The first doublings are checked against direct summation over
+full abundance arrays, which is what the previous implementation did and is
+only feasible for small N.
+'''
+
+from __future__ import division
+import time
+import numpy as np
+import scipy.optimize
+from macroeco.distributions import mete_sar_iter
+
+S = 100
+N = 1e5
+NUM_UP = 20
+NUM_CHECK = 3
+
+
+def direct_upscale(n_samp, tot_obs):
+    '''Species in twice the area by summation over 1..2 * tot_obs'''
+    N2A = 2 * tot_obs
+    k = np.arange(1, N2A + 1)
+
+    def sums(beta):
+        x_k = np.exp(-beta * k)
+        return np.sum(x_k / k), np.sum(x_k / (k + 1)), np.sum(x_k)
+
+    def eq(t):
+        L, Q, G = sums(np.exp(t))
+        return N2A * Q / G - n_samp
+
+    beta = np.exp(scipy.optimize.brentq(eq, np.log(1e-10 / N2A), np.log(50)))
+    L, Q, G = sums(beta)
+    return N2A * L / G
+
+
+if __name__ == '__main__':
+    start = time.time()
+    sar = mete_sar_iter(n_samp=S, tot_obs=N).iter_vals(upscale=NUM_UP)
+    elapsed = time.time() - start
+    print '%i doublings from N = %.0e in %.3f s' % (NUM_UP, N, elapsed)
+    print '%8s %12s %14s' % ('area', 'N', 'S')
+    for area, items in zip(sar['area'], sar['items']):
+        print '%8.0f %12.3e %14.6f' % (area, N * area, items)
+
+    print '\n%8s %14s %14s %10s' % ('area', 'S', 'direct S', 'rel diff')
+    for i in xrange(1, NUM_CHECK + 1):
+        direct = direct_upscale(sar['items'][i - 1], N * 2 ** (i - 1))
+        print '%8.0f %14.6f %14.6f %10.2e' % (sar['area'][i], sar['items'][i],
+                        direct, abs(direct - sar['items'][i]) / direct)
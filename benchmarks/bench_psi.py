@@ -0,0 +1,62 @@
+#!/usr/bin/python
+
+'''
+Benchmark of the psi individual energy distribution on large communities.
+
+Usage: python bench_psi.py
+
+Draws an IED of tot_obs individuals and times psi.logpdf, psi.cdf and
+psi.rad on it in one call each. The log-likelihood is compared with that of
+the direct closed-form pdf (Harte 2011, 7.24), and the number of non-finite
+values from each is reported.
+'''
+
+from __future__ import division
+import time
+import numpy as np
+from macroeco.distributions import psi
+
+COMMUNITIES = [(50, 1e4, 5e4), (100, 1e5, 5e5), (100, 1e6, 5e6),
+               (1000, 1e6, 1e9)]
+
+
+def direct_pdf(e, S, N, E, beta, l2):
+    '''The psi pdf evaluated term by term from the closed form.'''
+    sigma = beta + (E - 1) * l2
+    norm = (S / (l2 * N)) * (((np.exp(-beta) - np.exp(-beta * (N + 1))) /
+            (1 - np.exp(-beta))) - ((np.exp(-sigma) - np.exp(-sigma *
+            (N + 1))) / (1 - np.exp(-sigma))))
+    g = np.exp(-(beta + (e - 1) * l2))
+    return (S / (N * norm)) * g * (1 - ((N + 1) * g ** N) +
+                                   (N * g ** (N + 1))) / ((1 - g) ** 2)
+
+
+if __name__ == '__main__':
+    print '%8s %8s %10s %10s %10s %10s %16s %10s' % ('S', 'N', 'logpdf (s)',
+                'cdf (s)', 'rad (s)', 'direct (s)', 'loglik diff', 'nonfinite')
+    for S, N, E in COMMUNITIES:
+        dist = psi(n_samp=S, tot_obs=N, E=E, solver='closed')
+        ied = dist.rvs(int(N), random_state=0)[0]
+
+        start = time.time()
+        logpdf = dist.logpdf(ied)[0]
+        t_logpdf = time.time() - start
+
+        start = time.time()
+        dist.cdf(ied)
+        t_cdf = time.time() - start
+
+        start = time.time()
+        dist.rad()
+        t_rad = time.time() - start
+
+        beta, l2 = dist.var['beta'][0], dist.var['lambda_2'][0]
+        start = time.time()
+        with np.errstate(all='ignore'):
+            direct = np.log(direct_pdf(ied, S, N, E, beta, l2))
+        t_direct = time.time() - start
+
+        print '%8d %8d %10.4f %10.4f %10.4f %10.4f %16.6e %5d/%-4d' % (S, N,
+                t_logpdf, t_cdf, t_rad, t_direct,
+                np.sum(logpdf) - np.sum(direct),
+                np.sum(~np.isfinite(logpdf)), np.sum(~np.isfinite(direct)))
@@ -0,0 +1,43 @@
+#!/usr/bin/python
+
+'''
+Benchmark of Distribution.rvs.
+
+Usage: python bench_rvs.py
+
+Times the first call, which builds the alias table for finite-support
+distributions, and the best of repeated calls that reuse it, and reports
+variates drawn per second.
+'''
+
+from __future__ import division
+import time
+from macroeco.distributions import logser_ut, tgeo, fnbd, logser, nbd, pois
+
+SIZE = 10 ** 6
+REPS = 3
+
+DISTS = [('logser_ut', logser_ut(n_samp=200, tot_obs=1e6, solver='closed')),
+         ('tgeo', tgeo(n_samp=4, tot_obs=1e5)),
+         ('fnbd', fnbd(n_samp=4, tot_obs=1e5, k=.5)),
+         ('logser', logser(n_samp=200, tot_obs=1e6)),
+         ('nbd', nbd(n_samp=4, tot_obs=1e5, k=.5)),
+         ('pois', pois(n_samp=4, tot_obs=1e5))]
+
+
+if __name__ == '__main__':
+    print '%10s %12s %12s %14s' % ('dist', 'first (s)', 'cached (s)',
+                                   'variates / s')
+    for name, dist in DISTS:
+        start = time.time()
+        dist.rvs(SIZE, random_state=0)
+        first = time.time() - start
+
+        best = None
+        for i in xrange(REPS):
+            start = time.time()
+            dist.rvs(SIZE, random_state=i + 1)
+            elapsed = time.time() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        print '%10s %12.4f %12.4f %14.3e' % (name, first, best, SIZE / best)
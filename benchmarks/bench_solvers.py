@@ -0,0 +1,50 @@
+#!/usr/bin/python
+
+'''
+Benchmark the 'sum' and 'closed' methods of solvers.mete_x.
+
+Usage: python bench_solvers.py [--all]
+
+By default the 'sum' method is skipped at N = 1e8, where it allocates several
+arrays of length N on every root iteration (roughly 2.5 GB). Pass --all to run
+it anyway.
+'''
+
+from __future__ import division
+import sys
+import time
+from macroeco.solvers import mete_x, clear_beta_cache
+
+S = 200
+N_LIST = [1e4, 1e6, 1e8]
+MAX_SUM_N = 1e7
+
+
+def time_solve(n_samp, tot_obs, method, reps):
+    '''Best time in seconds of reps uncached solves'''
+    best = None
+    for i in xrange(reps):
+        clear_beta_cache()
+        start = time.time()
+        tx = mete_x(n_samp, tot_obs, method=method)
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, tx
+
+
+if __name__ == '__main__':
+    run_all = '--all' in sys.argv[1:]
+
+    print '%8s %12s %12s %10s %14s' % ('N', 'sum (s)', 'closed (s)',
+                                        'speedup', '|x diff|')
+    for N in N_LIST:
+        closed_time, closed_x = time_solve(S, N, 'closed', 5)
+        if N <= MAX_SUM_N or run_all:
+            sum_time, sum_x = time_solve(S, N, 'sum', 1 if N > 1e5 else 5)
+            print '%8.0e %12.4f %12.6f %10.1f %14.2e' % (N, sum_time,
+                    closed_time, sum_time / closed_time, abs(sum_x - closed_x))
+        else:
+            print '%8.0e %12s %12.6f %10s %14s' % (N, 'skipped', closed_time,
+                                                   '-', '-')
+    clear_beta_cache()
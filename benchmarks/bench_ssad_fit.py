@@ -0,0 +1,57 @@
+#!/usr/bin/python
+
+'''
+Benchmark of fitting the aggregation parameter k of SSAD distributions.
+
+Usage: python bench_ssad_fit.py
+
+Fits NUM_SSADS simulated species-level spatial abundance distributions at
+once with each fit method and reports the time taken and the median
+relative difference in k from the method used in earlier versions, 'fmin'
+for the nbd and 'brute' for the fnbd. Near-Poisson SSADs have a likelihood
+that is flat in k above about 1e6, so the largest differences only reflect
+where each method stops on that plateau.
+'''
+
+from __future__ import division
+import time
+import numpy as np
+from macroeco.distributions import nbd, nbd_lt, fnbd
+
+NUM_SSADS = 500
+NUM_CELLS = 1024
+
+FITS = [('nbd', nbd, 'newton'), ('nbd', nbd, 'fmin'),
+        ('nbd_lt', nbd_lt, 'newton'), ('nbd_lt', nbd_lt, 'fmin'),
+        ('fnbd', fnbd, 'profile'), ('fnbd', fnbd, 'brute')]
+REFERENCE = ['fmin', 'brute']
+
+
+def simulate(random_state):
+    '''SSADs with log-uniform k and mean abundance per cell.'''
+    k = np.exp(random_state.uniform(np.log(.05), np.log(20), NUM_SSADS))
+    mu = np.exp(random_state.uniform(np.log(.5), np.log(50), NUM_SSADS))
+    return [random_state.negative_binomial(tk, tk / (tk + tmu),
+                        size=NUM_CELLS) for tk, tmu in zip(k, mu)]
+
+
+if __name__ == '__main__':
+    data = simulate(np.random.RandomState(0))
+    data = {'nbd' : [tdata for tdata in data if np.any(tdata > 0)],
+            'fnbd' : [tdata for tdata in data if np.any(tdata > 0)],
+            'nbd_lt' : [tdata[tdata > 0] for tdata in data
+                                         if np.sum(tdata > 0) > 1]}
+
+    print '%8s %8s %10s %12s' % ('dist', 'method', 'time (s)', 'med rel dk')
+    k_ref = {}
+    results = []
+    for name, dist, method in FITS:
+        start = time.time()
+        k = dist().fit(data[name], method=method).params['k']
+        results.append((name, method, time.time() - start, k))
+        if method in REFERENCE:
+            k_ref[name] = k
+
+    for name, method, elapsed, k in results:
+        print '%8s %8s %10.4f %12.3e' % (name, method, elapsed,
+                            np.median(np.abs(k - k_ref[name]) / k_ref[name]))
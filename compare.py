@@ -29,6 +29,7 @@ CompareASED : Compares predicted average species-level energy distributions
 Functions
 ---------
 -`empirical_cdf` -- Empirical cdf for given data
+-`log_likelihoods` -- Log pmf or log pdf of data under a distribution
 -`aic` -- Calculate AIC value
 -`aicc` -- Calculate corectted AIC value
 -`aic_wieghts` -- Calculate AIC weights for models
@@ -204,14 +205,11 @@ class CompareDistribution(object):
         for dist in self.dist_list:
             
             try:
-                nlls = nll(dist.pmf(self.observed_data))
+                nlls = nll(log_likelihoods(dist, self.observed_data), log=True)
             except NotImplementedError:
-                try:
-                    nlls = nll(dist.pdf(self.observed_data))
-                except NotImplementedError:
-                    logging.warning('%s has neither a PMF nor a PDF. AIC set'
-                                            % get_name(dist) + ' to infinity')
-                    nlls = np.repeat(np.inf, len(self.observed_data)) 
+                logging.warning('%s has neither a PMF nor a PDF. AIC set'
+                                        % get_name(dist) + ' to infinity')
+                nlls = np.repeat(np.inf, len(self.observed_data)) 
                     
             #NOTE: dist.par_num is the number of parameters of distribution
             k = np.repeat(dist.par_num, len(nlls))
@@ -351,16 +349,11 @@ class CompareDistribution(object):
         LRT_list = {}
         null_mdl.fit(self.observed_data)
 
-        try:
-            null_nlls = nll(null_mdl.pmf(self.observed_data))
-        except:
-            null_nlls = nll(null_mdl.pdf(self.observed_data))
+        null_nlls = nll(log_likelihoods(null_mdl, self.observed_data),
+                                                                    log=True)
         for i, dist in enumerate(self.dist_list):
             
-            try:
-                alt_nlls = nll(dist.pmf(self.observed_data))
-            except:
-                alt_nlls = nll(dist.pdf(self.observed_data))
+            alt_nlls = nll(log_likelihoods(dist, self.observed_data), log=True)
 
             k = dist.par_num - null_mdl.par_num
             df = np.repeat(k, len(alt_nlls))
@@ -1092,12 +1085,15 @@ class CompareSAR(object):
             pred_sar.append(psar)
         return pred_sar
 
-def nll(pdist):
+def nll(pdist, log=False):
     '''
     Parameters
     ----------
     pdist : list of arrays
         List of pmf values on which to compute the negative log-likelihood
+    log : bool
+        If True, pdist holds log pmf values, as returned by logpmf, and no
+        log is taken. Default False.
 
     Returns
     -------
@@ -1105,8 +1101,35 @@ def nll(pdist):
         List of nll values
 
     '''
+    if log:
+        return [-np.sum(dist) for dist in pdist]
     return [-sum(np.log(dist)) for dist in pdist]
 
+def log_likelihoods(dist, data):
+    '''
+    Log likelihoods of data under a distribution object
+
+    Parameters
+    ----------
+    dist : Distribution object
+        Distribution with its parameters set
+    data : list of arrays
+        Data at which to evaluate the distribution
+
+    Returns
+    -------
+    : list of arrays
+        The logpmf of the data, or the logpdf if dist has no pmf
+
+    Notes
+    -----
+    Raises NotImplementedError if dist has neither a pmf nor a pdf.
+    '''
+    try:
+        return dist.logpmf(data)
+    except NotImplementedError:
+        return dist.logpdf(data)
+
     
 
 def empirical_cdf(emp_data):
@@ -1189,7 +1212,7 @@ def aicc(neg_L, k, n=None, loglik=True):
 
     '''
     if loglik:
-        assert n != None, 'n argument must be given if loglik is True'
+        assert n is not None, 'n argument must be given if loglik is True'
         neg_L, k, n = cnvrt_to_arrays(neg_L, k, n)
     else:
         n = np.array([len(tneg_L) for tneg_L in neg_L])
@@ -1225,7 +1248,9 @@ def aic_weights(aic_values):
     aic_values = cnvrt_to_arrays(aic_values)[0]
     aic_values = np.array(aic_values)
     minimum = np.min(aic_values) 
-    delta = np.array([x - minimum for x in aic_values])
+
+    # Models tied at the minimum have delta 0, also when it is inf
+    delta = np.array([0 if x == minimum else x - minimum for x in aic_values])
     values = np.exp(-delta / 2)
     weights = np.array([x / sum(values) for x in values])
     return weights, delta
@@ -1286,7 +1311,7 @@ def likelihood_ratio(nll_null, nll_alt, df_list):
     # Calculate G^2 statistic
     ll_null = nll_null * -1; ll_alt = nll_alt * -1
     test_stat = 2 * (ll_null - ll_alt) 
-    return [(ts, stats.chisqprob(ts, df)) for ts, df in zip(test_stat, df_list)]
+    return [(ts, stats.chi2.sf(ts, df)) for ts, df in zip(test_stat, df_list)]
 
 def variance(data_sets):
     '''Calculates the variance of the given data_sets
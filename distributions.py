@@ -24,6 +24,7 @@ SAD
 
 SAR
 - `mete_sar_iter` - METE sar functions (Harte 2011)
+- `MeteZTable` - Precomputed universal METE z against N/S
 - `powerlaw` - Power law sar
 - `gen_sar` - A generic sar that supports any sad and ssad distribution. 
 
@@ -44,11 +45,24 @@ Energy Distributions
 
 Misc Functions
 --------------
+- `LowerTruncated` -- Mixin truncating a distribution below one
 - `make_array` 
 - `make_rank_abund` 
+- `make_rank_abund_stream`
+- `check_random_state`
+- `_sugihara_sums`
 - `_ln_choose`
+- `_ssad_args`
+- `_fnbd_ln_p_absent`
+- `_fnbd_ln_p_endemic`
+- `_pln_ln_pmf`
+- `_pln_nll`
 - `_downscale_sar_`
 - `_upscale_sar_`
+- `build_mete_z_table`
+- `load_mete_z_table`
+- `mete_universal_z`
+- `_mete_z_at`
 - `_generate_areas_`
 - `expand_n`
 - `check_list_of_iterables`
@@ -105,12 +119,22 @@ import numpy as np
 import scipy.stats as stats
 import scipy.optimize 
 import scipy.special
-from copy import deepcopy
+from copy import copy, deepcopy
 import math as m
 import scipy.integrate as integrate
 import sys
+import time
+import multiprocessing
+import tempfile
 #from docinherit import DocInherit
 from macroeco.utils.docinherit import DocInherit
+import os
+import json
+from macroeco.solvers import (beta_solver, mete_x, trunc_log_sum,
+                              tgeo_lambda, tgeo_log_norm, mete_upscale_sar,
+                              mete_downscale_sar)
+import macroeco.solvers as solvers
+from macroeco.utils.lru_cache import LRUCache
 
 doc_inherit = DocInherit
 
@@ -123,6 +147,14 @@ __maintainer__ = "Justin Kitzes and Mark Wilber"
 __email__ = "jkitzes@berkeley.edu"
 __status__ = "Development"
 
+# Version of the on-disk universal METE z table. Tables with other versions
+# are ignored.
+Z_TABLE_VERSION = 1
+Z_TABLE_NAME = 'mete_z_table_v%i' % Z_TABLE_VERSION
+
+# Tables loaded by load_mete_z_table, keyed on directory
+_loaded_z_tables = {}
+
 # TODO: Add truncated log-normal?
 
 # TODO: For all subclass inits - what to do if fit method later tries to
@@ -269,12 +301,12 @@ class Curve(object):
 
         else:
             def z(a):
-                a1 = self.vals(a, use_rad=use_rad)['items']
-
-                a2 = np.array(list(self.vals(((1./base) * a)[0],
-                        use_rad=use_rad)['items']) + list(a1[:-1]))
-                a3 = np.array(list(a1[1:]) +  list(self.vals((base *
-                                            a)[-1], use_rad=use_rad)['items']))
+                # Evaluate the union of the areas in a single call to vals
+                na = np.concatenate(([a[0] / base], a, [base * a[-1]]))
+                complete_a = self.vals(na, use_rad=use_rad)['items']
+                a1 = complete_a[1:-1]
+                a2 = complete_a[:-2]
+                a3 = complete_a[2:]
                 return (0.5 * (np.log(a3 / a2))) / np.log(base), a1, zip(a1, a)
         
         # Get the area list
@@ -299,6 +331,66 @@ class Curve(object):
         return uni, np.array(spp_area, dtype=[('items', np.float),
                                                   ('area', np.float)])
 
+    def univ_curve_batch(self, n_samp, tot_obs, num_iter=5, direction='down',
+                         param='tot_obs', iterative=False, base=2, use_rad=False):
+        '''
+        Generate universal curves for many anchor pairs of n_samp (S) and
+        tot_obs (N) in a single call. See univ_curve.
+
+        Parameters
+        ----------
+        n_samp : float or array-like
+            Number of species (items) at the anchor scale
+        tot_obs : float or array-like
+            Number of individuals at the anchor scale. Broadcast against
+            n_samp, and the broadcast pairs are flattened in C order.
+        num_iter, direction, param, iterative, base, use_rad
+            See univ_curve
+
+        Returns
+        -------
+        : tuple
+            Two 2D structured arrays with one row per anchor pair, in the
+            flattened order of the broadcast n_samp and tot_obs, and the
+            fields of the two arrays returned by univ_curve, plus the fields
+            'n_samp' and 'tot_obs' of the anchor pair.
+
+        Notes
+        -----
+        self and self.params are not modified. Each pair is evaluated on a
+        copy of self that shares its caches (e.g. the sad and occupancy
+        caches of gen_sar), so pairs with overlapping communities reuse each
+        other's work.
+
+        '''
+        n_samp, tot_obs = [arr.ravel() for arr in
+                           np.broadcast_arrays(n_samp, tot_obs)]
+        uni_dtype = [('n_samp', np.float), ('tot_obs', np.float),
+                     ('z', np.float), ('x_over_y', np.float)]
+        sar_dtype = [('n_samp', np.float), ('tot_obs', np.float),
+                     ('items', np.float), ('area', np.float)]
+        results = []
+        for S, N in zip(n_samp, tot_obs):
+            curve = copy(self)
+            curve.params = dict(self.params, n_samp=S, tot_obs=N)
+            if hasattr(self, 'var'):
+                curve.var = {}
+            results.append(curve.univ_curve(num_iter=num_iter,
+                                direction=direction, param=param,
+                                iterative=iterative, base=base,
+                                use_rad=use_rad))
+
+        unis = np.empty((len(n_samp), len(results[0][0])), dtype=uni_dtype)
+        sars = np.empty((len(n_samp), len(results[0][1])), dtype=sar_dtype)
+        for i, (S, N) in enumerate(zip(n_samp, tot_obs)):
+            for arr, vals in zip([unis, sars], results[i]):
+                arr['n_samp'][i] = S
+                arr['tot_obs'][i] = N
+                for field in vals.dtype.names:
+                    arr[field][i] = vals[field]
+
+        return unis, sars
+
     def get_params(self, parameter_list):
         '''
         Gets and validates basic distribution parameters
@@ -343,6 +435,12 @@ class Distribution(object):
     var : dict
         A dictionary of useful variables that are computed internally to
         generate pmf, pdf, cdf, or rad. 
+    cdf_cache_size : int
+        Number of cumulative tables, one per parameter set, that the default
+        cdf method keeps for reuse
+    alias_cache_size : int
+        Number of alias tables, one per parameter set, that the default rvs
+        method keeps for reuse
 
     Methods
     -------
@@ -350,10 +448,20 @@ class Distribution(object):
         Probability density function
     pmf(n)
         Probability mass function
+    logpdf(n)
+        Log of the probability density function
+    logpmf(n)
+        Log of the probability mass function
     cdf(n)
         Cumulative distribution function
     rad()
         Rank abundance distribution, calculated from cdf
+    rvs(size, random_state)
+        Random variates
+    p_absent(abundances, cell_fraction)
+        Probability of zero individuals in a cell, used by SSADs
+    p_endemic(abundances, cell_fraction)
+        Probability of all individuals in a cell, used by SSADs
     fit(data)
         Uses data to populate params attribute
 
@@ -375,6 +483,16 @@ class Distribution(object):
 
     '''
 
+    # Number of cumulative tables kept by the default cdf
+    cdf_cache_size = 32
+
+    # Number of alias tables kept by the default rvs
+    alias_cache_size = 32
+
+    # Attributes other than params that the pmf depends on, included in the
+    # keys of _param_key
+    key_attrs = ()
+
     def __init__(self, **kwargs):
         '''
         Initialize distribution object.
@@ -441,8 +559,59 @@ class Distribution(object):
         raise NotImplementedError('PDF is not implemented for this' + 
                                   ' Distribution class')
 
+    def logpmf(self, n):
+        '''
+        Log of the probability mass function.
 
-    def cdf(self, n):
+        Parameters
+        ----------
+        n : int, float or array-like object
+            Values at which to calculate the log pmf. May be a list of same
+            length as parameters, or single iterable.
+
+        Returns
+        -------
+        logpmf : list of ndarrays
+            List of 1D arrays of the log probability of observing sample n.
+
+        Notes
+        -----
+        The default takes the log of pmf, giving -inf where the pmf is zero or
+        has underflowed. Derived classes override it with kernels evaluated in
+        log space wherever they can.
+
+        See class docstring for more specific information on this distribution.
+        '''
+        with np.errstate(divide='ignore'):
+            return [np.log(tpmf) for tpmf in self.pmf(n)]
+
+    def logpdf(self, n):
+        '''
+        Log of the probability density function.
+
+        Parameters
+        ----------
+        n : int, float or array-like object
+            Values at which to calculate the log pdf. May be a list of same
+            length as parameters, or single iterable.
+
+        Returns
+        -------
+        logpdf : list of ndarrays
+            List of 1D arrays of the log probability density at sample n.
+
+        Notes
+        -----
+        The default takes the log of pdf. Derived classes override it with
+        kernels evaluated in log space wherever they can.
+
+        See class docstring for more specific information on this distribution.
+        '''
+        with np.errstate(divide='ignore'):
+            return [np.log(tpdf) for tpdf in self.pdf(n)]
+
+
+    def cdf(self, n, chunk_size=None, tail_tol=1e-12):
         '''
         Cumulative distribution method.  
 
@@ -450,7 +619,19 @@ class Distribution(object):
         ----------
         n : int, float or array-like object
             Values at which to calculate cdf. May be a list of same length as 
-            parameters, or single iterable.
+            parameters, or single iterable. For discrete distributions, the
+            cdf of a non-integer n is that of floor(n), and the cdf of any n
+            below min_supp is 0.
+        chunk_size : int or None
+            If None (default), the pmf is evaluated from min_supp to max(n) in
+            one call. Otherwise it is evaluated in blocks of chunk_size values,
+            stopping once the remaining tail mass is below tail_tol, which
+            bounds memory for large n.
+        tail_tol : float
+            Tail mass below which chunked evaluation stops. The cdf of any n
+            beyond that point is the cumulative mass reached, and the maximum
+            error this introduces is stored in self.var['cdf_trunc_err'],
+            assuming the pmf sums to one over its support.
 
         Returns
         -------
@@ -467,9 +648,25 @@ class Distribution(object):
         # Expand n argument if needed, assumes all params same length
         n = expand_n(n, len(self.params.values()[0]))
 
-        # Calculate pmfs
-        max_n = [np.max(tn) for tn in n]
-        n_in = [np.arange(self.min_supp, i + 1) for i in max_n]
+        if chunk_size is not None:
+            return self._chunked_cdf(n, chunk_size, tail_tol)
+
+        # Look up cumulative tables that reach max(n)
+        n = [np.floor(np.asarray(tn, dtype=float)) for tn in n]
+        max_n = [max(np.max(tn), self.min_supp) for tn in n]
+        keys = [self._param_key(i) for i in xrange(len(n))]
+        tables = []
+        for key, tmax in zip(keys, max_n):
+            table = None if key is None else self._cdf_tables().get(key)
+            if table is not None and len(table) < tmax - self.min_supp + 1:
+                table = None
+            tables.append(table)
+
+        # Calculate pmfs for the parameter sets without a table. Sets with a
+        # table are evaluated at min_supp only, which keeps self.var current
+        n_in = [np.arange(self.min_supp, i + 1) if table is None else
+                np.arange(self.min_supp, self.min_supp + 1) for i, table
+                in zip(max_n, tables)]
 
         # Extend for pdf or pmf
         try:
@@ -478,20 +675,38 @@ class Distribution(object):
         except(NotImplementedError):
             pmf_list = self.pmf(n_in)
 
+        for i, tpmf in enumerate(pmf_list):
+            if tables[i] is None:
+                tables[i] = np.cumsum(tpmf)
+                if keys[i] is not None:
+                    self._cdf_tables().set(keys[i], tables[i])
+
         # Calculate cdfs
         cdf = []
-        for tpmf, tn in zip(pmf_list, n):
-            full_cdf = np.cumsum(tpmf)
-            tcdf = np.array([full_cdf[x - self.min_supp] for x in tn])
+        for table, tn in zip(tables, n):
+            tcdf = np.zeros(tn.shape)
+            in_supp = tn >= self.min_supp
+            tcdf[in_supp] = table[(tn[in_supp] - self.min_supp).astype(int)]
             cdf.append(tcdf)
 
         return cdf 
 
 
-    def rad(self):
+    def rad(self, chunk_size=None, tail_tol=1e-12):
         '''
         Rank abundance distribution method, calculates rad using pmf.
 
+        Parameters
+        ----------
+        chunk_size : int or None
+            If None (default), the pmf is evaluated from min_supp to tot_obs
+            in one call. Otherwise it is evaluated in blocks of chunk_size
+            values, stopping once every species is ranked or the remaining
+            tail mass is below tail_tol, which bounds memory for large tot_obs.
+        tail_tol : float
+            Tail mass below which chunked evaluation stops. The mass that was
+            never evaluated is stored in self.var['rad_trunc_err'].
+
         Returns
         -------
         rad : list of ndarrays
@@ -503,11 +718,21 @@ class Distribution(object):
         # Get parameters
         n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
 
-        # TODO: Add error or warning if tot_obs is large enough that python is slow
-        # FIX: Throw warning that tot_obs is large and that calculation will take
-        # awhile.  tot_obs > 100,000. Base CDF should thrown the same warning. 
-
-        # Calculate pmfs, going up to tot_obs for upper limit
+        if chunk_size is not None:
+            rad = []
+            trunc_err = []
+            for i, (tn_samp, ttot_obs) in enumerate(zip(n_samp, tot_obs)):
+                mass = [0]
+                blocks = self._pmf_blocks(i, ttot_obs, chunk_size, tail_tol,
+                                          mass)
+                rad.append(make_rank_abund_stream(blocks, tn_samp,
+                                                  min_supp=self.min_supp))
+                trunc_err.append(max(1 - mass[0], 0))
+            self.var['rad_trunc_err'] = trunc_err
+            return rad
+
+        # Calculate pmfs, going up to tot_obs for upper limit. For large
+        # tot_obs use chunk_size to bound memory.
         n_arrays = [np.arange(self.min_supp, 1*(i + 1)) for i in tot_obs]
         pmf = self.pmf(n_arrays)
         
@@ -519,6 +744,331 @@ class Distribution(object):
 
         return rad
 
+    def rvs(self, size=1, random_state=None):
+        '''
+        Random variates method.
+
+        Parameters
+        ----------
+        size : int or tuple of ints
+            Shape of the array of variates drawn for each parameter set
+        random_state : None, int, np.random.RandomState or np.random.Generator
+            Source of random numbers (see check_random_state)
+
+        Returns
+        -------
+        rvs : list of ndarrays
+            List of arrays of random variates, one for each parameter set
+
+        Notes
+        -----
+        The default draws from a Walker alias table of the pmf from min_supp
+        to tot_obs, normalized to sum to one (see _alias_table). Building a
+        table costs one pmf evaluation over the support, after which each
+        variate costs one uniform draw. Tables are kept in an LRU cache of
+        alias_cache_size tables keyed on the parameters, so repeated draws
+        from a fitted distribution reuse them.
+
+        See class docstring for more specific information on this distribution.
+        '''
+
+        random_state = check_random_state(random_state)
+        tot_obs = self.get_params(['tot_obs'])[0]
+
+        # Look up alias tables
+        keys = [self._param_key(i) for i in xrange(len(tot_obs))]
+        tables = [None if key is None else self._alias_tables().get(key) for
+                                                                    key in keys]
+
+        # Calculate pmfs over the support for the parameter sets without one
+        if any(table is None for table in tables):
+            n_in = [np.arange(self.min_supp, int(ttot_obs) + 1) if table is
+                    None else np.arange(self.min_supp, self.min_supp + 1) for
+                    ttot_obs, table in zip(tot_obs, tables)]
+            for i, tpmf in enumerate(self.pmf(n_in)):
+                if tables[i] is None:
+                    tables[i] = _alias_table(tpmf)
+                    if keys[i] is not None:
+                        self._alias_tables().set(keys[i], tables[i])
+
+        return [_alias_draw(table, size, random_state) + self.min_supp for
+                                                                table in tables]
+
+    def p_absent(self, abundances, cell_fraction):
+        '''
+        Probability that a species is absent from a cell.
+
+        Parameters
+        ----------
+        abundances : int, float or array-like object
+            Total abundance (tot_obs) of each species
+        cell_fraction : float or array-like object
+            Fraction of the total area covered by the cell, i.e. 1 / n_samp. 
+            Either one value or one per abundance.
+
+        Returns
+        -------
+        : np.ndarray
+            1D array with the probability of zero individuals in the cell for
+            each abundance
+
+        Notes
+        -----
+        Any other parameters (e.g. k) are taken from params. This method 
+        evaluates pmf(0) on a copy of the distribution with tot_obs set to
+        abundances and n_samp set to 1 / cell_fraction, and SSADs override it
+        with closed forms. The params of the distribution are not changed.
+
+        See class docstring for more specific information on this distribution.
+        '''
+
+        N, a = _ssad_args(abundances, cell_fraction)
+        single = copy(self)
+        single.var = {}
+        single.params = dict(self.params)
+        single.params['tot_obs'] = N
+        single.params['n_samp'] = 1 / a
+        return np.array([tpmf[0] for tpmf in single.pmf(0)])
+
+    def p_endemic(self, abundances, cell_fraction):
+        '''
+        Probability that all individuals of a species are in a cell.
+
+        Parameters
+        ----------
+        abundances : int, float or array-like object
+            Total abundance (tot_obs) of each species
+        cell_fraction : float or array-like object
+            Fraction of the total area covered by the cell, i.e. 1 / n_samp. 
+            Either one value or one per abundance.
+
+        Returns
+        -------
+        : np.ndarray
+            1D array with the probability of n = tot_obs in the cell for each
+            abundance
+
+        Notes
+        -----
+        As for p_absent, this method evaluates the pmf on a copy of the
+        distribution and SSADs override it with vectorized forms.
+
+        See class docstring for more specific information on this distribution.
+        '''
+
+        N, a = _ssad_args(abundances, cell_fraction)
+        single = copy(self)
+        single.var = {}
+        single.params = dict(self.params)
+        single.params['tot_obs'] = N
+        single.params['n_samp'] = 1 / a
+        return np.array([tpmf[0] for tpmf in single.pmf(zip(N))])
+
+    def pmf_batch(self, n, offsets=None):
+        '''
+        Probability mass function of M parameter sets in a single call.
+
+        Parameters
+        ----------
+        n : array-like
+            If offsets is None, 1D array of values shared by all parameter
+            sets. Otherwise the flat values of all sets, where the values of
+            set i are n[offsets[i]:offsets[i + 1]].
+        offsets : array-like or None
+            Start of the values of each set in n followed by len(n), so of
+            length M + 1.
+
+        Returns
+        -------
+        : np.ndarray
+            If offsets is None, 2D array of shape (M, len(n)) with the pmf of
+            set i in row i. Otherwise 1D array aligned with n.
+
+        Notes
+        -----
+        Distributions that define _pmf_batch evaluate all sets at once with
+        broadcasting. Others fall back to pmf, with zero-copy views of n for
+        each set.
+
+        '''
+        return self._eval_batch('pmf', n, offsets)
+
+    def cdf_batch(self, n, offsets=None):
+        '''
+        Cumulative distribution function of M parameter sets in a single
+        call. See pmf_batch for parameters and return values.
+        '''
+        return self._eval_batch('cdf', n, offsets)
+
+    def _eval_batch(self, method, n, offsets):
+        '''
+        Batch evaluation of method ('pmf' or 'cdf'). Vectorized kernels are
+        called as _<method>_batch(n, expand), where n is 2D (1, len(n)) or
+        flat and expand(par) broadcasts an array of one value per parameter
+        set against n.
+        '''
+
+        n = np.asarray(n)
+        if n.ndim != 1:
+            raise ValueError('n must be 1D in batch mode')
+        if offsets is not None:
+            offsets = np.asarray(offsets, dtype=int)
+            if offsets.ndim != 1 or len(offsets) < 2 or offsets[0] != 0 or \
+                    offsets[-1] != len(n) or np.any(np.diff(offsets) < 0):
+                raise ValueError('offsets must increase from 0 to len(n)')
+            counts = np.diff(offsets)
+
+        kernel = getattr(self, '_%s_batch' % method, None)
+        if kernel is not None:
+            if offsets is None:
+                expand = lambda par: np.asarray(par)[:, None]
+                return kernel(n[None, :], expand)
+
+            def expand(par):
+                par = np.asarray(par)
+                if len(par) != len(counts):
+                    raise ValueError('offsets must give the values of %i '
+                                     % len(par) + 'parameter sets')
+                return np.repeat(par, counts)
+            return kernel(n, expand)
+
+        if offsets is None:
+            return np.array(getattr(self, method)(n))
+        return np.concatenate(getattr(self, method)(np.split(n,
+                                                            offsets[1:-1])))
+
+    def _chunked_cdf(self, n, chunk_size, tail_tol):
+        '''
+        Cdf from blocks of the pmf. See cdf for parameters.
+        '''
+
+        cdf = []
+        trunc_err = []
+        for i, tn in enumerate(n):
+            tn = np.floor(np.asarray(tn, dtype=float))
+            tcdf = np.zeros(len(tn))
+            mass = [0]
+            blocks = self._pmf_blocks(i, np.max(tn), chunk_size, tail_tol,
+                                      mass, use_pdf=True)
+
+            # Carry the running sum across blocks in order
+            start = self.min_supp
+            total = None
+            for block in blocks:
+                if total is None:
+                    cum_pmf = np.cumsum(block)
+                else:
+                    cum_pmf = np.cumsum(np.concatenate(([total], block)))[1:]
+                in_block = (tn >= start) & (tn < start + len(block))
+                tcdf[in_block] = cum_pmf[(tn[in_block] - start).astype(int)]
+                start += len(block)
+                total = cum_pmf[-1]
+
+            # Values past the last block get all of the evaluated mass
+            beyond = tn >= start
+            if np.any(beyond):
+                tcdf[beyond] = total
+                trunc_err.append(max(1 - mass[0], 0))
+            else:
+                trunc_err.append(0)
+            cdf.append(tcdf)
+
+        self.var['cdf_trunc_err'] = trunc_err
+        return cdf
+
+    def _param_set(self, ind):
+        '''
+        Dictionary of the parameters of parameter set ind
+        '''
+        param_set = {}
+        for kw, val in self.params.iteritems():
+            val = make_array(val)
+            param_set[kw] = val[ind] if len(val) > 1 else val[0]
+        return param_set
+
+    def _param_key(self, ind):
+        '''
+        Hashable key of the parameters of parameter set ind and of the
+        attributes in key_attrs, or None if one of them is not hashable
+        '''
+        key = tuple(sorted(self._param_set(ind).iteritems())) + \
+              tuple((attr, getattr(self, attr)) for attr in self.key_attrs)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _cdf_tables(self):
+        '''
+        LRU cache of cumulative pmf tables used by cdf, keyed on _param_key.
+
+        Created on first use with at most cdf_cache_size tables. Since the key
+        is built from params, refitting or changing params never returns a
+        stale table.
+        '''
+        try:
+            return self._cdf_cache
+        except AttributeError:
+            self._cdf_cache = LRUCache(maxsize=self.cdf_cache_size)
+            return self._cdf_cache
+
+    def _alias_tables(self):
+        '''
+        LRU cache of alias tables used by rvs, keyed on _param_key.
+
+        Created on first use with at most alias_cache_size tables.
+        '''
+        try:
+            return self._alias_cache
+        except AttributeError:
+            self._alias_cache = LRUCache(maxsize=self.alias_cache_size)
+            return self._alias_cache
+
+    def _pmf_blocks(self, ind, max_n, chunk_size, tail_tol, mass,
+                    use_pdf=False):
+        '''
+        Generator of consecutive blocks of the pmf of one parameter set.
+
+        Parameters
+        ----------
+        ind : int
+            Index of the parameter set in self.params
+        max_n : int
+            Largest value to evaluate
+        chunk_size : int
+            Number of values in each block
+        tail_tol : float
+            Stop once one minus the mass yielded so far is below tail_tol
+        mass : list
+            mass[0] is updated with the total mass yielded so far
+        use_pdf : bool
+            If True, use the pdf when the distribution implements one
+
+        '''
+
+        # Shallow copy holding only the parameter set ind
+        single = copy(self)
+        single.var = {}
+        single.params = self._param_set(ind)
+
+        func = single.pmf
+        if use_pdf:
+            try:
+                single.pdf(self.min_supp)
+                func = single.pdf
+            except NotImplementedError:
+                pass
+
+        chunk_size = int(chunk_size)
+        for start in xrange(self.min_supp, int(max_n) + 1, chunk_size):
+            stop = min(start + chunk_size, int(max_n) + 1)
+            block = func(np.arange(start, stop))[0]
+            mass[0] += np.sum(block)
+            yield block
+            if 1 - mass[0] < tail_tol:
+                break
+
 
     def fit(self, data):
         '''
@@ -542,7 +1092,7 @@ class Distribution(object):
         data = check_list_of_iterables(data) 
         
         # Check if distribution can support the fitted data
-        num_zeros = np.array([sum(dt == 0) for dt in data])
+        num_zeros = np.array([np.sum(dt == 0) for dt in data])
         if np.any(num_zeros != 0) and self.min_supp == 1:
             raise ValueError('%s does not support data with zeros' %
                                                     self.__class__.__name__)
@@ -603,6 +1153,166 @@ class Distribution(object):
 
         return tuple(retrieved_params)
 
+class LowerTruncated(object):
+    '''
+    Lower truncation of a distribution with support from zero.
+
+    Listed before the base distribution in the bases of a class, e.g.
+    class nbd_lt(LowerTruncated, nbd), it truncates the base at min_supp = 1
+    and renormalizes by 1 - p(0). The base methods are called through super()
+    with the same params, so they must not dispatch to each other through
+    self.
+
+    Attributes
+    ----------
+    p0_cache_size : int
+        Number of log p(0) values, one per parameter set, kept for reuse
+
+    Notes
+    -----
+    pmf, logpmf and cdf evaluate the base at {0} and n in a single call for
+    parameter sets whose p(0) is not yet cached, and at n alone otherwise.
+    Values of n below min_supp have probability zero. If the base has no cdf
+    of its own, cdf and rad sum the truncated pmf as in Distribution. rvs
+    redraws zeros from the base rvs, or uses the default alias table of the
+    truncated pmf if the base has no rvs of its own.
+
+    '''
+
+    # Number of log p(0) values kept by _base_eval
+    p0_cache_size = 128
+
+    def pmf(self, n):
+        '''
+        Probability mass function of the base distribution truncated at
+        min_supp. See Distribution.pmf.
+        '''
+        n, base_pmf, ln_p0 = self._base_eval('pmf', n)
+        return [np.where(tn >= self.min_supp, tpmf / -np.expm1(tln_p0), 0) for
+                                  tn, tpmf, tln_p0 in zip(n, base_pmf, ln_p0)]
+
+    def logpmf(self, n):
+        '''
+        Log probability mass function of the base distribution truncated at
+        min_supp. See Distribution.logpmf.
+        '''
+        n, base_logpmf, ln_p0 = self._base_eval('logpmf', n)
+        return [np.where(tn >= self.min_supp, tlogpmf -
+                         np.log(-np.expm1(tln_p0)), -np.inf) for tn, tlogpmf,
+                         tln_p0 in zip(n, base_logpmf, ln_p0)]
+
+    def cdf(self, n, chunk_size=None, tail_tol=1e-12):
+        '''
+        Cumulative distribution function of the base distribution truncated
+        at min_supp, (F(n) - p(0)) / (1 - p(0)) if the base has a cdf of its
+        own. See Distribution.cdf.
+        '''
+        if _is_default(super(LowerTruncated, self).cdf, 'cdf'):
+            return Distribution.cdf(self, n, chunk_size=chunk_size,
+                                    tail_tol=tail_tol)
+
+        # F(0) of the base is p(0)
+        n, base_cdf, ln_p0 = self._base_eval('cdf', n)
+        return [np.where(tn >= self.min_supp, (tcdf - np.exp(tln_p0)) /
+                         -np.expm1(tln_p0), 0) for tn, tcdf, tln_p0 in zip(n,
+                         base_cdf, ln_p0)]
+
+    def rad(self, chunk_size=None, tail_tol=1e-12):
+        '''
+        Rank abundance distribution from the truncated pmf. See
+        Distribution.rad.
+        '''
+        return Distribution.rad(self, chunk_size=chunk_size, tail_tol=tail_tol)
+
+    def rvs(self, size=1, random_state=None):
+        '''
+        Random variates of the truncated distribution. See Distribution.rvs.
+
+        Zeros drawn from the base are redrawn, so the expected cost grows as
+        1 / (1 - p(0)).
+        '''
+        random_state = check_random_state(random_state)
+        if _is_default(super(LowerTruncated, self).rvs, 'rvs'):
+            return Distribution.rvs(self, size=size,
+                                    random_state=random_state)
+
+        rvs = []
+        for i in xrange(self._num_param_sets()):
+            single = copy(self)
+            single.var = {}
+            single.params = self._param_set(i)
+            draw = lambda tsize: super(LowerTruncated, single).rvs(tsize,
+                                                            random_state)[0]
+            rvs.append(_reject_zeros(draw, size))
+        return rvs
+
+    def p_absent(self, abundances, cell_fraction):
+        '''
+        Probability that a species is absent from a cell. Zero is outside the
+        support, so this uses Distribution.p_absent and not any closed form
+        of the base.
+        '''
+        return Distribution.p_absent(self, abundances, cell_fraction)
+
+    def p_endemic(self, abundances, cell_fraction):
+        '''
+        Probability that all individuals of a species are in a cell, using
+        Distribution.p_endemic.
+        '''
+        return Distribution.p_endemic(self, abundances, cell_fraction)
+
+    def _base_eval(self, method, n):
+        '''
+        Evaluate method ('pmf', 'logpmf' or 'cdf') of the base distribution at
+        n, along with log p(0) of each parameter set.
+
+        Returns
+        -------
+        : tuple
+            Expanded n, the list of base values at n and an array of log p(0)
+
+        '''
+        n = [np.atleast_1d(tn) for tn in expand_n(n,
+                                                  self._num_param_sets())]
+
+        # Look up p(0), and add 0 to n for the parameter sets without it
+        keys = [self._param_key(i) for i in xrange(len(n))]
+        ln_p0 = [None if key is None else self._p0_tables().get(key) for key
+                                                                     in keys]
+        n_in = [tn if tln_p0 is not None else np.concatenate(([0], tn)) for
+                                                  tn, tln_p0 in zip(n, ln_p0)]
+
+        vals = getattr(super(LowerTruncated, self), method)(n_in)
+
+        for i, tvals in enumerate(vals):
+            if ln_p0[i] is None:
+                with np.errstate(divide='ignore'):
+                    ln_p0[i] = tvals[0] if method == 'logpmf' else \
+                                                            np.log(tvals[0])
+                vals[i] = tvals[1:]
+                if keys[i] is not None:
+                    self._p0_tables().set(keys[i], ln_p0[i])
+
+        return n, vals, np.array(ln_p0, dtype=float)
+
+    def _num_param_sets(self):
+        '''
+        Number of parameter sets, the length of the longest parameter
+        '''
+        return max(len(make_array(val)) for val in self.params.itervalues())
+
+    def _p0_tables(self):
+        '''
+        LRU cache of log p(0) of the base distribution, keyed on _param_key.
+
+        Created on first use with at most p0_cache_size values.
+        '''
+        try:
+            return self._p0_cache
+        except AttributeError:
+            self._p0_cache = LRUCache(maxsize=self.p0_cache_size)
+            return self._p0_cache
+
 class DownscaleError(Exception):
     '''Catch downscale errors'''
     def __init__(self, value=None):
@@ -795,28 +1505,41 @@ class logser(Distribution):
         assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
         
         # Calculate pmf
-        stop = 1 - 1e-10
-        start = -2
-        eq = lambda x, n_samp, tot_obs: (((tot_obs/x) - tot_obs) * 
-                                                (-(np.log(1 - x)))) - n_samp
+        self.var['p'] = self._solve_p(n_samp, tot_obs, 'pmf')
+        return [stats.logser.pmf(tn, tp) for tp, tn in zip(self.var['p'], n)]
 
-        pmf = []
-        self.var['p'] = []
+    @doc_inherit
+    def logpmf(self, n):
 
-        for tn_samp, ttot_obs, tn in zip(n_samp, tot_obs, n):
-            # Catching cryptic brentq error
-            try:
-                tp = scipy.optimize.brentq(eq, start, stop, 
-                                            args=(tn_samp,ttot_obs), disp=True)
-            except(ValueError):
-                raise ValueError("No solution to %s.pmf when tot_obs = %.2f"\
-                                  % (self.__class__.__name__, ttot_obs) + 
-                                  " and n_samp = %.2f" % (tn_samp)) 
-            tpmf = stats.logser.pmf(tn, tp)
-            self.var['p'].append(tp)
-            pmf.append(tpmf)
-   
-        return pmf
+        # Get parameters
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        n = expand_n(n, len(n_samp))
+
+        assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
+
+        # Calculate log pmf. Unlike stats.logser, p ** n is never formed, so
+        # large n does not underflow.
+        self.var['p'] = self._solve_p(n_samp, tot_obs, 'logpmf')
+        logpmf = []
+        for tp, tn in zip(self.var['p'], n):
+            tn = np.asarray(tn, dtype=float)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                tlogpmf = tn * np.log(tp) - np.log(tn) - \
+                                                    np.log(-np.log1p(-tp))
+            in_supp = (tn >= 1) & (tn == np.floor(tn))
+            logpmf.append(np.where(in_supp, tlogpmf, -np.inf))
+        return logpmf
+
+    @doc_inherit
+    def rvs(self, size=1, random_state=None):
+
+        # Get parameters
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
+        random_state = check_random_state(random_state)
+
+        self.var['p'] = self._solve_p(n_samp, tot_obs, 'rvs')
+        return [random_state.logseries(tp, size=size) for tp in self.var['p']]
 
     @doc_inherit
     def cdf(self, n):
@@ -828,29 +1551,44 @@ class logser(Distribution):
         # TODO: Additional checks?
         assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
         
-        # Calculate pmf
+        # Calculate cdf
+        self.var['p'] = self._solve_p(n_samp, tot_obs, 'cdf')
+        return [stats.logser.cdf(tn, tp) for tp, tn in zip(self.var['p'], n)]
+
+    def _pmf_batch(self, n, expand):
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
+        self.var['p'] = self._solve_p(n_samp, tot_obs, 'pmf')
+        return stats.logser.pmf(n, expand(self.var['p']))
+
+    def _cdf_batch(self, n, expand):
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
+        self.var['p'] = self._solve_p(n_samp, tot_obs, 'cdf')
+        return stats.logser.cdf(n, expand(self.var['p']))
+
+    def _solve_p(self, n_samp, tot_obs, method):
+        '''
+        List of the p parameter for each parameter set. method names the
+        calling method in the error raised when there is no solution.
+        '''
         stop = 1 - 1e-10
         start = -2
         eq = lambda x, n_samp, tot_obs: (((tot_obs/x) - tot_obs) * 
                                                 (-(np.log(1 - x)))) - n_samp
 
-        cdf = []
-        self.var['p'] = []
-
-        for tn_samp, ttot_obs, tn in zip(n_samp, tot_obs, n):
+        p = []
+        for tn_samp, ttot_obs in zip(n_samp, tot_obs):
             # Catching cryptic brentq error
             try:
                 tp = scipy.optimize.brentq(eq, start, stop, 
                                             args=(tn_samp,ttot_obs), disp=True)
             except(ValueError):
-                raise ValueError("No solution to %s.cdf when tot_obs = %.2f"\
-                                  % (self.__class__.__name__, ttot_obs) + 
-                                  " and n_samp = %.2f" % (tn_samp)) 
-            tcdf = stats.logser.cdf(tn, tp)
-            self.var['p'].append(tp)
-            cdf.append(tcdf)
-   
-        return cdf
+                raise ValueError("No solution to %s.%s when tot_obs = %.2f"\
+                                  % (self.__class__.__name__, method, ttot_obs)
+                                  + " and n_samp = %.2f" % (tn_samp)) 
+            p.append(tp)
+        return p
 
 class logser_ut(Distribution):
     __doc__ = Distribution.__doc__ + \
@@ -866,6 +1604,9 @@ class logser_ut(Distribution):
         Total number of species / samples
     tot_obs: int or iterable
         Total number of individuals / observations
+    solver : str (optional)
+        Method used to solve for the Lagrange multiplier. Either 'sum'
+        (default), 'closed' or 'grid'. See solvers.mete_x.
    
     self.vars keywords
     ------------------
@@ -877,6 +1618,11 @@ class logser_ut(Distribution):
     This distribution is the truncated logseries described in Eq 7.32 of Harte 
     2011. Eq. 7.27 is used to solve for the Lagrange multiplier.
 
+    The solver keyword is not stored in params. Use solver='closed' for large
+    tot_obs, where it is much faster and uses constant memory. Use
+    solver='grid' for batch runs over many communities once the lookup grid
+    has been built with utils/make_mete_grid.py.
+
     Realistic values of x where x = e**(-beta) are in the range (1/e, 1). The 
     start and stop parameters for the brentq procedure are set close to these 
     values. However, x can occasionally be greater than one, so the maximum 
@@ -886,12 +1632,18 @@ class logser_ut(Distribution):
     individuals (N) is equivalent to tot_obs.
     '''
     
+    # Number of normalizing constants kept by _solve_x
+    norm_cache_size = 32
+
+    key_attrs = ('solver',)
+
     @doc_inherit
-    def __init__(self, **kwargs):
+    def __init__(self, solver='sum', **kwargs):
         self.params = kwargs
         self.min_supp = 1
         self.par_num = 2 # This is highly contested
         self.var = {}
+        self.solver = solver
 
     @doc_inherit    
     def pmf(self, n):
@@ -905,40 +1657,110 @@ class logser_ut(Distribution):
         
 
         # Calculate pmf
-        start = 0.3
-        stop = 2
-        flmax = sys.float_info[0]
-
         pmf = []
-        self.var['x'] = []
+        x, norm = self._solve_x(n_samp, tot_obs)
+        self.var['x'] = x
 
-        for tn_samp, ttot_obs, tn in zip(n_samp, tot_obs, n):
+        for tx, tnorm, tn in zip(x, norm, n):
 
             # If n_samp = tot_obs, return 1 for n = 1 and 0 otherwise 
             # (e**-beta = 0)
-            if tn_samp == ttot_obs:
+            if tx == 0:
                 tpmf = np.zeros(len(tn))
                 tpmf[tn == 1] = 1
-                tx = 0
-
             else:
-                k = np.linspace(1, ttot_obs, num=ttot_obs)
-                try:
-                    tx = scipy.optimize.brentq(beta_solver, start,
-                               min((flmax/tn_samp)**(1/float(ttot_obs)), stop), 
-                               args = (k, ttot_obs, tn_samp), disp=True)
-                except(ValueError):
-                    raise ValueError("No solution to %s.pmf when tot_obs = "
-                                  % (self.__class__.__name__) + 
-                                  "%.2f and n_samp = %.2f" % (ttot_obs, tn_samp))
-                tnorm = np.sum(tx ** k / k)
                 tpmf = (tx ** tn / tn) / tnorm
 
-            self.var['x'].append(tx)
             pmf.append(tpmf)
    
         return pmf
 
+    @doc_inherit
+    def logpmf(self, n):
+
+        # Get parameters
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        n = expand_n(n, len(n_samp))
+
+        assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
+
+        # Calculate log pmf
+        logpmf = []
+        x, norm = self._solve_x(n_samp, tot_obs)
+        self.var['x'] = x
+
+        for tx, tnorm, tn in zip(x, norm, n):
+
+            # Only n = 1 is possible when n_samp = tot_obs
+            if tx == 0:
+                tlogpmf = np.where(tn == 1, 0., -np.inf)
+            else:
+                tlogpmf = tn * np.log(tx) - np.log(tn) - np.log(tnorm)
+
+            logpmf.append(tlogpmf)
+
+        return logpmf
+
+    def _pmf_batch(self, n, expand):
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
+        x, norm = self._solve_x(n_samp, tot_obs)
+        self.var['x'] = x
+
+        bx = expand(x)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pmf = (bx ** n / n) / expand(norm)
+        return np.where(bx == 0, n == 1, pmf)
+
+    def _solve_x(self, n_samp, tot_obs):
+        '''
+        Lists of x = exp(-beta) and of the normalizing constant
+        sum(x**k / k), k = 1..tot_obs, for each parameter set. When n_samp =
+        tot_obs, x = 0 and the constant is one.
+
+        x is cached by mete_x and the constant in _norm_tables, so the blocks
+        of a chunked cdf or rad only pay for them once.
+        '''
+        x = []
+        norm = []
+        for tn_samp, ttot_obs in zip(n_samp, tot_obs):
+            if tn_samp == ttot_obs:
+                x.append(0)
+                norm.append(1)
+                continue
+
+            try:
+                tx = mete_x(tn_samp, ttot_obs, method=self.solver)
+            except(ValueError):
+                raise ValueError("No solution to %s.pmf when tot_obs = "
+                              % (self.__class__.__name__) + 
+                              "%.2f and n_samp = %.2f" % (ttot_obs, tn_samp))
+            key = (tx, float(ttot_obs))
+            tnorm = self._norm_tables().get(key)
+            if tnorm is None:
+                if self.solver != 'sum':
+                    tnorm = trunc_log_sum(tx, ttot_obs)
+                else:
+                    k = np.linspace(1, ttot_obs, num=ttot_obs)
+                    tnorm = np.sum(tx ** k / k)
+                self._norm_tables().set(key, tnorm)
+            x.append(tx)
+            norm.append(tnorm)
+        return x, norm
+
+    def _norm_tables(self):
+        '''
+        LRU cache of normalizing constants used by _solve_x, keyed on x and
+        tot_obs.
+
+        Created on first use with at most norm_cache_size values.
+        '''
+        try:
+            return self._norm_cache
+        except AttributeError:
+            self._norm_cache = LRUCache(maxsize=self.norm_cache_size)
+            return self._norm_cache
+
     # TODO: Add exact cdf from JK dissertation
 
 
@@ -992,9 +1814,6 @@ class logser_ut_appx(Distribution):
     
     @doc_inherit
     def pmf(self, n):
-        
-        # Multiple roots. root = 2 makes it a logseries
-        root = 2
 
         # Get parameters
         n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
@@ -1004,19 +1823,66 @@ class logser_ut_appx(Distribution):
         assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
 
         # Calculate pmf
+        pmf = []
+        self.var['x'] = self._solve_x(n_samp, tot_obs)
+
+        for tx, tn in zip(self.var['x'], n):
+            
+            # TODO: What if tot_obs = n_samp? 
+            if tx == 0:
+                tpmf = np.zeros(len(tn))
+                tpmf[tn == 1] = 1
+            else:
+                g = -1/np.log(tx)
+                tpmf = (1/np.log(g)) * ((tx**tn)/tn)
+
+            pmf.append(tpmf)
+
+        return pmf
+
+    @doc_inherit
+    def logpmf(self, n):
+
+        # Get parameters
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        n = expand_n(n, len(n_samp))
+
+        assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
+
+        # Calculate log pmf
+        logpmf = []
+        self.var['x'] = self._solve_x(n_samp, tot_obs)
+
+        for tx, tn in zip(self.var['x'], n):
+
+            if tx == 0:
+                tlogpmf = np.where(tn == 1, 0., -np.inf)
+            else:
+                g = -1/np.log(tx)
+                tlogpmf = tn * np.log(tx) - np.log(tn) - np.log(np.log(g))
+
+            logpmf.append(tlogpmf)
+
+        return logpmf
+
+    def _solve_x(self, n_samp, tot_obs):
+        '''
+        List of x = exp(-beta) for each parameter set, from the approximate
+        Eq. 7.30. When n_samp = tot_obs, x = 0.
+        '''
+
+        # Multiple roots. root = 2 makes it a logseries
+        root = 2
+
         start = 0.3
         stop = 1 - 1e-10
         eq = lambda x, n_samp, tot_obs: (((-m.log(x))*(m.log(-1/(m.log(x))))) - 
                                                        (float(n_samp)/tot_obs))
-        pmf = []
-        self.var['x'] = []
+        x = []
 
-        for tn_samp, ttot_obs, tn in zip(n_samp, tot_obs, n):
+        for tn_samp, ttot_obs in zip(n_samp, tot_obs):
             
-            # TODO: What if tot_obs = n_samp? 
             if tn_samp == ttot_obs:
-                tpmf = np.zeros(len(tn))
-                tpmf[tn == 1] = 1
                 tx = 0
             else:
                 # Try normal root finder. Will fail if two roots
@@ -1042,13 +1908,9 @@ class logser_ut_appx(Distribution):
                             ' when tot_obs = %.2f and n_samp = %.2f ' % 
                             (ttot_obs, tn_samp)) 
 
-                g = -1/np.log(tx)
-                tpmf = (1/np.log(g)) * ((tx**tn)/tn)
-
-            self.var['x'].append(tx)
-            pmf.append(tpmf)
+            x.append(tx)
 
-        return pmf
+        return x
 
 
 class plognorm(Distribution):
@@ -1066,6 +1928,9 @@ class plognorm(Distribution):
         Total number of species / samples
     tot_obs: int or iterable (optional)
         Total number of individuals / observations
+    quad_nodes : int (optional)
+        Number of Gauss-Hermite nodes used to evaluate the pmf. Default is
+        100. Not stored in params.
 
     self.var keywords
     -----------------
@@ -1078,10 +1943,21 @@ class plognorm(Distribution):
     function was adapted from Ethan White's pln_solver function in 
     weecology.
 
+    The pmf integral is evaluated for all unique n at once with Gauss-Hermite
+    quadrature centered on the mode of the integrand (see _pln_ln_pmf).
+    Compared to an adaptive reference integral, the relative error with the
+    default 100 nodes is below 1e-9 for n >= 1 and sigma <= 10. n = 0 is the
+    least accurate point, with relative errors of about 1e-9 at sigma = 3 and
+    2e-5 at sigma = 10. Unlike scipy.integrate.quad, which was used
+    previously, the quadrature does not miss narrow integrands (e.g. mu = 5,
+    sigma = 0.1, where quad gave errors greater than 90% for n <= 10).
+
     The total species (S) is equivalent to n_samp and the total
     individuals (N) is equivalent to tot_obs.
     '''
-    
+
+    key_attrs = ('quad_nodes',)
+
     # @doc_inherit cannot be used here because of derived plognorm_lt
     def __init__(self, **kwargs):
         '''
@@ -1098,6 +1974,7 @@ class plognorm(Distribution):
 
         See class docstring for more specific information on this distribution.
         '''
+        self.quad_nodes = kwargs.pop('quad_nodes', 100)
         self.params = kwargs
         self.min_supp = 0
         self.par_num = 2
@@ -1127,50 +2004,107 @@ class plognorm(Distribution):
         mu, sigma = self.get_params(['mu', 'sigma'])
         n = expand_n(n, len(mu))
 
-        n_uniq = [np.unique(tn) for tn in n]  # Speed up by calc for uniq vals
-
         # Calculate pmf, no intermediate vars
         pmf = []
 
-        eq = lambda t,x,mu,sigma: np.exp(t*x - np.exp(t) - 0.5*((t-mu) / 
-                                                                sigma)**2)
+        for tmu, tsigma, tn in zip(mu, sigma, n):
 
-        for tmu, tsigma, tn_uniq, tn in zip(mu, sigma, n_uniq, n):
+            # Speed up by calc for uniq vals
+            tn_uniq, tinv = np.unique(tn, return_inverse=True)
             
             # If mu negative, pmf 0
             if tmu <= 0 or tsigma <= 0:
                 tpmf_uniq = np.repeat(1e-120, len(tn_uniq))
 
-            # Calculate unique pmf values
+            # Calculate unique pmf values in one pass
             else:
-                # TODO: Throwing overflow warning but not affecting result
-                tpmf_uniq = np.empty(len(tn_uniq), dtype=np.float)
-                for i, g in enumerate(tn_uniq):
-                    if g <= 170:
-                        integ = integrate.quad(eq, -np.inf, np.inf, 
-                                               args=(g,tmu,tsigma))[0]
-                        norm = np.exp(-0.5 * m.log(2 * m.pi * tsigma**2) -
-                                                m.lgamma(g + 1))
-                        tpmf_uniq[i] = norm * integ
-                    else:
-                        z = (m.log(g) - tmu) / tsigma
-                        tpmf_uniq[i] = ((1 + (z**2 + m.log(g) - tmu - 1) /
-                                   (2 * g * tsigma**2)) * np.exp(-0.5 * z**2) /
-                                    (m.sqrt(2 * m.pi) * tsigma * g))
+                tpmf_uniq = np.exp(_pln_ln_pmf(tn_uniq, tmu, tsigma,
+                                               self.quad_nodes))
 
             # Expand to full pmf
-            tpmf = np.empty(len(tn))
-            for i, g in enumerate(tn_uniq):
-                tpmf[np.where(tn == g)[0]] = tpmf_uniq[i]
-
-            pmf.append(tpmf)
+            pmf.append(tpmf_uniq[tinv])
 
         return pmf
 
+    # @doc_inherit cannot be used here because of derived plognorm_lt
+    def logpmf(self, n):
+        '''
+        Log of the probability mass function.
+
+        Parameters
+        ----------
+        n : int, float or array-like object
+            Values at which to calculate the log pmf. May be a list of same
+            length as parameters, or single iterable.
+
+        Returns
+        -------
+        logpmf : list of ndarrays
+            List of 1D arrays of the log probability of observing sample n.
+
+        Notes
+        -----
+        The log of the quadrature integral is returned directly. Where mu or
+        sigma is not positive the log pmf is -inf, rather than the log of the
+        1e-120 floor used by pmf.
+
+        See class docstring for more specific information on this distribution.
+        '''
+
+        # Get parameters
+        mu, sigma = self.get_params(['mu', 'sigma'])
+        n = expand_n(n, len(mu))
+
+        logpmf = []
+
+        for tmu, tsigma, tn in zip(mu, sigma, n):
+
+            tn_uniq, tinv = np.unique(tn, return_inverse=True)
+
+            if tmu <= 0 or tsigma <= 0:
+                tlogpmf_uniq = np.repeat(-np.inf, len(tn_uniq))
+            else:
+                tlogpmf_uniq = _pln_ln_pmf(tn_uniq, tmu, tsigma,
+                                           self.quad_nodes)
+
+            logpmf.append(tlogpmf_uniq[tinv])
+
+        return logpmf
+
+    # @doc_inherit cannot be used here because of derived plognorm_lt
+    def rvs(self, size=1, random_state=None):
+        '''
+        Random variates method.
+
+        Parameters
+        ----------
+        size : int or tuple of ints
+            Shape of the array of variates drawn for each parameter set
+        random_state : None, int, np.random.RandomState or np.random.Generator
+            Source of random numbers (see check_random_state)
+
+        Returns
+        -------
+        rvs : list of ndarrays
+            List of arrays of random variates, one for each parameter set
+
+        Notes
+        -----
+        Each variate is a Poisson draw with a lognormal mean.
+
+        See class docstring for more specific information on this distribution.
+        '''
+
+        mu, sigma = self.get_params(['mu', 'sigma'])
+        random_state = check_random_state(random_state)
+
+        return [random_state.poisson(random_state.lognormal(tmu, tsigma,
+                            size=size)) for tmu, tsigma in zip(mu, sigma)]
+
     # TODO: Is there a known cdf?
     
     # @doc_inherit cannot be used here because of derived plognorm_lt
-    def fit(self, data):
+    def fit(self, data, method='grad'):
         '''
         Fit method.
 
@@ -1182,6 +2116,11 @@ class plognorm(Distribution):
         data : list of ndarrays
             Data to use to fit parameters of distribution. Even if only one 
             data array, must be in a list with one element.
+        method : str
+            If 'grad' (default), the data are reduced to unique values and
+            their counts and the likelihood is maximized with L-BFGS-B using
+            quadrature gradients (see _pln_nll). If 'fmin', the full pmf is
+            minimized with scipy.optimize.fmin, as in earlier versions.
 
         See class docstring for more specific information on this distribution.
         '''
@@ -1196,16 +2135,33 @@ class plognorm(Distribution):
         for tdata in data:
             mu0 = np.mean(np.log(tdata))  # Starting guesses for mu and sigma
             sigma0 = np.std(np.log(tdata), ddof=1)
-            
-            # TODO: Can we do this without setting the self.params? Make
-            # another plognorm inside?
-            def pln_func(x):
-                self.params['mu'] = x[0]
-                self.params['sigma'] = x[1]
-                return -sum(np.log(self.pmf(tdata)[0]))
-
-            mu, sigma = scipy.optimize.fmin(pln_func, x0=[mu0, sigma0],
-                                            disp=0)
+
+            if method == 'grad':
+                # Sufficient statistics are the unique values and counts
+                n_uniq, inv = np.unique(tdata, return_inverse=True)
+                counts = np.bincount(inv)
+                trunc = self.min_supp == 1
+
+                res = scipy.optimize.minimize(_pln_nll, x0=[mu0, sigma0],
+                        args=(n_uniq, counts, trunc, self.quad_nodes),
+                        method='L-BFGS-B', jac=True,
+                        bounds=[(1e-10, None), (1e-10, None)],
+                        options={'ftol' : 1e-15, 'gtol' : 1e-9})
+                mu, sigma = res.x
+
+            elif method == 'fmin':
+                # TODO: Can we do this without setting the self.params? Make
+                # another plognorm inside?
+                def pln_func(x):
+                    self.params['mu'] = x[0]
+                    self.params['sigma'] = x[1]
+                    return -np.sum(self.logpmf(tdata)[0])
+
+                mu, sigma = scipy.optimize.fmin(pln_func, x0=[mu0, sigma0],
+                                                disp=0)
+            else:
+                raise ValueError("Fit method '%s' not recognized" % method)
+
             temp_mu.append(mu)
             temp_sigma.append(sigma)
 
@@ -1215,7 +2171,7 @@ class plognorm(Distribution):
         return self
 
 
-class plognorm_lt(plognorm):
+class plognorm_lt(LowerTruncated, plognorm):
     __doc__ = Distribution.__doc__ + \
     '''
     Lower truncated Poisson lognormal (Bulmer 1974)
@@ -1241,7 +2197,10 @@ class plognorm_lt(plognorm):
     Wilber. The VGAM R package was adopted directly from Bulmer (1974). The fit 
     function was adapted from Ethan White's pln_solver function in weecology.
 
-    Truncation calculation based on Bulmer Eq. A1.
+    Truncation calculation based on Bulmer Eq. A1, through LowerTruncated.
+
+    The pmf is evaluated with the same Gauss-Hermite quadrature as plognorm and
+    accepts the same optional quad_nodes keyword.
 
     The total species (S) is equivalent to n_samp and the total
     individuals (N) is equivalent to tot_obs.
@@ -1264,47 +2223,11 @@ class plognorm_lt(plognorm):
 
         See class docstring for more specific information on this distribution.
         '''
+        self.quad_nodes = kwargs.pop('quad_nodes', 100)
         self.params = kwargs
         self.min_supp = 1
         self.par_num = 2
         self.var = {}
-        
-    
-    # @doc_inherit cannot be used here because class is derived from plognorm
-    def pmf(self, n):
-        '''
-        Probability mass function method.
-
-        Parameters
-        ----------
-        n : int, float or array-like object
-            Values at which to calculate pmf. May be a list of same length as 
-            parameters, or single iterable.
-
-        Returns
-        -------
-        pmf : list of ndarrays
-            List of 1D arrays of probability of observing sample n.
-
-        See class docstring for more specific information on this distribution.
-        '''
-
-        # Get parameters
-        mu, sigma = self.get_params(['mu', 'sigma'])
-
-        # TODO: Additional parameter checks
-
-        # Calculate pmf, using plognorm as aid
-        reg_plog = plognorm(mu=mu, sigma=sigma)
-        reg_pmf = reg_plog.pmf(n)
-        reg_pmf0 = reg_plog.pmf(0)
-        self.var = reg_plog.var
-
-        trunc_pmf = [(pr / (1 - p0)) for pr, p0 in zip(reg_pmf, reg_pmf0)]
-
-        return trunc_pmf 
-
-    # TODO: Write cdf method based on cdf of plognorm, similar to above
 
 
 class lognorm(Distribution):
@@ -1369,6 +2292,35 @@ class lognorm(Distribution):
 
         return pmf
 
+    @doc_inherit
+    def logpmf(self, n):
+
+        # Get parameters
+        tot_obs, n_samp, sigma = self.get_params(['tot_obs','n_samp','sigma'])
+        n = expand_n(n, len(sigma))
+
+        # Calculate mu
+        mu = np.log(tot_obs / n_samp) - (sigma**2 / 2)
+        self.var['mu'] = mu
+
+        # Calculate log pmf
+        return [stats.lognorm.logpdf(tn, tsigma, scale=np.exp(tmu)) for
+                                            tmu, tsigma, tn in zip(mu, sigma, n)]
+
+    @doc_inherit
+    def rvs(self, size=1, random_state=None):
+
+        # Get parameters
+        tot_obs, n_samp, sigma = self.get_params(['tot_obs','n_samp','sigma'])
+        random_state = check_random_state(random_state)
+
+        # Calculate mu
+        mu = np.log(tot_obs / n_samp) - (sigma**2 / 2)
+        self.var['mu'] = mu
+
+        return [random_state.lognormal(tmu, tsigma, size=size) for tmu, tsigma
+                                                            in zip(mu, sigma)]
+
     @doc_inherit  
     def cdf(self, n):
 
@@ -1390,6 +2342,18 @@ class lognorm(Distribution):
 
         return cdf
 
+    def _pmf_batch(self, n, expand):
+        tot_obs, n_samp, sigma = self.get_params(['tot_obs','n_samp','sigma'])
+        mu = np.log(tot_obs / n_samp) - (sigma**2 / 2)
+        self.var['mu'] = mu
+        return stats.lognorm.pdf(n, expand(sigma), scale=np.exp(expand(mu)))
+
+    def _cdf_batch(self, n, expand):
+        tot_obs, n_samp, sigma = self.get_params(['tot_obs','n_samp','sigma'])
+        mu = np.log(tot_obs / n_samp) - (sigma**2 / 2)
+        self.var['mu'] = mu
+        return stats.lognorm.cdf(n, expand(sigma), scale=np.exp(expand(mu)))
+
     @doc_inherit 
     def fit(self, data):
 
@@ -1405,7 +2369,7 @@ class lognorm(Distribution):
                 self.params['tot_obs'] = ttot_obs
                 self.params['n_samp'] = tn_samp
                 self.params['sigma'] = sigma 
-                return -sum(np.log(self.pmf(tdata)[0]))
+                return -np.sum(self.logpmf(tdata)[0])
 
             mle_sigma = scipy.optimize.fmin(ln_func,
                         np.array([np.std(np.log(tdata), ddof=1)]), disp=0)[0]
@@ -1514,6 +2478,20 @@ class geo_ser(Distribution):
 
         return pmf
 
+    @doc_inherit
+    def logpmf(self, n):
+
+        # Get parameters
+        n_samp, tot_obs, k = self.get_params(['n_samp', 'tot_obs', 'k'])
+        n = expand_n(n, len(n_samp))
+        assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
+        assert np.all(k > 0) and np.all(k <= 1), ('k must be in the '
+                                                  'interval (0, 1]')
+
+        # Log of the May (1975) equation used by pmf
+        return [-np.log(tn) - np.log(tn_samp) - np.log(-np.log1p(-tk)) for
+                                            tn_samp, tk, tn in zip(n_samp, k, n)]
+
     @doc_inherit
     def rad(self):
 
@@ -1611,10 +2589,32 @@ class broken_stick(Distribution):
             ttot_obs = np.round(ttot_obs, decimals=0)
             #sumg = sum(eq(np.arange(1, np.floor(ttot_obs) + 1), tn_samp, ttot_obs))
             tpmf = eq(tn, tn_samp, ttot_obs)# / sumg # Normalizing
-            pmf.append(tpmf)
+
+            # No species has more than tot_obs individuals
+            pmf.append(np.where(np.asarray(tn) <= ttot_obs, tpmf, 0))
 
         return pmf
 
+    @doc_inherit
+    def logpmf(self, n):
+
+        # Get parameters
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        n = expand_n(n, len(n_samp))
+
+        assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
+
+        # Calculate log pmf, which does not underflow for large n_samp
+        logpmf = []
+        for tn_samp, ttot_obs, tn in zip(n_samp, tot_obs, n):
+            ttot_obs = np.round(ttot_obs, decimals=0)
+            tn = np.asarray(tn, dtype=float)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                tlogpmf = np.log((tn_samp - 1) / ttot_obs) + (tn_samp - 2) * \
+                                                    np.log1p(-tn / ttot_obs)
+            logpmf.append(np.where(tn <= ttot_obs, tlogpmf, -np.inf))
+        return logpmf
+
 
     @doc_inherit
     def rad(self):
@@ -1671,7 +2671,8 @@ class sugihara(Distribution):
     breaking.  
 
     The rad method has an additional optional argument for sample_size, which 
-    is set to 10000 by default. 
+    is set to 10000 by default, as well as random_state for reproducible
+    simulations and n_jobs to split them across processes.
     
     The total species (S) is equivalent to n_samp and the total
     individuals (N) is equivalent to tot_obs.
@@ -1687,45 +2688,104 @@ class sugihara(Distribution):
         self.var = {}
     
 
-    @doc_inherit
-    def rad(self, sample_size=10000):
+    def rad(self, sample_size=10000, random_state=None, n_jobs=1):
+        '''
+        Rank abundance distribution method, calculates rad by simulating
+        sequential breakage.
+
+        Parameters
+        ----------
+        sample_size : int
+            Number of simulated breakage sequences
+        random_state : None, int, np.random.RandomState or np.random.Generator
+            Source of random numbers (see check_random_state)
+        n_jobs : int
+            Number of processes to split the simulations across
+
+        Returns
+        -------
+        rad : list of ndarrays
+            List of 1D arrays of predicted abundance for each species
+
+        '''
         
         # Get parameters
         n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
         assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
+        random_state = check_random_state(random_state)
 
         # Calculate rad
         rad = []
         for tn_samp, ttot_obs in zip(n_samp, tot_obs):
-            total = []
-            for i in xrange(sample_size):
-                U = np.random.triangular(0.5, 0.75, 1, size=tn_samp - 1)
-                p = []
-                # TODO: Could this be refactored to perform better?
-                for i in xrange(np.int(tn_samp)):
-                    if i == 0:
-                        p.append(1)
-                    else:
-                        index = np.random.random_integers(0, len(p) - 1)
-                        p_new1 = p[index] * U[i - 1]
-                        p_new2 = p[index] * (1 - U[i - 1])
-                        p[index] = p_new1
-                        p.append(p_new2)
-                        p.sort(reverse=True)
-                total.append(p)
-      
-            total_array = np.array(total)
-            means = np.array([np.mean(total_array[:,i]) for i in 
-                                                         xrange(int(tn_samp))])
+            tn_samp = int(tn_samp)
+
+            if n_jobs > 1:
+                # Each process gets its own seed drawn from random_state
+                reps = np.diff(np.linspace(0, sample_size, num=n_jobs + 1)
+                                                               .astype(int))
+                seeds = np.floor(random_state.uniform(size=n_jobs) * 2**31)
+                args = [(tn_samp, trep, int(tseed)) for trep, tseed in 
+                                                          zip(reps, seeds)]
+                pool = multiprocessing.Pool(n_jobs)
+                try:
+                    sums = pool.map(_sugihara_sums, args)
+                finally:
+                    pool.close()
+                    pool.join()
+                total = np.sum(sums, axis=0)
+            else:
+                total = _sugihara_sums((tn_samp, sample_size, random_state))
+
+            means = total / sample_size
             rad.append(np.sort(ttot_obs * means))
 
         return rad
 
-    def cdf(self, n):
+    def rvs(self, size=1, random_state=None):
         '''
-        No cdf exists for this distribution
+        Random variates method.
 
-        '''
+        Parameters
+        ----------
+        size : int or tuple of ints
+            Shape of the array of variates drawn for each parameter set
+        random_state : None, int, np.random.RandomState or np.random.Generator
+            Source of random numbers (see check_random_state)
+
+        Returns
+        -------
+        rvs : list of ndarrays
+            List of arrays of random variates, one for each parameter set
+
+        Notes
+        -----
+        Each variate is tot_obs times a fragment picked at random from a
+        simulated sequential breakage. Variates are taken from
+        size / n_samp simulations in random order, so the n_samp variates of
+        one simulation are not independent of each other.
+
+        '''
+
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        assert np.all(n_samp <= tot_obs), 'n_samp must be <= tot_obs'
+        random_state = check_random_state(random_state)
+        num = int(np.prod(size))
+
+        rvs = []
+        for tn_samp, ttot_obs in zip(n_samp, tot_obs):
+            tn_samp = int(tn_samp)
+            reps = int(np.ceil(num / tn_samp))
+            p = _sugihara_breakage(tn_samp, reps, random_state).ravel()
+            p = random_state.permutation(p)[:num]
+            rvs.append(np.reshape(ttot_obs * p, size))
+
+        return rvs
+
+    def cdf(self, n):
+        '''
+        No cdf exists for this distribution
+
+        '''
 
         raise NotImplementedError('No CDF exists for object %s' %
                                                     self.__class__.__name__)
@@ -1781,6 +2841,28 @@ class binm(Distribution):
             pmf.append(stats.binom.pmf(tn, ttot_obs, ta))
             self.var['p'].append(ta)
         return pmf
+
+    @doc_inherit
+    def logpmf(self, n):
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        n = expand_n(n, len(n_samp))
+
+        logpmf = []
+        self.var['p'] = []
+        for tn_samp, ttot_obs, tn in zip(n_samp, tot_obs, n):
+            ta = 1 / tn_samp
+            logpmf.append(stats.binom.logpmf(tn, ttot_obs, ta))
+            self.var['p'].append(ta)
+        return logpmf
+
+    @doc_inherit
+    def rvs(self, size=1, random_state=None):
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        random_state = check_random_state(random_state)
+
+        self.var['p'] = list(1 / n_samp)
+        return [random_state.binomial(int(ttot_obs), 1 / tn_samp, size=size)
+                                for tn_samp, ttot_obs in zip(n_samp, tot_obs)]
     
     @doc_inherit
     def cdf(self, n):
@@ -1797,6 +2879,26 @@ class binm(Distribution):
             self.var['p'].append(ta)
         return cdf
 
+    def _pmf_batch(self, n, expand):
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        self.var['p'] = list(1 / n_samp)
+        return stats.binom.pmf(n, expand(tot_obs), expand(1 / n_samp))
+
+    def _cdf_batch(self, n, expand):
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        self.var['p'] = list(1 / n_samp)
+        return stats.binom.cdf(n, expand(tot_obs), expand(1 / n_samp))
+
+    @doc_inherit
+    def p_absent(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+        return np.where(N == 0, 1, np.exp(N * np.log1p(-a)))
+
+    @doc_inherit
+    def p_endemic(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+        return stats.binom.pmf(N, N, a)
+
 class pois(Distribution):
     __doc__ = Distribution.__doc__ + \
     '''
@@ -1840,6 +2942,29 @@ class pois(Distribution):
             pmf.append(stats.poisson.pmf(tn, tmu))
             self.var['mu'].append(tmu)
         return pmf
+
+    @doc_inherit
+    def logpmf(self, n):
+
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        n = expand_n(n, len(n_samp))
+
+        logpmf = []
+        self.var['mu'] = []
+        for tn_samp, ttot_obs, tn in zip(n_samp, tot_obs, n):
+            tmu = ttot_obs * (1 / tn_samp)
+            logpmf.append(stats.poisson.logpmf(tn, tmu))
+            self.var['mu'].append(tmu)
+        return logpmf
+
+    @doc_inherit
+    def rvs(self, size=1, random_state=None):
+
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        random_state = check_random_state(random_state)
+
+        self.var['mu'] = list(tot_obs / n_samp)
+        return [random_state.poisson(tmu, size=size) for tmu in self.var['mu']]
     
     @doc_inherit
     def cdf(self, n): 
@@ -1857,6 +2982,26 @@ class pois(Distribution):
             self.var['mu'].append(tmu)
         return cdf
 
+    def _pmf_batch(self, n, expand):
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        self.var['mu'] = list(tot_obs / n_samp)
+        return stats.poisson.pmf(n, expand(tot_obs / n_samp))
+
+    def _cdf_batch(self, n, expand):
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        self.var['mu'] = list(tot_obs / n_samp)
+        return stats.poisson.cdf(n, expand(tot_obs / n_samp))
+
+    @doc_inherit
+    def p_absent(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+        return np.exp(-N * a)
+
+    @doc_inherit
+    def p_endemic(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+        return stats.poisson.pmf(N, N * a)
+
 class nbd(Distribution):
     __doc__ = Distribution.__doc__ + \
     '''
@@ -1924,6 +3069,61 @@ class nbd(Distribution):
             self.var['p'].append(tp)
         return pmf 
 
+    def logpmf(self, n):
+        '''
+        Log of the probability mass function.
+
+        Parameters
+        ----------
+        n : int, float or array-like object
+            Values at which to calculate the log pmf. May be a list of same
+            length as parameters, or single iterable.
+
+        Returns
+        -------
+        logpmf : list of ndarrays
+            List of 1D arrays of the log probability of observing sample n.
+
+        See class docstring for more specific information on this distribution.
+        '''
+
+        n_samp, tot_obs, k = self.get_params(['n_samp', 'tot_obs', 'k'])
+        n = expand_n(n, len(n_samp))
+
+        logpmf = []
+        self.var['p'] = []
+
+        for tn_samp, ttot_obs, tk, tn in zip(n_samp, tot_obs, k, n):
+            tmu = ttot_obs * (1 / tn_samp)
+            tp = 1 / (tmu / tk + 1) # See Bolker book Chapt 4
+            logpmf.append(scipy.stats.nbinom.logpmf(tn, tk, tp))
+            self.var['p'].append(tp)
+        return logpmf
+
+    def rvs(self, size=1, random_state=None):
+        '''
+        Random variates method.
+
+        Parameters
+        ----------
+        size : int or tuple of ints
+            Shape of the array of variates drawn for each parameter set
+        random_state : None, int, np.random.RandomState or np.random.Generator
+            Source of random numbers (see check_random_state)
+
+        Returns
+        -------
+        rvs : list of ndarrays
+            List of arrays of random variates, one for each parameter set
+
+        See class docstring for more specific information on this distribution.
+        '''
+
+        random_state = check_random_state(random_state)
+        k, p = self._batch_params()
+        return [random_state.negative_binomial(tk, tp, size=size) for tk, tp
+                                                                  in zip(k, p)]
+
     def cdf(self, n):
         '''
         Cumulative distribution method.  
@@ -1956,8 +3156,26 @@ class nbd(Distribution):
             cdf.append(scipy.stats.nbinom.cdf(tn, tk, tp))
             self.var['p'].append(tp)
         return cdf
+
+    def _pmf_batch(self, n, expand):
+        k, p = self._batch_params()
+        return scipy.stats.nbinom.pmf(n, expand(k), expand(p))
+
+    def _cdf_batch(self, n, expand):
+        k, p = self._batch_params()
+        return scipy.stats.nbinom.cdf(n, expand(k), expand(p))
+
+    def _batch_params(self):
+        '''
+        Arrays of k and p for all parameter sets, for the batch kernels
+        '''
+        n_samp, tot_obs, k = self.get_params(['n_samp', 'tot_obs', 'k'])
+        p = 1 / (tot_obs / n_samp / k + 1)
+        self.var['p'] = list(p)
+        return k, p
     
-    def fit(self, data, guess_for_k=1):
+    # @doc_inherit cannot be used here because of derived nbd_lt
+    def fit(self, data, guess_for_k=1, method='newton'):
         '''
         Fit method.
 
@@ -1970,7 +3188,15 @@ class nbd(Distribution):
             Data to use to fit parameters of distribution. Even if only one 
             data array, must be in a list with one element.
         guess_for_k : float
-            Initial guess for parameter k in solver
+            Initial guess for parameter k in the 'fmin' solver. The 'newton'
+            solver starts from the moment estimate of k and only returns
+            guess_for_k for data that are all zero.
+        method : str
+            If 'newton' (default), the data are reduced to count histograms
+            and the score equation for k is solved for all data arrays at
+            once (see _nbd_k_mle). If 'fmin', the full pmf is minimized with
+            scipy.optimize.fmin for one data array at a time, as in earlier
+            versions.
 
         See class docstring for more specific information on this distribution.
         '''
@@ -1979,6 +3205,16 @@ class nbd(Distribution):
         n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
 
         data = check_list_of_iterables(data) 
+
+        if method == 'newton':
+            values, counts = zip(*[np.unique(tdata, return_counts=True)
+                                                           for tdata in data])
+            self.params['k'] = _nbd_k_mle(values, counts,
+                                trunc=self.min_supp == 1, guess=guess_for_k)
+            return self
+        elif method != 'fmin':
+            raise ValueError("Fit method '%s' not recognized" % method)
+
         tempk = []
 
         for tdata, tn_samp, ttot_obs in zip(data, n_samp, tot_obs): 
@@ -1987,7 +3223,7 @@ class nbd(Distribution):
                 self.params['tot_obs'] = ttot_obs
                 self.params['n_samp'] = tn_samp
                 self.params['k'] = k
-                return -sum(np.log(self.pmf(tdata)[0]))
+                return -np.sum(self.logpmf(tdata)[0])
 
             mlek = scipy.optimize.fmin(nll_nb, np.array([guess_for_k]), 
                                                                     disp=0)[0]
@@ -1997,7 +3233,58 @@ class nbd(Distribution):
         self.params['tot_obs'] = tot_obs
         return self
 
-class nbd_lt(nbd):
+    # @doc_inherit cannot be used here because of derived nbd_lt
+    def p_absent(self, abundances, cell_fraction):
+        '''
+        Probability that a species is absent from a cell.
+
+        Parameters
+        ----------
+        abundances : int, float or array-like object
+            Total abundance (tot_obs) of each species
+        cell_fraction : float or array-like object
+            Fraction of the total area covered by the cell, i.e. 1 / n_samp. 
+            Either one value or one per abundance.
+
+        Returns
+        -------
+        : np.ndarray
+            1D array with the probability of zero individuals in the cell for
+            each abundance
+
+        See class docstring for more specific information on this distribution.
+        '''
+        N, a = _ssad_args(abundances, cell_fraction)
+        k = self.get_params(['k'])[0]
+        return np.exp(-k * np.log1p(N * a / k))
+
+    # @doc_inherit cannot be used here because of derived nbd_lt
+    def p_endemic(self, abundances, cell_fraction):
+        '''
+        Probability that all individuals of a species are in a cell.
+
+        Parameters
+        ----------
+        abundances : int, float or array-like object
+            Total abundance (tot_obs) of each species
+        cell_fraction : float or array-like object
+            Fraction of the total area covered by the cell, i.e. 1 / n_samp. 
+            Either one value or one per abundance.
+
+        Returns
+        -------
+        : np.ndarray
+            1D array with the probability of n = tot_obs in the cell for each
+            abundance
+
+        See class docstring for more specific information on this distribution.
+        '''
+        N, a = _ssad_args(abundances, cell_fraction)
+        k = self.get_params(['k'])[0]
+        p = 1 / (N * a / k + 1)
+        return scipy.stats.nbinom.pmf(N, k, p)
+
+class nbd_lt(LowerTruncated, nbd):
     '''
     Description
     -----------
@@ -2027,6 +3314,7 @@ class nbd_lt(nbd):
     The total species (S) is equivalent to n_samp and the total
     individuals (N) is equivalent to tot_obs.
 
+    The truncation is provided by LowerTruncated.
 
     '''
 
@@ -2037,70 +3325,17 @@ class nbd_lt(nbd):
         self.var = {}
     
     
-    def pmf(self, n):
-        '''
-        Probability mass function method.
-
-        Parameters
-        ----------
-        n : int, float or array-like object
-            Values at which to calculate pmf. May be a list of same length as 
-            parameters, or single iterable.
-
-        Returns
-        -------
-        pmf : list of ndarrays
-            List of 1D arrays of probability of observing sample n.
-
-        See class docstring for more specific information on this distribution.
-        '''
-
-        # Get parameters
-        n_samp, tot_obs, k = self.get_params(['n_samp', 'tot_obs', 'k'])
-        n = expand_n(n, len(n_samp))
-        
-        # TODO: Additional checks?
-
-        reg_nbd = nbd(n_samp=n_samp, tot_obs=tot_obs, k=k)
-        reg_pmf = reg_nbd.pmf(n)
-        self.var = reg_nbd.var
-        reg_pmf0 = reg_nbd.pmf(0)
-
-        trunc_pmf = [(pr / (1 - p0)) for pr, p0 in zip(reg_pmf, reg_pmf0)]
-
-        return trunc_pmf         
-
-    def cdf(self, n):
-        '''
-        Cumulative distribution method.  
-
-        Parameters
-        ----------
-        n : int, float or array-like object
-            Values at which to calculate cdf. May be a list of same length as 
-            parameters, or single iterable.
-
-        Returns
-        -------
-        cdf : list of ndarrays
-            List of 1D arrays of probability of observing sample n.
-
-        See class docstring for more specific information on this distribution.
-        '''
-
-        n_samp, tot_obs, k = self.get_params(['n_samp', 'tot_obs', 'k'])
-        n = expand_n(n, len(n_samp))
-        
-        # TODO: Additional checks?
-
-        reg_nbd = nbd(n_samp=n_samp, tot_obs=tot_obs, k=k)
-        p0 = reg_nbd.pmf(0)
-        self.var = reg_nbd.var
-        reg_cdf = reg_nbd.cdf(n)
-
-        trun_cdf = [(tcdf - tp0) / (1 - tp0) for tcdf, tp0 in zip(reg_cdf, p0)]
-
-        return trun_cdf
+    def _pmf_batch(self, n, expand):
+        k, p = self._batch_params()
+        p0 = scipy.stats.nbinom.pmf(0, k, p)
+        return np.where(n >= self.min_supp, scipy.stats.nbinom.pmf(n,
+                        expand(k), expand(p)) / (1 - expand(p0)), 0)
+
+    def _cdf_batch(self, n, expand):
+        k, p = self._batch_params()
+        p0 = expand(scipy.stats.nbinom.pmf(0, k, p))
+        return np.where(n >= self.min_supp, (scipy.stats.nbinom.cdf(n,
+                        expand(k), expand(p)) - p0) / (1 - p0), 0)
 
 class fnbd(Distribution):
     __doc__ = Distribution.__doc__ + \
@@ -2141,13 +3376,19 @@ class fnbd(Distribution):
         #    elif (a <= 0) or (a >= 1):
         #        raise Exception, "a must be between 0 and 1"
 
+        # TODO: Additional checks?
+
+        # The kernel is computed in log space
+        return [np.exp(tlogpmf) for tlogpmf in self.logpmf(n)]
+
+    @doc_inherit
+    def logpmf(self, n):
+
         # Get parameters
         n_samp, tot_obs, k = self.get_params(['n_samp', 'tot_obs', 'k'])
         n = expand_n(n, len(n_samp))
-        
-        # TODO: Additional checks?
-        
-        pmf = []
+
+        logpmf = []
         self.var['p'] = []
 
         for tn_samp, ttot_obs, tk, tn in zip(n_samp, tot_obs, k, n):
@@ -2155,12 +3396,11 @@ class fnbd(Distribution):
             ln_L = lambda n_i,N,a,k: _ln_choose(n_i+k-1,n_i) + \
                 _ln_choose(N-n_i+(k/a)-k-1,N-n_i) - _ln_choose(N +(k/a)-1,N)
             ta = 1 / tn_samp
-            tpmf = ln_L(tn, ttot_obs, ta, tk) # Already log
-            pmf.append(np.exp(tpmf))
+            logpmf.append(ln_L(tn, ttot_obs, ta, tk))
             self.var['p'].append(ta)
-        return pmf
+        return logpmf
     
-    def fit(self, data, upper_bnd=10):
+    def fit(self, data, upper_bnd=10, method='profile'):
         '''
         Fit method.
 
@@ -2174,6 +3414,13 @@ class fnbd(Distribution):
             data array, must be in a list with one element.
         upper_bnd : int
             upper_bnd for parameter k in solver
+        method : str
+            If 'profile' (default), each data array is reduced to a count
+            histogram, the log-likelihood is evaluated on a log-spaced grid
+            of k in one call and the best grid point is refined with a
+            bounded scalar minimizer (see _fnbd_nll). If 'brute', the full
+            pmf is minimized with scipy.optimize.brute, as in earlier
+            versions.
 
         See class docstring for more specific information on this distribution.
         '''
@@ -2184,13 +3431,23 @@ class fnbd(Distribution):
 
         tempk = []
 
+        if method == 'profile':
+            for tdata, tn_samp, ttot_obs in zip(data, n_samp, tot_obs):
+                n_uniq, counts = np.unique(tdata, return_counts=True)
+                tempk.append(_fnbd_k_mle(n_uniq, counts, ttot_obs,
+                                         1 / tn_samp, upper_bnd))
+            self.params['k'] = np.array(tempk)
+            return self
+        elif method != 'brute':
+            raise ValueError("Fit method '%s' not recognized" % method)
+
         for tdata, tn_samp, ttot_obs in zip(data, n_samp, tot_obs): 
 
             def nll_nb(k):
                 self.params['tot_obs'] = ttot_obs
                 self.params['n_samp'] = tn_samp
                 self.params['k'] = k
-                return -sum(np.log(self.pmf(tdata)[0]))
+                return -np.sum(self.logpmf(tdata)[0])
             
             mlek = scipy.optimize.brute(nll_nb, ((1e-10, upper_bnd),))
             tempk.append(mlek[0])
@@ -2200,6 +3457,18 @@ class fnbd(Distribution):
         self.params['tot_obs'] = tot_obs
         return self
 
+    @doc_inherit
+    def p_absent(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+        k = self.get_params(['k'])[0]
+        return np.exp(_fnbd_ln_p_absent(N, a, k))
+
+    @doc_inherit
+    def p_endemic(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+        k = self.get_params(['k'])[0]
+        return np.exp(_fnbd_ln_p_endemic(N, a, k))
+
 class geo(Distribution):
     __doc__ = Distribution.__doc__ + \
     '''
@@ -2241,6 +3510,29 @@ class geo(Distribution):
         pmf = nbd(tot_obs=tot_obs, n_samp=n_samp, k=k).pmf(n)
         self.var['p'] = 1 / n_samp
         return pmf
+
+    @doc_inherit
+    def logpmf(self, n):
+
+        # Get parameters
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        n = expand_n(n, len(n_samp))
+
+        k = np.repeat(1, len(n_samp))
+        logpmf = nbd(tot_obs=tot_obs, n_samp=n_samp, k=k).logpmf(n)
+        self.var['p'] = 1 / n_samp
+        return logpmf
+
+    @doc_inherit
+    def rvs(self, size=1, random_state=None):
+
+        # Get parameters
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        random_state = check_random_state(random_state)
+
+        self.var['p'] = 1 / n_samp
+        return [random_state.negative_binomial(1, tp, size=size) for tp in
+                                                    1 / (tot_obs / n_samp + 1)]
     
     @doc_inherit
     def cdf(self, n):
@@ -2255,6 +3547,27 @@ class geo(Distribution):
         cdf = nbd(tot_obs=tot_obs, n_samp=n_samp, k=k).cdf(n)
         self.var['p'] = 1 / n_samp
         return cdf
+
+    def _pmf_batch(self, n, expand):
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        self.var['p'] = 1 / n_samp
+        return scipy.stats.nbinom.pmf(n, 1, expand(1 / (tot_obs / n_samp + 1)))
+
+    def _cdf_batch(self, n, expand):
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        self.var['p'] = 1 / n_samp
+        return scipy.stats.nbinom.cdf(n, 1, expand(1 / (tot_obs / n_samp + 1)))
+
+    @doc_inherit
+    def p_absent(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+        return 1 / (1 + N * a)
+
+    @doc_inherit
+    def p_endemic(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+        p = 1 / (N * a + 1)
+        return scipy.stats.nbinom.pmf(N, 1, p)
         
 class fgeo(Distribution):
     __doc__ = Distribution.__doc__ + \
@@ -2304,6 +3617,19 @@ class fgeo(Distribution):
         pmf = tfnbd.pmf(n)
         self.var=  tfnbd.var
         return pmf 
+
+    @doc_inherit
+    def logpmf(self, n):
+
+        # Get parameters
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        n = expand_n(n, len(n_samp))
+
+        k = np.repeat(1, len(n_samp))
+        tfnbd = fnbd(tot_obs=tot_obs, n_samp=n_samp, k=k)
+        logpmf = tfnbd.logpmf(n)
+        self.var = tfnbd.var
+        return logpmf
     
     @doc_inherit
     def cdf(self, n):
@@ -2320,6 +3646,16 @@ class fgeo(Distribution):
         self.var = tfnbd.var
         return cdf
 
+    @doc_inherit
+    def p_absent(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+        return np.exp(_fnbd_ln_p_absent(N, a, 1))
+
+    @doc_inherit
+    def p_endemic(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+        return np.exp(_fnbd_ln_p_endemic(N, a, 1))
+
 class tgeo(Distribution):
     __doc__ = Distribution.__doc__ + \
     '''
@@ -2346,12 +3682,10 @@ class tgeo(Distribution):
 
     'a' is equal to 1 / n_samp
 `
-    Plotting eq for various realistic values of p, N, and a confirms that 
-    this is a smooth, well-behaved function that should be amenable to 
-    using a root finder. When a is large and N is small (i.e. a = .9 and
-    N = 32) the lagrange multiplier has no solution.  For large a's (.8 or
-    greater), N needs to be sufficiently large for lambda pi to have a 
-    solution.
+    x is found by solvers.tgeo_lambda, which solves for log(x) for all
+    parameter sets in one vectorized pass and evaluates the mean in log space,
+    so large tot_obs and large a do not overflow. There is a solution for any
+    0 < a < 1.
 
     ''' 
     
@@ -2371,13 +3705,16 @@ class tgeo(Distribution):
         
         # TODO: Additional checks?
 
-        #NOTE: Overflow warning but not affecting results
-        eq = lambda x, N, a: ((x / (1 - x)) - (((N + 1) * x ** (N + 1)) / \
-                            (1 - x ** (N + 1)))) - (N * a)
+        # Solve for the log of x for all parameter sets at once
+        a = 1 / np.array(n_samp, dtype=float)
+        tot_obs = np.array(tot_obs, dtype=float)
+        lam = self._solve_lambda(tot_obs, a)
+        log_norm = tgeo_log_norm(lam, tot_obs)
+
         pmf = []
         self.var['x'] = []
-        for tn_samp, ttot_obs, tn in zip(n_samp, tot_obs, n):
-            ta = 1 / tn_samp
+        for ttot_obs, ta, tlam, tlog_norm, tn in zip(tot_obs, a, lam,
+                                                     log_norm, n):
 
             #Compute probability directly to save time
             if ta == 0.5: 
@@ -2391,43 +3728,88 @@ class tgeo(Distribution):
                 x = 0 
 
             else:
-                try:
-                    
-                    x = scipy.optimize.brentq(eq, 0, min((sys.float_info[0] *
-                        ta)**(1/float(ttot_obs)), 8), args=(ttot_obs, ta), 
-                        disp=False, xtol=1e-60)
-                except: 
-                    try: # Allows it to pass, but optimizer starts rounding.
-                         # Not Sure why it is doing this.
-                        x = scipy.optimize.brentq(eq, 8.0, 50.0, \
-                                   args=(ttot_obs, ta), disp=False, xtol=1e-60)
-                    except:
-
-                        raise ValueError("No solution to %s.pmf when tot_obs = " %
-                                     (self.__class__.__name__) +
-                                     "%.2f, n_samp = %.10f and a = %.10f" % 
-                                     (ttot_obs, tn_samp, ta))
-                z = (1 - x ** (ttot_obs + 1)) / (1 - x)
-                tpmf = (1 / z) * (x ** tn)
+                x = np.exp(tlam)
+                if np.abs(tlam) * ttot_obs < 700:
+                    tpmf = (1 / np.exp(tlog_norm)) * (x ** tn)
+                else:  # Powers of x would overflow
+                    tpmf = np.exp(tlam * tn - tlog_norm)
 
             pmf.append(tpmf)
             self.var['x'].append(x)
 
         return pmf
 
-class mete_sar_iter(Curve):
-    __doc__ = Curve.__doc__ + \
-    '''
-    Description
-    -----------
-    Computes values for the approximated METE generated SAR iteratively.
-
-    Parameters
-    ----------
-    S : int
-        Total number of species at the anchor area
-    N : int
-        Total number of individuals at the anchor area
+    @doc_inherit
+    def logpmf(self, n):
+
+        # Get parameters
+        n_samp, tot_obs = self.get_params(['n_samp', 'tot_obs'])
+        n = expand_n(n, len(n_samp))
+
+        a = 1 / np.array(n_samp, dtype=float)
+        tot_obs = np.array(tot_obs, dtype=float)
+        lam = self._solve_lambda(tot_obs, a)
+        log_norm = tgeo_log_norm(lam, tot_obs)
+
+        # log p(n) = n * log(x) - log(z), which never overflows
+        logpmf = []
+        for ttot_obs, ta, tlam, tlog_norm, tn in zip(tot_obs, a, lam, log_norm,
+                                                                            n):
+            if ta == 1:
+                logpmf.append(np.where(tn == ttot_obs, 0., -np.inf))
+            else:
+                logpmf.append(tlam * tn - tlog_norm)
+
+        self.var['x'] = list(np.where(a == 1, 0, np.exp(lam)))
+        return logpmf
+
+    @doc_inherit
+    def p_absent(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+
+        # p(0) = 1 / z, with the same special cases as pmf
+        lam = self._solve_lambda(N, a)
+        p0 = np.exp(-tgeo_log_norm(lam, N))
+        p0[a == 1] = (N[a == 1] == 0)
+        return p0
+
+    @doc_inherit
+    def p_endemic(self, abundances, cell_fraction):
+        N, a = _ssad_args(abundances, cell_fraction)
+
+        # p(N) = x**N / z
+        lam = self._solve_lambda(N, a)
+        pN = np.exp(lam * N - tgeo_log_norm(lam, N))
+        pN[a == 1] = 1
+        return pN
+
+    def _solve_lambda(self, N, a):
+        '''
+        log(x) for arrays of tot_obs and a, zero where a is 0.5 or 1
+        '''
+        solve = (a != 0.5) & (a != 1)
+        lam = np.zeros(len(N))
+        lam[solve] = tgeo_lambda(N[solve], a[solve])
+        if np.any(np.isnan(lam)):
+            ind = np.where(np.isnan(lam))[0][0]
+            raise ValueError("No solution to %s when " %
+                             (self.__class__.__name__) +
+                             "tot_obs = %.2f and a = %.10f" % (N[ind], a[ind]))
+        return lam
+
+class mete_sar_iter(Curve):
+    __doc__ = Curve.__doc__ + \
+    '''
+    Description
+    -----------
+    Computes values for the approximated METE generated SAR iteratively.
+
+    Parameters
+    ----------
+    S : int
+        Total number of species at the anchor area
+    N : int
+        Total number of individuals at the anchor area
 
     Notes
     -----
@@ -2449,7 +3831,7 @@ class mete_sar_iter(Curve):
                                   " 'mete_sar_iter'")
 
     def iter_vals(self, a_list=None, upscale=0, downscale=0, non_iter=False,
-                                                                     **kwargs):
+                                                             base=2, **kwargs):
         '''
         Predict the universal SAR curve for the given S and N found at 
         the given anchor scale
@@ -2460,13 +3842,19 @@ class mete_sar_iter(Curve):
             Target areas for which to calculate SAR
         upscale : int
             Number of iterations up from the anchor scale.  Each iteration 
-            doubles the previous area. Only active if a_list is None.
+            multiplies the previous area by base. Only active if a_list is
+            None.
         downscale : int
             Number of iterations down from the anchor scale. Each iteration 
-            halves the previous area. Only active if a_list is None.
+            divides the previous area by base. Only active if a_list is None.
         non_iter : bool
             If False, returns all iterations.  If True, only returns iterations
             that match a_list.
+        base : float
+            Ratio of successive areas. Must be greater than 1. With base = 2
+            this is method 1 of Harte (2011). Other bases use the METE
+            probability that a species is absent from a cell of 1 / base of
+            the area.
 
         Returns
         -------
@@ -2477,10 +3865,15 @@ class mete_sar_iter(Curve):
         Notes
         -----
         With this method of the METE SAR, one cannot calculate the SAR at exact
-        areas.  Rather this method iterates up and down by powers of 2.
+        areas.  Rather this method iterates up and down by powers of base.
         Therefore, the output of this function will contain all the SAR
         calculations in between ~min(a_list) ~max(a_list).
 
+        Each iteration solves for beta in log space and evaluates the
+        truncated sums over abundance in constant memory (see
+        solvers.mete_upscale_sar and solvers.mete_downscale_sar), so many
+        iterations and very large N are cheap.
+
 
         '''
         #Get and check params
@@ -2495,21 +3888,23 @@ class mete_sar_iter(Curve):
             raise TypeError('a_list is not an array-like object')
 
         anch = 1
-        if a_list != None:
-            upscale, downscale = set_up_and_down(anch, a_list)
+        if a_list is not None:
+            upscale, downscale = set_up_and_down(anch, a_list, base=base)
         
         if upscale == 0 and downscale == 0:
             return np.array((S, anch), dtype=[('items', np.float),
                                                 ('area', np.float)])
-        areas = _generate_areas_(anch, upscale, downscale)
+        areas = _generate_areas_(anch, upscale, downscale, base=base)
         sar = np.empty(len(areas), dtype=[('items', np.float),
                                       ('area', np.float)])
         sar['area'] = areas
         if upscale != 0:
-            sar['items'][downscale:] = _upscale_sar_(areas[downscale:], N, S)
+            sar['items'][downscale:] = _upscale_sar_(areas[downscale:], N, S,
+                                                     base=base)
         if downscale != 0:
             sar['items'][:downscale + 1] =\
-                                   _downscale_sar_(areas[:downscale + 1], N, S)
+                                   _downscale_sar_(areas[:downscale + 1], N, S,
+                                                   base=base)
 
         if non_iter == False:
             return sar
@@ -2520,10 +3915,10 @@ class mete_sar_iter(Curve):
             return sar[ind]
 
     @doc_inherit
-    def univ_curve(self, num_iter=5, direction='down', **kwargs):
+    def univ_curve(self, num_iter=5, direction='down', base=2, **kwargs):
 
         return super(mete_sar_iter, self).univ_curve(num_iter=num_iter,
-                  direction=direction, param='tot_obs', iterative=True, base=2)
+                direction=direction, param='tot_obs', iterative=True, base=base)
         
     def fit(self, *args):
         '''
@@ -2649,11 +4044,23 @@ class gen_sar(Curve):
     tot_obs : float
         Total number of individuals at the anchor area
 
+    self.var keywords
+    -----------------
+    timing : structured np.array
+        Seconds spent at each area by the last call to vals or iter_vals, with
+        dtype=[('area', np.float), ('seconds', np.float)]
+
     Notes
     -----
     plognorm and plognorm_lt are not supported by gen_sar. If one would like
     them to be supported, the full pmf for the sad must be calculated in the
     fit method.
+
+    The sad and ssad objects are never modified. vals works on copies of them
+    and caches sad pmfs/rads by their params (including n_samp and tot_obs)
+    and ssad occupancy vectors by (tot_obs, area, form), so repeated and
+    iterated calls reuse them. With use_rad=False, upscaling root solves start
+    from the ratio Sbig / S of the previous upscale.
     
 
     '''
@@ -2678,6 +4085,12 @@ class gen_sar(Curve):
         self.sad = sad
         self.ssad = ssad
         self.params = kwargs
+        self.var = {}
+
+        # Caches of sad pmfs/rads and ssad occupancy used by vals
+        self._sad_cache = LRUCache(maxsize=64)
+        self._occ_cache = LRUCache(maxsize=64)
+        self._up_ratio = {}
 
     def get_name(self):
         '''
@@ -2751,7 +4164,7 @@ class gen_sar(Curve):
             raise TypeError('a_list is not an array-like object')
 
         anch = 1
-        if a_list != None:
+        if a_list is not None:
             upscale, downscale = set_up_and_down(anch, a_list, base=base)
 
         if upscale == 0 and downscale == 0:
@@ -2761,6 +4174,7 @@ class gen_sar(Curve):
         sar = np.empty(len(areas), dtype=[('items', np.float),
                                       ('area', np.float)])
         sar['area'] = areas
+        timing = {}
         def up_down_scale(areas, up_down):
             N_list = []; S_list = [] 
             
@@ -2778,6 +4192,7 @@ class gen_sar(Curve):
                     self.params['n_samp'] = S
                     S_list.append(self.vals([da], use_rad=use_rad, 
                                                         form=form)['items'][0])
+                    timing[da] = self.var['timing']['seconds'][0]
                     N_list.append(N)
 
                 else:
@@ -2798,6 +4213,7 @@ class gen_sar(Curve):
                     self.params['n_samp'] = S_list[i - 1]
                     S_list.append(self.vals([a], use_rad=use_rad, 
                                                         form=form)['items'][0])
+                    timing[da] = self.var['timing']['seconds'][0]
 
                     # Can't have less then one individual
                     if N * da < 1:
@@ -2809,8 +4225,6 @@ class gen_sar(Curve):
             # Reset anchor values
             self.params['tot_obs'] = N
             self.params['n_samp'] = S
-            self.sad.params['tot_obs'] = N
-            self.sad.params['n_samp'] = S
 
             if up_down == 'down':
                 return np.array(S_list)[::-1]
@@ -2823,7 +4237,12 @@ class gen_sar(Curve):
         if downscale != 0:
             sar['items'][:downscale + 1] = up_down_scale(areas[:downscale +
                                                               1][::-1], 'down')
-        if non_iter == False or a_list == None:
+
+        # Seconds spent at each area
+        self.var['timing'] = np.array(sorted(timing.iteritems()), 
+                            dtype=[('area', np.float), ('seconds', np.float)])
+
+        if non_iter == False or a_list is None:
             return sar
         else:
             ind = np.zeros(len(sar), dtype=bool)
@@ -2877,75 +4296,26 @@ class gen_sar(Curve):
                             (form))
     
         # Calculating sad in this method, not in fit.  More flexible this way.
-        # However, this is a bit slower
+        # Sad values and occupancy are cached, so repeated calls are cheap.
         S, N = self.get_params(['n_samp', 'tot_obs'])
-        self.sad.params['n_samp'] = S; self.sad.params['tot_obs'] = N
 
         # Calculate either rad or full pmf
         if use_rad:
-            # If n_samp is fractional, need to round
-            self.sad.params['n_samp'] = np.round(self.sad.params['n_samp'],
-                                                                    decimals=0)
-
-            rad = self.sad.rad()[0]
+            rad, N_key = self._sad_vals(S, N, use_rad)
         else:
-            sad = self.sad.pmf(np.arange(1, np.floor(N) + 1))[0]
-        ssad = self.ssad
+            sad = self._sad_vals(S, N, use_rad)[0]
+            N_range = np.arange(1, len(sad) + 1)
+            N_key = ('range', len(sad))
         sar = []
+        timing = []
 
         a_list = make_array(a_list)
         for i, a in enumerate(a_list):
-            
-            #Setting ssad parameters differently if using rad 
-            if use_rad:
-                ssad.params['tot_obs'] = rad
-            else:
-                N_range = np.arange(1, len(sad) + 1)
-                ssad.params['tot_obs'] = N_range
+            start = time.time()
 
             # Upscale
             if a > 1:
-
-                sad_params = deepcopy(self.sad.params)
-                def eq(Sbig, abig, S):
-                    # Setting distribution parameters for guess at upscale
-                    # NOTE: You can't refit plognorm when you upscale. 
-                    Nbig = np.round(abig * self.params['tot_obs'], decimals=0)
-                    self.sad.params['tot_obs'] = Nbig
-
-                    if use_rad:
-                        self.sad.params['n_samp'] = np.round(Sbig, decimals=0)
-                        ssad.params['tot_obs'] = self.sad.rad()[0]
-                    else:
-                        self.sad.params['n_samp'] = Sbig
-                        ssad.params['tot_obs'] = np.arange(1, Nbig + 1)
-                    ssad.params['n_samp'] = np.repeat(abig,
-                                                   len(ssad.params['tot_obs']))
-                    
-                    # Probability of presence list
-                    if form == 'sar':
-                        p_pres_list = [1 - absnt[0] for absnt in ssad.pmf(0)]
-                    elif form == 'ear':
-                        p_pres_list = [fval[0] for fval in 
-                                        ssad.pmf(zip(ssad.params['tot_obs']))]
-                        
-                    if use_rad:
-                        return sum(np.array(p_pres_list)) - S
-                    else:
-                        sadbig = self.sad.pmf(np.arange(1, Nbig + 1))[0]
-                        val = sum(Sbig * sadbig * np.array(p_pres_list)) - S
-                        return val
-                
-                #Optimizing to find Sbig. If error set to nan
-                try:
-                    Sbig = scipy.optimize.brentq(eq, S, a * S, args=(a, S), disp=0)
-                    sar.append(Sbig)
-                except(ValueError):
-                    print 'Could not calculate species number with values' +\
-                           ' a = %s and S = %s' % (str(a), str(S))
-                    sar.append(np.nan)
-
-                self.sad.params = sad_params # Reset sad params
+                sar.append(self._upscale(S, N, a, use_rad, form))
 
             elif a == 1:
                 if use_rad:
@@ -2956,21 +4326,136 @@ class gen_sar(Curve):
 
             # Downscale
             else:
-                ssad.params['n_samp'] = np.repeat(1 / a,
-                                                   len(ssad.params['tot_obs']))
-                if form == 'sar':
-                    p_pres_list = [1 - absnt[0] for absnt in ssad.pmf(0)]
-                elif form == 'ear':
-                    p_pres_list = [fval[0] for fval in 
-                                        ssad.pmf(zip(ssad.params['tot_obs']))]
                 if use_rad:
+                    p_pres_list = self._occupancy(rad, N_key, a, form)
                     sar.append(sum(np.array(p_pres_list)))
                 else:
+                    p_pres_list = self._occupancy(N_range, N_key, a, form)
                     sar.append(sum(S * sad * np.array(p_pres_list)))
 
+            timing.append(time.time() - start)
+
+        self.var['timing'] = np.array(zip(a_list, timing), 
+                            dtype=[('area', np.float), ('seconds', np.float)])
+
         return np.array(zip(sar, a_list), dtype=[('items', np.float), 
                                                   ('area', np.float)])
     
+    def _upscale(self, S, N, a, use_rad, form):
+        '''
+        Solve for the species number Sbig at area a > 1, or nan if there is
+        no solution.
+        '''
+
+        Nbig = np.round(a * N, decimals=0)
+        if not use_rad:
+            # Occupancy over 1..Nbig does not depend on Sbig
+            N_range = np.arange(1, Nbig + 1)
+            p_pres_list = self._occupancy(N_range, ('range', Nbig), 1 / a, form)
+
+        evals = {}
+        def eq(Sbig):
+            # Solvers may evaluate the same point twice
+            if Sbig not in evals:
+                evals[Sbig] = up_eq(Sbig)
+            return evals[Sbig]
+
+        def up_eq(Sbig):
+            if use_rad:
+                radbig, rad_key = self._sad_vals(Sbig, Nbig, True)
+                return sum(self._occupancy(radbig, rad_key, 1 / a, form)) - S
+            else:
+                sadbig = self._sad_vals(Sbig, Nbig, False)[0]
+                return sum(Sbig * sadbig * p_pres_list) - S
+
+        # Warm start with secant steps from the ratio of the last upscale,
+        # falling back to brentq over the full bracket. With use_rad eq is a
+        # step function of the rounded Sbig, so only brentq is used.
+        lower, upper = S, a * S
+        ratio = self._up_ratio.get((form, a))
+        if ratio is not None and not use_rad:
+            try:
+                Sbig = scipy.optimize.newton(eq, ratio * S, tol=2e-12,
+                                             maxiter=20)
+                if lower <= Sbig <= upper and np.isfinite(eq(Sbig)):
+                    self._up_ratio[(form, a)] = Sbig / S
+                    return Sbig
+            except (ValueError, RuntimeError):
+                pass
+
+        #Optimizing to find Sbig. If error set to nan
+        try:
+            Sbig = scipy.optimize.brentq(eq, lower, upper, disp=0)
+        except(ValueError):
+            print 'Could not calculate species number with values' +\
+                   ' a = %s and S = %s' % (str(a), str(S))
+            return np.nan
+
+        if not use_rad:
+            self._up_ratio[(form, a)] = Sbig / S
+        return Sbig
+
+    def _sad_vals(self, S, N, use_rad):
+        '''
+        Cached sad rad, or sad pmf over 1..floor(N), for n_samp S and tot_obs
+        N, and its cache key (None if it cannot be cached). Computed on a copy
+        of self.sad.
+        '''
+
+        sad = copy(self.sad)
+        sad.var = {}
+        sad.params = dict(self.sad.params)
+        sad.params['tot_obs'] = N
+        if use_rad:
+            # If n_samp is fractional, need to round
+            sad.params['n_samp'] = np.round(S, decimals=0)
+        else:
+            sad.params['n_samp'] = S
+
+        key = sad._param_key(0)
+        if key is not None:
+            key = (use_rad, key)
+            vals = self._sad_cache.get(key)
+            if vals is not None:
+                return vals, key
+
+        if use_rad:
+            vals = sad.rad()[0]
+        else:
+            vals = sad.pmf(np.arange(1, np.floor(N) + 1))[0]
+
+        if key is not None:
+            self._sad_cache.set(key, vals)
+        return vals, key
+
+    def _occupancy(self, abundances, N_key, a, form):
+        '''
+        Cached probability of presence ('sar') or of all individuals being
+        present ('ear') in a cell of fraction a for each abundance. N_key
+        identifies abundances, or is None if they cannot be cached.
+        '''
+
+        ssad_key = tuple(sorted((kw, tuple(make_array(val))) for kw, val in
+                                self.ssad.params.iteritems() if kw not in
+                                ['tot_obs', 'n_samp']))
+        key = None if N_key is None else (N_key, a, form, ssad_key)
+        try:
+            occ = None if key is None else self._occ_cache.get(key)
+        except TypeError:  # Unhashable ssad params
+            key = None
+            occ = None
+        if occ is not None:
+            return occ
+
+        if form == 'sar':
+            occ = 1 - self.ssad.p_absent(abundances, a)
+        else:
+            occ = self.ssad.p_endemic(abundances, a)
+
+        if key is not None:
+            self._occ_cache.set(key, occ)
+        return occ
+
     def fit(self, *args):
         '''
         This fit method fills the required parameters for an gen_sar object.
@@ -3016,6 +4501,9 @@ class psi(Distribution):
         Total number of individuals / observations
     E : int or iterable
         Total energy output of community
+    solver : str (optional)
+        Method used to solve for beta. Either 'sum' (default), 'closed' or
+        'grid'. See solvers.mete_x.
 
     self.var keywords 
     ------------------
@@ -3028,150 +4516,138 @@ class psi(Distribution):
     -----
     All other lagrange multipliers can be calculated from beta and lambda_2.
 
+    The pdf is evaluated in log space, and the cdf and rad with expm1 and
+    log1p, so that they stay finite and accurate for communities of millions
+    of individuals.
+
     '''
 
+    key_attrs = ('solver',)
+
     @doc_inherit
-    def __init__(self, **kwargs):
+    def __init__(self, solver='sum', **kwargs):
 
         self.params = kwargs
         self.par_num = 2        
         self.min_supp = 1
         self.var = {}
+        self.solver = solver
 
     @doc_inherit
     def pdf(self, e):
+
+        return [np.exp(tlogpdf) for tlogpdf in self.logpdf(e)]
+
+    @doc_inherit
+    def logpdf(self, e):
         #Get and check parameters
         n_samp, tot_obs, E = self.get_params(['n_samp', 'tot_obs', 'E'])
         e = expand_n(e, len(n_samp))
 
-        start = 0.3
-        stop = 2
-        flmax = sys.float_info[0]
-
-        pdf = []
+        logpdf = []
         self.var['beta'] = []
         self.var['lambda_2'] = []
 
         for tn_samp, ttot_obs, tE, te in zip(n_samp, tot_obs, E, e):
-            k = np.linspace(1, ttot_obs, num=ttot_obs)
+            tbeta, tl2 = self._multipliers(tn_samp, ttot_obs, tE, 'pdf')
+            self.var['beta'].append(tbeta)
+            self.var['lambda_2'].append(tl2)
 
-            try:
-                tx = scipy.optimize.brentq(beta_solver, start,
-                               min((flmax/tn_samp)**(1/float(ttot_obs)), stop), 
-                               args = (k, ttot_obs, tn_samp), disp=True)
-            except(ValueError):
-                raise ValueError("No solution to %s.pmf for tot_obs = %.2f"
-                                 % (self.__class__.__name__, ttot_obs) + 
-                                 " and n_samp = %.2f" % (tn_samp))
+            # Total energy of at least one per individual is needed for a
+            # positive lambda_2, otherwise the pdf is 0 everywhere
+            if tE <= ttot_obs:
+                logpdf.append(np.repeat(-np.inf, np.size(te)))
+                continue
 
-            # Set lagrange multipliers
-            tbeta = -np.log(tx)
-            tl2 = float(tn_samp) / (tE - ttot_obs) # Harte (2011) 7.26
-            tl1 = tbeta - tl2
-            tsigma = tl1 + (tE * tl2)
-            
-            norm = (float(tn_samp) / (tl2 * ttot_obs)) * (((np.exp(-tbeta) - \
-                    np.exp(-tbeta*(ttot_obs + 1))) / (1 - np.exp(-tbeta))) - \
-                    ((np.exp(-tsigma) - np.exp(-tsigma*(ttot_obs + 1))) / \
-                    (1 - np.exp(-tsigma)))) #Harte (2011) 7.22
+            tsigma = tbeta + (tE - 1) * tl2
 
-            #Notation from E.W.
-            exp_neg_gamma = np.exp(-(tbeta + (te - 1) * tl2))
+            # Harte (2011) 7.22, log(sum_n exp(-beta n) - exp(-sigma n)) with
+            # the smaller sum folded in through log1p
+            log_beta_sum = _psi_log_geo_sum(tbeta, ttot_obs)
+            log_norm = np.log(float(tn_samp) / (tl2 * ttot_obs)) + \
+                    log_beta_sum + np.log(-np.expm1(_psi_log_geo_sum(tsigma,
+                                                ttot_obs) - log_beta_sum))
+
+            # Harte (2011) 7.24, with gamma = beta + (e - 1) * lambda_2
+            tgamma = tbeta + (np.asarray(te, dtype=float) - 1) * tl2
+            logpdf.append(np.log(float(tn_samp) / ttot_obs) - log_norm +
+                                  _psi_log_weight(tgamma, ttot_obs))
+
+        return logpdf
 
-            #tpdf = tl2 * tbeta * (exp_neg_gamma / (1 - exp_neg_gamma)**2)
-            
-            tpdf = (float(tn_samp) / (ttot_obs * norm)) * exp_neg_gamma * (1
-                        - ((ttot_obs + 1) * exp_neg_gamma ** ttot_obs) + (ttot_obs *
-                        exp_neg_gamma ** (ttot_obs + 1))) / ((1 -
-                        exp_neg_gamma) ** 2)
-
-            #tpdf = (float(tn_samp) / (ttot_obs * norm)) * ((exp_neg_gamma  / \
-            #        (1 - exp_neg_gamma)**2) - ((exp_neg_gamma**ttot_obs / \
-            #        (1 - exp_neg_gamma)) * (ttot_obs + (exp_neg_gamma / \
-            #        (1 - exp_neg_gamma)))))
-                    # Harte (2011) 7.24
-            pdf.append(tpdf)
-            self.var['beta'].append(tbeta)
-            self.var['lambda_2'].append(tl2)
-        
-        return pdf
-    
     @doc_inherit
     def cdf(self, e):
 
         n_samp, tot_obs, E = self.get_params(['n_samp', 'tot_obs', 'E'])
         e = expand_n(e, len(n_samp))
 
-        start = 0.3
-        stop = 2
-        flmax = sys.float_info[0]
-
         cdf = []
 
         self.var['beta'] = []
         self.var['lambda_2'] = []
 
         for tn_samp, ttot_obs, tE, te in zip(n_samp, tot_obs, E, e):
-            k = np.linspace(1, ttot_obs, num=ttot_obs)
+            tbeta, tl2 = self._multipliers(tn_samp, ttot_obs, tE, 'cdf')
 
-            try:
-                tx = scipy.optimize.brentq(beta_solver, start,
-                               min((flmax/tn_samp)**(1/float(ttot_obs)), stop), 
-                               args = (k, ttot_obs, tn_samp), disp=True)
-            except(ValueError):
-                raise ValueError("No solution to %s.cdf for tot_obs = %.2f"
-                                 % (self.__class__.__name__, ttot_obs) + 
-                                 " and n_samp = %.2f" % (tn_samp))
+            cdf.append(_psi_cdf(te, tbeta, tl2))
+            self.var['beta'].append(tbeta)
+            self.var['lambda_2'].append(tl2)
+
+        return cdf
+
+    @doc_inherit
+    def rvs(self, size=1, random_state=None):
+
+        n_samp, tot_obs, E = self.get_params(['n_samp', 'tot_obs', 'E'])
+        random_state = check_random_state(random_state)
+
+        rvs = []
+        self.var['beta'] = []
+        self.var['lambda_2'] = []
 
-            # Set lagrange multipliers
-            tbeta = -np.log(tx)
-            tl2 = float(tn_samp) / (tE - ttot_obs) # Harte (2011) 7.26
+        for tn_samp, ttot_obs, tE in zip(n_samp, tot_obs, E):
+            tbeta, tl2 = self._multipliers(tn_samp, ttot_obs, tE, 'rvs')
             tl1 = tbeta - tl2
 
-            # Exact cdf equation. 
-            eq2 = lambda x: tbeta * ((1 / (1 - np.exp(tl1 + (tl2 * x)))) - 
-                                    (1 / (1 - np.exp(tl1 + tl2))))
+            # Invert the cdf, with uniforms scaled to its value at E so that
+            # variates stay within [1, E]
+            c0 = 1 / (1 - np.exp(tbeta))
+            cdf_E = _psi_cdf(tE, tbeta, tl2)
+            c = random_state.uniform(size=size) * cdf_E / tbeta + c0
+            rvs.append((np.log(1 - 1 / c) - tl1) / tl2)
 
-            cdf.append(eq2(te))
             self.var['beta'].append(tbeta)
             self.var['lambda_2'].append(tl2)
 
-        return cdf
+        return rvs
 
     @doc_inherit
     def rad(self):
         
         n_samp, tot_obs, E = self.get_params(['n_samp', 'tot_obs', 'E'])
 
-        start = 0.3
-        stop = 2
-        flmax = sys.float_info[0]
-
         n_arrays = [np.arange(1, i + 1) for i in tot_obs]
         
-        # Define the predicted rad
-        prad = lambda beta, r, tot_obs, l1, l2: (1 / l2) * np.log(((beta *\
-                                   tot_obs) + r - 0.5) / (r - 0.5)) - (l1 / l2)
+        # Define the predicted rad, (1 / l2) * log((beta * tot_obs + r - 0.5)
+        # / (r - 0.5)) - l1 / l2 written with log1p so that the smallest
+        # energies keep their distance from 1
+        prad = lambda beta, r, tot_obs, l2: 1 + (np.log1p(beta * tot_obs /
+                                                    (r - 0.5)) - beta) / l2
         rad = []
         for tn_samp, ttot_obs, tE, tn, in zip(n_samp, tot_obs, E, n_arrays):
+            tbeta, tl2 = self._multipliers(tn_samp, ttot_obs, tE, 'rad')
 
-            k = np.linspace(1, ttot_obs, num=ttot_obs)
-            try:
-                tx = scipy.optimize.brentq(beta_solver, start,
-                                min((flmax/tn_samp)**(1/float(ttot_obs)), stop), 
-                                args = (k, ttot_obs, tn_samp), disp=True)
-            except(ValueError):
-                raise ValueError("No solution to %s.rad for tot_obs = %.2f"
-                                 % (self.__class__.__name__, ttot_obs) + 
-                                 " and n_samp = %.2f" % (tn_samp))
-            tbeta = -np.log(tx)
-            tl2 = float(tn_samp) / (tE - ttot_obs) # Harte (2011) 7.26
-            tl1 = tbeta - tl2
-
-            trad = prad(tbeta, tn, ttot_obs, tl1, tl2)
+            trad = prad(tbeta, tn, ttot_obs, tl2)
             rad.append(trad)
 
         return rad
+
+    def _multipliers(self, n_samp, tot_obs, E, method):
+        '''
+        Lagrange multipliers of one parameter set, see _mete_multipliers
+        '''
+        return _mete_multipliers(n_samp, tot_obs, E, self.solver, '%s.%s' %
+                                 (self.__class__.__name__, method))
         
 
     def fit(self, data):
@@ -3224,6 +4700,14 @@ class theta(Distribution):
     ------------------
     lambda_2 : list of floats
         The lambda2 lagrange multiplier
+    e_max : list of floats
+        Energy at which the cdf reaches 1 - 1 / (2 * n), set by rad
+
+    Notes
+    -----
+    To evaluate all species of one community, pass their abundances as a
+    vector n with single values of n_samp, tot_obs and E. cdf and rad then
+    evaluate every species in one vectorized pass.
 
     '''
 
@@ -3260,65 +4744,100 @@ class theta(Distribution):
         return pdf
 
     @doc_inherit
-    def cdf(self, e):
+    def logpdf(self, e):
 
         n_samp, tot_obs, E, n = self.get_params(['n_samp', 'tot_obs', 'E','n'])
         e = expand_n(e, len(n_samp))
-        
-        # TODO: More checks?
-        assert np.all(n <= tot_obs), 'n must be less than or equal to tot_obs'
 
+        assert np.all(n <= tot_obs), 'n must be less than or equal to tot_obs'
 
-        cdf = []
+        logpdf = []
         self.var['lambda_2'] = []
 
         for tn_samp, ttot_obs, tE, tn, te in zip(n_samp, tot_obs, E, n, e):
 
+            # Log of Harte (2011) 7.25, with exp(-tl2 * tn) factored out of
+            # the denominator
             tl2 = float(tn_samp) / (tE - ttot_obs)
+            tlogpdf = np.log(tn * tl2) - tl2 * tn * (te - 1) - \
+                                        np.log(-np.expm1(-tl2 * tn * (tE - 1)))
 
-            # Exact cdf
-            tcdf = -np.exp(tl2 * tn) * (np.exp(-tl2 * tn * te) - 
-                                                        np.exp(-tl2 * tn))   
-
-            cdf.append(tcdf)
+            logpdf.append(tlogpdf)
             self.var['lambda_2'].append(tl2)
-        
-        return cdf
+
+        return logpdf
 
     @doc_inherit
-    def rad(self, tol=.1):
+    def rvs(self, size=1, random_state=None):
 
         n_samp, tot_obs, E, n = self.get_params(['n_samp', 'tot_obs', 'E','n'])
-        
-        # TODO: More checks?
         assert np.all(n <= tot_obs), 'n must be less than or equal to tot_obs'
+        random_state = check_random_state(random_state)
 
-        n_arrays = [np.arange(1, i + 1) for i in n]
+        rvs = []
+        self.var['lambda_2'] = []
 
-        prad = lambda r, n, l2, e_max : 1 + (1 / (l2 * n)) * \
-                    np.log(1 / (((r - 0.5) / n) + np.exp(-l2 * n * (e_max))))
+        for tn_samp, ttot_obs, tE, tn in zip(n_samp, tot_obs, E, n):
 
-        rad = []
-        terms= []
-        for tn_samp, ttot_obs, tE, tn, tn_arr in zip(n_samp, tot_obs, E, n, 
-                                                        n_arrays):
-            
+            # Inverse of the exponential cdf truncated to [1, E]
             tl2 = float(tn_samp) / (tE - ttot_obs)
+            u = random_state.uniform(size=size)
+            rvs.append(1 - np.log1p(u * np.expm1(-tl2 * tn * (tE - 1))) /
+                                                                    (tl2 * tn))
+            self.var['lambda_2'].append(tl2)
+
+        return rvs
+
+    @doc_inherit
+    def cdf(self, e):
 
-            # Exact cdf
-            cdf_eq = lambda es: -np.exp(tl2 * tn) * (np.exp(-tl2 * tn * es) - 
-                                                        np.exp(-tl2 * tn))
+        l2, n = self._lambda_2()
+        e = expand_n(e, len(n))
 
-            # Calculate e_max for correction term
-            max_obs_cdf = 1 - (1 / (2 * tn))
-            min_func = lambda e_max: max_obs_cdf - cdf_eq(e_max)
-            e_max = scipy.optimize.brentq(min_func, 1, tE, disp=True)
-            terms.append((tn, e_max, np.exp(-tl2 * tn * (e_max))))
+        # All species are evaluated at once by the batch kernel
+        offsets = np.concatenate(([0], np.cumsum([len(te) for te in e])))
+        cdf = self.cdf_batch(np.concatenate(e), offsets)
+        return np.split(cdf, offsets[1:-1])
 
-            trad = prad(tn_arr, tn, tl2, e_max)
-            rad.append(trad)
+    def _cdf_batch(self, e, expand):
+        l2, n = self._lambda_2()
 
-        return rad
+        # Exact cdf, 1 - exp(-lambda_2 * n * (e - 1))
+        return -np.expm1(-expand(l2 * n) * (e - 1))
+
+    @doc_inherit
+    def rad(self, tol=.1):
+
+        l2, n = self._lambda_2()
+
+        # e_max solves cdf(e_max) = 1 - 1 / (2 * n), the largest observed
+        # cdf value, for all species at once
+        e_max = 1 + np.log(2 * n) / (l2 * n)
+        self.var['e_max'] = list(e_max)
+
+        # Ranks 1..n of every species as one flat array
+        counts = n.astype(int)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        r = np.arange(offsets[-1]) - np.repeat(offsets[:-1], counts) + 1
+        rep = lambda par: np.repeat(par, counts)
+
+        rad = 1 + (1 / rep(l2 * n)) * np.log(1 / (((r - 0.5) / rep(n)) +
+                                                np.exp(-rep(l2 * n * e_max))))
+        return np.split(rad, offsets[1:-1])
+
+    def _lambda_2(self):
+        '''
+        Arrays of lambda_2 and n, one value per species. lambda_2 is shared
+        by the species of a community.
+        '''
+        n_samp, tot_obs, E, n = self.get_params(['n_samp', 'tot_obs', 'E','n'])
+
+        # TODO: More checks?
+        assert np.all(n <= tot_obs), 'n must be less than or equal to tot_obs'
+
+        l2 = n_samp / (E - tot_obs)
+        self.var['lambda_2'] = list(l2)
+        return l2, n.astype(float)
 
     def fit(self, data):
         '''
@@ -3369,6 +4888,9 @@ class nu(Distribution):
         Total number of individuals / observations
     E : int or iterable
         Total energy output of community
+    solver : str (optional)
+        Method used to solve for beta. Either 'sum' (default), 'closed' or
+        'grid'. See solvers.mete_x.
 
     self.var keywords
     -----------------
@@ -3384,12 +4906,15 @@ class nu(Distribution):
     This is a discrete distribution.
     '''
 
+    key_attrs = ('solver',)
+
     @doc_inherit
-    def __init__(self, **kwargs):
+    def __init__(self, solver='sum', **kwargs):
         self.params = kwargs
         self.par_num = 2
         self.min_supp = 1
         self.var = {}
+        self.solver = solver
 
     @doc_inherit
     def pmf(self, e):
@@ -3402,53 +4927,30 @@ class nu(Distribution):
         only sum to one when provided with the proper support. lambda2 can be
         calculated by the equation: n_samp / (E - tot_obs) or S / (E - N)
 
+        The normalizing integral is exact (see _nu_integral).
 
         '''
 
         n_samp, tot_obs, E = self.get_params(['n_samp', 'tot_obs', 'E'])
         e = expand_n(e, len(n_samp))
 
-        start = 0.3
-        stop = 2                                                           
-        flmax = sys.float_info[0]
-        
         pmf = []
         self.var['beta'] = []
         self.var['lambda_2'] = []
 
         for tn_samp, ttot_obs, tE, te in zip(n_samp, tot_obs, E, e):
-            k = np.linspace(1, ttot_obs, num=ttot_obs)
-            try:
-                tx = scipy.optimize.brentq(beta_solver, start,
-                               min((flmax/tn_samp)**(1/float(ttot_obs)), stop), 
-                               args = (k, ttot_obs, tn_samp), disp=True)
-            except(ValueError):
-                raise ValueError("No solution to %s.pmf for tot_obs = %.2f"
-                                 % (self.__class__.__name__, ttot_obs) + 
-                                 " and n_samp = %.2f" % (tn_samp))
-
-            # Set lagrange multipliers
-            tbeta = -np.log(tx)
-            tl2 = float(tn_samp) / (tE - ttot_obs) # Harte (2011) 7.26
+            tbeta, tl2 = self._multipliers(tn_samp, ttot_obs, tE, 'pmf')
             e_max = 1 + (1 / tl2)
             e_min = 1 + (1 / (ttot_obs * tl2))
-            
-            norm = integrate.quad(nu_pmf_eq, e_min, e_max, (tbeta, tl2, 
-                                                                   tn_samp))[0]
-            tpmf = np.empty(len(te), dtype=float)
-            
-            # Parse values that aren't in range as set to zero
-            ind_tot = np.arange(len(tpmf))
-            ind_less = np.where(te >= e_min)[0]
-            ind_more = np.where(te <= e_max)[0]
-            ind_include = np.intersect1d(ind_more, ind_less)
-            ind_exclude = np.array(list(set(ind_tot) - set(ind_include)))
-            if len(ind_exclude) != 0:
-                tpmf[ind_exclude] = 0
-            
-            if len(ind_include) != 0:
-                tpmf[ind_include] =\
-                        nu_pmf_eq(te[ind_include], tbeta, tl2, tn_samp) / norm
+            norm = _nu_integral(e_max, tbeta, tl2, ttot_obs) / \
+                                                    np.log(tn_samp / tbeta)
+
+            # Values that aren't in range are set to zero
+            te = np.asarray(te, dtype=float)
+            in_range = (te >= e_min) & (te <= e_max)
+            tpmf = np.zeros(len(te))
+            tpmf[in_range] = nu_pmf_eq(te[in_range], tbeta, tl2, tn_samp) / \
+                                                                          norm
 
             pmf.append(tpmf)
             self.var['beta'].append(tbeta)
@@ -3462,51 +4964,21 @@ class nu(Distribution):
         n_samp, tot_obs, E = self.get_params(['n_samp', 'tot_obs', 'E'])
         e = expand_n(e, len(n_samp))
 
-        start = 0.3
-        stop = 2                                                           
-        flmax = sys.float_info[0]
-        
         cdf = []
         self.var['beta'] = []
         self.var['lambda_2'] = []
 
         for tn_samp, ttot_obs, tE, te in zip(n_samp, tot_obs, E, e):
-            k = np.linspace(1, ttot_obs, num=ttot_obs)
-            try:
-                tx = scipy.optimize.brentq(beta_solver, start,
-                               min((flmax/tn_samp)**(1/float(ttot_obs)), stop), 
-                               args = (k, ttot_obs, tn_samp), disp=True)
-            except(ValueError):
-                raise ValueError("No solution to %s.pmf for tot_obs = %.2f"
-                                 % (self.__class__.__name__, ttot_obs) + 
-                                 " and n_samp = %.2f" % (tn_samp))
-
-            # Set lagrange multipliers
-            tbeta = -np.log(tx)
-            tl2 = float(tn_samp) / (tE - ttot_obs) # Harte (2011) 7.26
+            tbeta, tl2 = self._multipliers(tn_samp, ttot_obs, tE, 'cdf')
             e_max = 1 + (1 / tl2)
             e_min = 1 + (1 / (ttot_obs * tl2))
 
-            tcdf = np.empty(len(te), dtype=float)
-
-            # Parse values that aren't in range as set to 0 or 1
-            ind_tot = np.arange(len(tcdf))
-            ind_less = np.where(te < e_min)[0]
-            ind_more = np.where(te > e_max)[0]
-            ind_combo = np.concatenate((ind_more, ind_less))
-            ind_include = np.array(list(set(ind_tot) - set(ind_combo)))
-            
-            if len(ind_less) != 0:
-                tcdf[ind_less] = 0
-            if len(ind_more) != 0:
-                tcdf[ind_more] = 1
-
-            norm = integrate.quad(nu_pmf_eq, e_min, e_max, (tbeta, tl2, 
-                                                                   tn_samp))[0] 
-            if len(ind_include) != 0:
-                tcdf[ind_include] = np.array([integrate.quad(nu_pmf_eq, e_min, se, 
-                                    (tbeta, tl2, tn_samp))[0] / norm for se in 
-                                    te[ind_include]])
+            # Values that aren't in range are set to 0 or 1
+            te = np.asarray(te, dtype=float)
+            in_range = (te >= e_min) & (te <= e_max)
+            tcdf = np.where(te > e_max, 1., 0.)
+            tcdf[in_range] = _nu_integral(te[in_range], tbeta, tl2,
+                    ttot_obs) / _nu_integral(e_max, tbeta, tl2, ttot_obs)
 
             cdf.append(tcdf)
             self.var['beta'].append(tbeta)
@@ -3514,18 +4986,33 @@ class nu(Distribution):
 
         return cdf
         
-    def rad(self, tol=.1):
+    @doc_inherit
+    def rvs(self, size=1, random_state=None):
+
+        n_samp, tot_obs, E = self.get_params(['n_samp', 'tot_obs', 'E'])
+
+        # Species abundances are drawn from logser_ut, sharing this object's
+        # alias cache so that tables persist between calls
+        sad = logser_ut(n_samp=n_samp, tot_obs=tot_obs, solver=self.solver)
+        sad._alias_cache = self._alias_tables()
+        abund = sad.rvs(size=size, random_state=random_state)
+
+        # Each species has mean energy 1 + 1 / (lambda_2 * n)
+        l2 = n_samp / (E - tot_obs) # Harte (2011) 7.26
+        self.var['lambda_2'] = list(l2)
+        return [1 + 1 / (tl2 * tabund) for tl2, tabund in zip(l2, abund)]
+
+    def rad(self, tol=None):
         '''
-        This rad uses the observed cdf for a given nu distribution and the
-        predicted cdf to calculate the rank energy distribution.  
+        This rad inverts the predicted cdf at the observed cdf values
+        (i - 0.5) / n_samp, i = 1..n_samp, to calculate the rank energy
+        distribution.
 
         Parameter
         ----------
-        tol : float
-            Precision interval.  The integral of nu is approximated at the
-            interval tol.  Smaller intervals can be more precise, but a tol
-            between 0.1 and 0.5 is more effecient and the results are changed
-            only marginally.
+        tol : None
+            Ignored. Earlier versions integrated the pmf on a grid of this
+            spacing, while the cdf is now inverted exactly.
 
         Returns
         -------
@@ -3535,37 +5022,30 @@ class nu(Distribution):
         '''
     
         n_samp, tot_obs, E = self.get_params(['n_samp', 'tot_obs', 'E'])
-        rad = []
-        
-        for tn_samp, ttot_obs, tE in zip(n_samp, tot_obs, E):
 
-            # Set temp params
-            self.params['n_samp'] = tn_samp
-            self.params['ttot_obs'] = ttot_obs
-            self.params['E'] = tE
-
-            tl2 = float(tn_samp) / (tE - ttot_obs) # Harte (2011) 7.26
-            e_max = 1 + (1 / tl2)
-            e_min = 1 + (1 / (ttot_obs * tl2))
-            
-            num = np.round((e_max - e_min) / tol, decimals=0)
-            eng = np.linspace(e_min, e_max + tol, num=num)
-            diff = eng[1] - eng[0]
+        rad = []
+        self.var['beta'] = []
+        self.var['lambda_2'] = []
 
-            tcdf = np.cumsum(diff * self.pmf(eng)[0])
+        for tn_samp, ttot_obs, tE in zip(n_samp, tot_obs, E):
+            tbeta, tl2 = self._multipliers(tn_samp, ttot_obs, tE, 'rad')
 
             # Observed cdf. Not quite true if some energies overlap
             obs_cdf = np.arange(1 / (2 * (tn_samp)), 1, 1/tn_samp)
 
-            trad = [eng[sum(oc >= tcdf) - 1] for oc in obs_cdf]
+            rad.append(_nu_ppf(obs_cdf, tbeta, tl2, ttot_obs))
+            self.var['beta'].append(tbeta)
+            self.var['lambda_2'].append(tl2)
 
-            rad.append(trad)
+        return rad
 
-        self.params['n_samp'] = n_samp
-        self.params['ttot_obs'] = tot_obs
-        self.params['E'] = E
+    def _multipliers(self, n_samp, tot_obs, E, method):
+        '''
+        Lagrange multipliers of one parameter set, see _mete_multipliers
+        '''
+        return _mete_multipliers(n_samp, tot_obs, E, self.solver, '%s.%s' %
+                                 (self.__class__.__name__, method))
 
-        return rad
 
 
     def fit(self, data):
@@ -3629,30 +5109,145 @@ def nu_pmf_eq(es, beta, l2, s):
     return (1 / np.log(s / beta)) * (np.exp(-beta / (l2 * (es - 1)))) / \
                                                                     (es - 1)
 
-def beta_solver(x, k, tot_obs, n_samp):
-    """ Used with a solver to get the beta lagrange multiplier in the METE
-    distributions.  With a solver, this function
-    returns x and beta = -np.log(x)
+def _mete_multipliers(n_samp, tot_obs, E, solver, name):
+    '''
+    Lagrange multipliers beta and lambda_2 of the METE energy distributions
+    for one parameter set. name is the calling method, e.g. 'psi.pdf', used
+    in the error raised when there is no solution.
+    '''
+    try:
+        tx = mete_x(n_samp, tot_obs, method=solver)
+    except(ValueError):
+        raise ValueError("No solution to %s for tot_obs = %.2f" % (name,
+                         tot_obs) + " and n_samp = %.2f" % (n_samp))
 
-    Parameters
-    ----------
-    x : float
-        Lagrange multiplier x = e**-beta
-    k : np.array
-        np.arange(1, tot_obs + 1)
-    tot_obs : float
-        The total number of individuals observed (N in METE, see Harte 2011)
-    n_samp : float
-        The total number of species observed (S in METE, see Harte 2011)
+    beta = -np.log(tx)
+    l2 = float(n_samp) / (E - tot_obs) # Harte (2011) 7.26
+    return beta, l2
 
-    Returns
-    -------
-    : float
-    """
+def _nu_integral(es, beta, l2, tot_obs):
+    '''
+    Integral of exp(-beta / (l2 * (e - 1))) / (e - 1), the unnormalized
+    nu_pmf_eq, from e_min = 1 + 1 / (tot_obs * l2) to es.
 
-    # Beta Solver
-    return sum(x ** k / float(tot_obs) * n_samp) -  sum((x ** k) / k)
+    Substituting t = beta / (l2 * (e - 1)) turns the integrand into
+    exp(-t) / t, so the integral is exp1(t(es)) - exp1(beta * tot_obs). The
+    upper limit of the support, e_max = 1 + 1 / l2, has t = beta.
+    '''
+    t = beta / (l2 * (np.asarray(es, dtype=float) - 1))
+    return scipy.special.exp1(t) - scipy.special.exp1(beta * tot_obs)
 
+def _nu_ppf(q, beta, l2, tot_obs, num_iter=64):
+    '''
+    Inverse of the nu cdf at the probabilities q.
+
+    exp1 has no closed-form inverse, so t = beta / (l2 * (e - 1)) is found by
+    bisection on log(t) over [log(beta), log(beta * tot_obs)], for all q at
+    once. Each iteration halves the bracket, so 64 iterations reach machine
+    precision.
+    '''
+    q = np.asarray(q, dtype=float)
+    target = scipy.special.exp1(beta * tot_obs) + q * (scipy.special.exp1(beta)
+                                        - scipy.special.exp1(beta * tot_obs))
+    lo = np.repeat(np.log(beta), len(q))
+    hi = np.repeat(np.log(beta * tot_obs), len(q))
+
+    # exp1 decreases with t
+    for i in xrange(num_iter):
+        mid = (lo + hi) / 2
+        above = scipy.special.exp1(np.exp(mid)) > target
+        lo = np.where(above, mid, lo)
+        hi = np.where(above, hi, mid)
+
+    return 1 + beta / (l2 * np.exp((lo + hi) / 2))
+
+def _log_abs_expm1(y):
+    '''
+    log(|exp(y) - 1|) without overflow for large positive y.
+    '''
+    y = np.asarray(y, dtype=float)
+    with np.errstate(divide='ignore'):
+        return np.maximum(y, 0) + np.log(-np.expm1(-np.abs(y)))
+
+def _psi_log_geo_sum(b, tot_obs):
+    '''
+    log(sum_{n=1}^{tot_obs} exp(-b * n)), for b of either sign.
+    '''
+    return -b + _log_abs_expm1(-b * tot_obs) - _log_abs_expm1(-b)
+
+def _psi_log_weight(gamma, tot_obs):
+    '''
+    log(sum_{n=1}^{tot_obs} n * exp(-gamma * n)), the energy dependence of
+    the psi pdf.
+
+    The closed form is g * h / (1 - g)**2 with g = exp(-gamma) and
+    h = 1 - (tot_obs + 1) * g**tot_obs + tot_obs * g**(tot_obs + 1). With
+    x = tot_obs * gamma and d = tot_obs * (gamma + expm1(-gamma)) >= 0,
+    h = 1 + exp(-x) * (d - 1 - x), which is evaluated with log1p for x >= 2.
+    For smaller x that cancels, and h = P(2, x) + d * exp(-x), where
+    P(2, x) = 1 - exp(-x) * (1 + x) is the regularized lower incomplete gamma
+    function; P(2, x) and d are summed as series for small arguments. For
+    x <= -0.5 (gamma < 0 when beta < 0) h is factored as
+    exp(-x) * (expm1(x) + tot_obs * expm1(-gamma)), which keeps g**tot_obs
+    in log space.
+    '''
+    gamma = np.array(gamma, dtype=float, ndmin=1)
+    x = tot_obs * gamma
+    log_h = np.empty_like(x)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        big = x >= 2
+        xb, gb = x[big], gamma[big]
+        log_h[big] = np.log1p(np.exp(-xb) * (tot_obs * (gb + np.expm1(-gb))
+                                              - 1 - xb))
+
+        neg = x <= -0.5
+        xn, gn = x[neg], gamma[neg]
+        log_h[neg] = -xn + np.log(np.expm1(xn) + tot_obs * np.expm1(-gn))
+
+        # P(2, x) = sum_{k >= 2} (-1)**k (k - 1) x**k / k! and
+        # gamma + expm1(-gamma) = sum_{k >= 2} (-gamma)**k / k!
+        mid = ~big & ~neg
+        xm, gm = x[mid], gamma[mid]
+        p2 = np.where(np.abs(xm) < 0.5,
+                      _alt_series(xm, lambda k: (k - 1.) / (k * (k - 2))),
+                      scipy.special.gammainc(2, np.abs(xm)))
+        d = np.where(np.abs(gm) < 0.5, _alt_series(gm, lambda k: 1. / k),
+                     gm + np.expm1(-gm))
+        log_h[mid] = np.log(p2 + tot_obs * d * np.exp(-xm))
+
+        log_weight = -gamma + log_h - 2 * _log_abs_expm1(-gamma)
+
+    # The sum is tot_obs * (tot_obs + 1) / 2 at gamma = 0
+    return np.where(gamma == 0, np.log(tot_obs * (tot_obs + 1.) / 2),
+                    log_weight)
+
+def _alt_series(x, ratio, num_terms=18):
+    '''
+    Sum of the series x**2 / 2 + sum_{k >= 3} t_k with
+    t_k = -t_{k-1} * x * ratio(k), accurate for |x| < 0.5.
+    '''
+    term = x ** 2 / 2
+    total = term.copy()
+    for k in xrange(3, num_terms + 2):
+        term = -term * x * ratio(k)
+        total += term
+    return total
+
+def _psi_cdf(e, beta, l2):
+    '''
+    psi cdf beta * (1 / (1 - exp(beta + (e - 1) * l2)) - 1 / (1 -
+    exp(beta))).
+
+    The difference of the two terms is combined exactly into
+    beta * (1 - exp(-u)) / (expm1(beta) * (1 - exp(-gamma))), with
+    u = (e - 1) * l2 and gamma = beta + u, which neither overflows for large
+    e nor cancels for e near 1.
+    '''
+    u = (np.asarray(e, dtype=float) - 1) * l2
+    with np.errstate(over='ignore'):
+        return beta * -np.expm1(-u) / (np.expm1(beta) *
+                                       -np.expm1(-(beta + u)))
 
 def make_array(n):
     '''Cast n as iterable array.'''
@@ -3662,20 +5257,55 @@ def make_array(n):
         return np.array([n])
 
 
+def check_random_state(random_state):
+    '''
+    Turn random_state into a source of random numbers.
+
+    Parameters
+    ----------
+    random_state : None, int, np.random.RandomState or np.random.Generator
+        If None, the global numpy RandomState is used. If an int, a new
+        RandomState seeded with it is returned. Otherwise random_state is 
+        returned unchanged.
+
+    Returns
+    -------
+    : np.random.RandomState or np.random.Generator
+
+    '''
+    if random_state is None:
+        return np.random.mtrand._rand
+    if isinstance(random_state, (int, long, np.integer)):
+        return np.random.RandomState(random_state)
+    if hasattr(random_state, 'uniform'):
+        return random_state
+    raise ValueError('%r cannot be used as a random_state' % (random_state,))
+
+
 def expand_n(n, size):
-    '''Check dimensions of n and expand to match size if necessary.'''
+    '''
+    Check dimensions of n and expand to match size if necessary.
+
+    Arrays are not copied. If n is shared by all parameter sets, each set
+    gets a read-only view of the same array.
+    '''
     if np.iterable(n) and np.iterable(n[0]):  # If n is iterable of iterables
         if len(n) != size:
             raise TypeError('If n is a list of iterables, list must be ' +
                                 'the same length as parameter lists')
         else:
-            new_n = [np.array(tn) for tn in n]
+            new_n = [np.asarray(tn) for tn in n]
     
-    elif np.iterable(n):  # If n is iterable of non-iterables
-        new_n = [np.array(np.copy(n)) for i in xrange(size)]
-
-    else:  # If n is not iterable
-        new_n = [np.array([n]) for i in xrange(size)]
+    else:
+        if np.iterable(n):  # If n is iterable of non-iterables
+            shared = np.asarray(n)
+        else:  # If n is not iterable
+            shared = np.array([n])
+        new_n = []
+        for i in xrange(size):
+            view = shared.view()
+            view.flags.writeable = False
+            new_n.append(view)
 
     return new_n
 
@@ -3730,23 +5360,125 @@ def make_rank_abund(pmf, n_samp, min_supp=1):
 
     '''
     points = np.arange(1/(2*n_samp), 1, 1/n_samp)
-    counts = np.zeros(n_samp)
 
-    
     if min_supp == 1:
-        pmf = np.array([0] + list(pmf)) # Add 0 to start of pmf
+        pmf = np.concatenate(([0], pmf)) # Add 0 to start of pmf
     cum_pmf = np.cumsum(pmf)
-    
-    for cutoff in cum_pmf:
-        greater_thans = (points >= cutoff)
-        counts[greater_thans] += 1
 
-        if not greater_thans.any():  # If no greater thans, done with samples
-            break
+    # Each point counts the cutoffs at or below it
+    counts = np.searchsorted(cum_pmf, points, side='right').astype(float)
     
     return counts # / (sum(counts) / len(pmf))
 
 
+def make_rank_abund_stream(pmf_chunks, n_samp, min_supp=1):
+    '''
+    Streaming version of make_rank_abund that consumes the pmf in chunks.
+ 
+    Parameters
+    ----------
+    pmf_chunks : iterable of ndarrays
+        Consecutive pieces of the pmf, starting at min_supp. May be a 
+        generator, in which case no further chunks are requested once all 
+        n_samp quantile points are placed.
+    n_samp : int
+        Total number of samples 
+    min_supp : int
+        The minimum support of the distribution. Often either 1 or 0.
+
+    Returns
+    -------
+    S_abunds : ndarray
+        1D array of predicted abundance for each species
+
+    Notes
+    -----
+    Gives the same result as make_rank_abund on the concatenated chunks,
+    as the running cumulative sum is carried across chunks in the same
+    order.
+
+    '''
+    points = np.arange(1/(2*n_samp), 1, 1/n_samp)
+    counts = np.zeros(len(points))
+
+    if min_supp == 1:
+        total = 0.
+        counts += 1  # The 0 at the start of the pmf is below every point
+    else:
+        total = None
+
+    for chunk in pmf_chunks:
+        chunk = np.asarray(chunk, dtype=float)
+        if len(chunk) == 0:
+            continue
+        if total is None:
+            cum_pmf = np.cumsum(chunk)
+        else:
+            cum_pmf = np.cumsum(np.concatenate(([total], chunk)))[1:]
+        counts += np.searchsorted(cum_pmf, points, side='right')
+        total = cum_pmf[-1]
+
+        if total > points[-1]:  # All points are placed
+            break
+
+    return counts
+
+
+def _sugihara_sums(args):
+    '''
+    Sums over simulations of Sugihara's sequential breakage.
+
+    Parameters
+    ----------
+    args : tuple
+        Number of species, number of simulations and a random state (see
+        check_random_state). Passed as one tuple so that the function can be
+        mapped over a process pool.
+
+    Returns
+    -------
+    : np.array
+        Sum over simulations of the species fractions, sorted from largest to
+        smallest within each simulation
+
+    Notes
+    -----
+    All simulations run together as rows of a 2D array, in blocks of at most
+    10000 rows to bound memory. At step i one of the i existing fragments is
+    picked at random and split in the proportion U ~ triangular(0.5, 0.75, 1).
+
+    '''
+    n_samp, sample_size, random_state = args
+    random_state = check_random_state(random_state)
+
+    total = np.zeros(n_samp)
+    for start in xrange(0, sample_size, 10000):
+        reps = min(10000, sample_size - start)
+        p = _sugihara_breakage(n_samp, reps, random_state)
+        total += np.sum(-np.sort(-p, axis=1), axis=0)
+
+    return total
+
+def _sugihara_breakage(n_samp, reps, random_state):
+    '''
+    Species fractions of reps simulations of Sugihara's sequential breakage,
+    as rows of a 2D array in the order the fragments were created
+    '''
+    rows = np.arange(reps)
+    U = random_state.triangular(0.5, 0.75, 1, size=(reps, n_samp - 1))
+    pick = random_state.uniform(size=(reps, n_samp - 1))
+
+    p = np.zeros((reps, n_samp))
+    p[:, 0] = 1
+    for i in xrange(1, n_samp):
+        index = (pick[:, i - 1] * i).astype(int)
+        broken = p[rows, index]
+        p[rows, index] = broken * U[:, i - 1]
+        p[:, i] = broken * (1 - U[:, i - 1])
+
+    return p
+
+
 def canonical_lognorm_pmf(r, S, param_ret=False):
     '''
     canonical_lognorm_pmf(r, S, param_ret=False)
@@ -3793,6 +5525,385 @@ def canonical_lognorm_pmf(r, S, param_ret=False):
     pmf = (s0 / S) * np.exp(-(a ** 2) * (r ** 2)) 
     return pmf, s0, a
 
+def _pln_ln_pmf(n, mu, sigma, num_nodes=100, grad=False):
+    '''
+    Log pmf of the Poisson lognormal for an array of n in one pass.
+
+    Parameters
+    ----------
+    n : np.array
+        Values at which to calculate the log pmf
+    mu, sigma : float
+        Parameters of the Poisson lognormal. sigma must be greater than 0.
+    num_nodes : int
+        Number of Gauss-Hermite nodes
+    grad : bool
+        If True, also return the derivatives of the log pmf with respect to
+        mu and sigma
+
+    Returns
+    -------
+    : np.array or tuple
+        Log pmf at each n. If grad is True, a tuple of the log pmf and its
+        derivatives with respect to mu and sigma.
+
+    Notes
+    -----
+    The pmf is the integral over t of exp(g(t)) / (sqrt(2 pi) sigma n!), where
+    g(t) = n t - exp(t) - (t - mu)**2 / (2 sigma**2) (Bulmer 1974). g is
+    concave, so its mode is found for all n at once with Newton's method. The
+    integral is then evaluated with Gauss-Hermite quadrature centered on the
+    mode and scaled by the curvature of g (a Laplace-centered rule), using
+    log-sum-exp so that large n do not overflow.
+
+    The derivatives are expectations over the normalized integrand, evaluated
+    with the same nodes: d/dmu = E[(t - mu) / sigma**2] and
+    d/dsigma = E[(t - mu)**2 / sigma**3] - 1 / sigma.
+
+    '''
+    n = np.asarray(n, dtype=float)
+    z, w = _hermite_nodes(num_nodes)
+    s2 = sigma ** 2
+
+    # Mode of g(t) for each n by Newton's method, g' is concave
+    t = (np.log(np.maximum(n, 0.5)) * s2 + mu) / (1 + s2)
+    for i in xrange(100):
+        et = np.exp(t)
+        step = (n - et - (t - mu) / s2) / (-et - (1 / s2))
+        t = t - step
+        if np.all(np.abs(step) < 1e-10):
+            break
+
+    # Nodes in t for each n, shape (len(n), num_nodes)
+    scale = np.sqrt(2 / (np.exp(t) + (1 / s2)))
+    tt = t[:, np.newaxis] + scale[:, np.newaxis] * z
+    lg = n[:, np.newaxis] * tt - np.exp(tt) - 0.5 * ((tt - mu) / sigma) ** 2 \
+                                                        + z ** 2 + np.log(w)
+    lg_max = np.max(lg, axis=1)
+    node_wts = np.exp(lg - lg_max[:, np.newaxis])
+    sum_wts = np.sum(node_wts, axis=1)
+    ln_integ = lg_max + np.log(sum_wts)
+
+    ln_pmf = ln_integ + np.log(scale) - 0.5 * np.log(2 * np.pi * s2) - \
+                                                  scipy.special.gammaln(n + 1)
+    if not grad:
+        return ln_pmf
+
+    # Expectations over the integrand
+    post = node_wts / sum_wts[:, np.newaxis]
+    dev = tt - mu
+    dmu = np.sum(post * dev, axis=1) / s2
+    dsigma = np.sum(post * dev ** 2, axis=1) / (s2 * sigma) - (1 / sigma)
+    return ln_pmf, dmu, dsigma
+
+def _pln_nll(params, n_uniq, counts, trunc=False, num_nodes=100):
+    '''
+    Negative log-likelihood of the Poisson lognormal and its gradient.
+
+    Parameters
+    ----------
+    params : array-like
+        mu and sigma
+    n_uniq : np.array
+        Unique observed values
+    counts : np.array
+        Number of times each value in n_uniq was observed
+    trunc : bool
+        If True, use the zero truncated Poisson lognormal
+    num_nodes : int
+        Number of Gauss-Hermite nodes
+
+    Returns
+    -------
+    : tuple
+        Negative log-likelihood and its gradient with respect to mu and sigma
+
+    '''
+    mu, sigma = params
+    if trunc:
+        n_eval = np.concatenate(([0], n_uniq))
+    else:
+        n_eval = n_uniq
+
+    ln_pmf, dmu, dsigma = _pln_ln_pmf(n_eval, mu, sigma, num_nodes,
+                                                                    grad=True)
+    if trunc:
+        # Subtract log(1 - p0) for every observation
+        p0 = np.exp(ln_pmf[0])
+        ln_pmf = ln_pmf[1:] - np.log(1 - p0)
+        dmu = dmu[1:] + (p0 * dmu[0]) / (1 - p0)
+        dsigma = dsigma[1:] + (p0 * dsigma[0]) / (1 - p0)
+
+    nll = -np.sum(counts * ln_pmf)
+    grad = -np.array([np.sum(counts * dmu), np.sum(counts * dsigma)])
+    return nll, grad
+
+_hermite_cache = {}
+
+def _nbd_k_mle(values, counts, trunc=False, guess=1, bounds=(1e-10, 1e10),
+                                                  tol=1e-10, max_iter=100):
+    '''
+    Maximum likelihood k of the nbd for many count histograms at once.
+
+    Parameters
+    ----------
+    values : list of np.arrays
+        Unique observed values of each data array
+    counts : list of np.arrays
+        Number of times each value in values was observed
+    trunc : bool
+        If True, use the zero truncated nbd
+    guess : float
+        k returned for data arrays that are all zero
+    bounds : tuple
+        Lower and upper bounds on k. A bound is returned when the likelihood
+        is monotonic within them.
+    tol : float
+        Convergence tolerance on log(k)
+    max_iter : int
+        Maximum number of Newton iterations
+
+    Returns
+    -------
+    : np.array
+        k for each data array
+
+    Notes
+    -----
+    As in nbd.fit, the mean of the nbd is the sample mean m, so k solves the
+    score equation sum(digamma(n + k) - digamma(k)) - len(n) * log(1 + m / k)
+    = 0, plus the derivative of -len(n) * log(1 - p(0)) if trunc. Newton
+    steps in log(k) that leave the bracket on the root are replaced by
+    bisection. All histograms are iterated together, summing over their
+    values with np.bincount, and each drops out once it has converged.
+
+    '''
+    num = len(values)
+    owner = np.repeat(np.arange(num), [len(tv) for tv in values])
+    v = np.concatenate(values).astype(float)
+    c = np.concatenate(counts).astype(float)
+    n = np.bincount(owner, weights=c, minlength=num)
+    m = np.bincount(owner, weights=c * v, minlength=num) / n
+    var = np.bincount(owner, weights=c * (v - m[owner]) ** 2,
+                                                       minlength=num) / n
+
+    def score(t, active):
+        # Score and its derivative with respect to log(k)
+        sel = active[owner]
+        k = np.exp(t)
+        tk = k[owner[sel]]
+        tv, tc = v[sel], c[sel]
+        s = np.bincount(owner[sel], weights=tc * (scipy.special.digamma(tv +
+                    tk) - scipy.special.digamma(tk)), minlength=num) - \
+                    n * np.log1p(m / k)
+        ds = np.bincount(owner[sel], weights=tc * (scipy.special.zeta(2, tv +
+                    tk) - scipy.special.zeta(2, tk)), minlength=num) + \
+                    n * m / (k * (k + m))
+        if trunc:
+            # log(p(0)) = -k * log(1 + m / k) and its derivatives
+            dl = m / (k + m) - np.log1p(m / k)
+            d2l = m ** 2 / (k * (k + m) ** 2)
+            r = 1 / np.expm1(k * np.log1p(m / k))
+            s = s + n * r * dl
+            ds = ds + n * r * ((1 + r) * dl ** 2 + d2l)
+        return s, k * ds
+
+    lo = np.repeat(np.log(bounds[0]), num)
+    hi = np.repeat(np.log(bounds[1]), num)
+    everywhere = np.ones(num, dtype=bool)
+    degenerate = m == 0
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        at_lo = ~degenerate & (score(lo, everywhere)[0] <= 0)
+        if trunc:
+            at_hi = score(hi, everywhere)[0] >= 0
+        else:
+            # The nbd score only has a root for overdispersed data
+            at_hi = var <= m
+        at_hi &= ~degenerate & ~at_lo
+
+        # Start from the moment estimate of k
+        k0 = m ** 2 / (var - m)
+        t = np.where(np.isfinite(k0) & (k0 > 0), np.log(k0), np.log(guess))
+        t = np.clip(t, lo, hi)
+
+        active = ~(degenerate | at_lo | at_hi)
+        for i in xrange(max_iter):
+            if not np.any(active):
+                break
+            f, df = score(t, active)
+
+            # Keep the bracket with the score positive at lo, negative at hi
+            lo = np.where(active & (f > 0), t, lo)
+            hi = np.where(active & (f <= 0), t, hi)
+
+            t_new = t - f / df
+            outside = ~((t_new > lo) & (t_new < hi))
+            t_new = np.where(outside, (lo + hi) / 2, t_new)
+            converged = np.abs(t_new - t) < tol
+            t = np.where(active, t_new, t)
+            active &= ~converged
+
+    k = np.exp(t)
+    k[at_lo] = bounds[0]
+    k[at_hi] = bounds[1]
+    k[degenerate] = guess
+    return k
+
+def _fnbd_nll(k, n_uniq, counts, N, a):
+    '''
+    Negative log-likelihood of the fnbd for each value in k.
+
+    Parameters
+    ----------
+    k : float or np.array
+        Values of the aggregation parameter
+    n_uniq : np.array
+        Unique observed values
+    counts : np.array
+        Number of times each value in n_uniq was observed
+    N : float
+        Total number of individuals
+    a : float
+        Fraction of the total area in each cell, 1 / n_samp
+
+    Returns
+    -------
+    : np.array
+        Negative log-likelihood with the shape of k
+
+    '''
+    gammaln = scipy.special.gammaln
+    k = np.asarray(k, dtype=float)
+    b = k / a - k
+    n = np.sum(counts)
+
+    # The log pmf in fnbd.logpmf, with the binomial coefficients expanded so
+    # that only the terms with both k and n_uniq are broadcast, along a
+    # trailing axis, against the histogram
+    ln_L = np.sum(counts * (gammaln(n_uniq + k[..., None]) +
+                            gammaln(N - n_uniq + b[..., None])), axis=-1) - \
+           n * (gammaln(k) + gammaln(b) + gammaln(N + k / a) -
+                gammaln(k / a))
+    const = np.sum(counts * (gammaln(n_uniq + 1) + gammaln(N - n_uniq + 1))) \
+                                                        - n * gammaln(N + 1)
+    return const - ln_L
+
+def _fnbd_k_mle(n_uniq, counts, N, a, upper_bnd, lower_bnd=1e-10,
+                                                               num_grid=64):
+    '''
+    Maximum likelihood k of the fnbd for one count histogram.
+
+    The negative log-likelihood is evaluated on num_grid values of k spaced
+    evenly in log(k) between lower_bnd and upper_bnd, and the best of them is
+    refined by a bounded minimization in log(k) between its neighbors.
+    Arguments are as in _fnbd_nll.
+    '''
+    log_grid = np.linspace(np.log(lower_bnd), np.log(upper_bnd), num_grid)
+    nll = _fnbd_nll(np.exp(log_grid), n_uniq, counts, N, a)
+    nll[np.isnan(nll)] = np.inf
+    best = np.argmin(nll)
+
+    lo = log_grid[max(best - 1, 0)]
+    hi = log_grid[min(best + 1, num_grid - 1)]
+    res = scipy.optimize.minimize_scalar(
+                lambda t: _fnbd_nll(np.exp(t), n_uniq, counts, N, a),
+                bounds=(lo, hi), method='bounded', options={'xatol' : 1e-8})
+    if res.fun <= nll[best]:
+        return np.exp(res.x)
+    return np.exp(log_grid[best])
+
+def _is_default(method, name):
+    '''
+    True if the bound method is Distribution's own method name, i.e. not
+    overridden by the class it was looked up on.
+    '''
+    return getattr(method, '__func__', None) is \
+                                        getattr(Distribution, name).__func__
+
+def _alias_table(pmf):
+    '''
+    Walker alias table of a pmf over consecutive values.
+
+    Parameters
+    ----------
+    pmf : array-like object
+        Probabilities of the values, normalized here to sum to one
+
+    Returns
+    -------
+    : tuple
+        Arrays prob and alias. Column i gives value i with probability prob[i]
+        and value alias[i] otherwise.
+
+    Notes
+    -----
+    The table is built without a Python loop over the support. Scaled by the
+    number of values, columns with mass above one are donors and the rest
+    take their deficit from a donor. The donor surpluses are laid end to end,
+    as are the deficits, and each deficit is taken from the donor whose
+    surplus interval contains its start. A donor that gives more than its
+    surplus keeps less than one and takes the rest from the next donor, as
+    in Vose's pairing. The implied pmf matches the input to rounding error.
+
+    '''
+    q = np.asarray(pmf, dtype=float)
+    q = q * (len(q) / np.sum(q))
+    prob = np.ones(len(q))
+    alias = np.arange(len(q))
+
+    large = np.flatnonzero(q >= 1)
+    small = np.flatnonzero(q < 1)
+    if len(small) == 0 or len(large) == 0:
+        return prob, alias
+
+    # Each small column takes from the donor that is current at its start
+    surplus = np.cumsum(q[large] - 1)
+    deficit = np.cumsum(1 - q[small])
+    start = deficit - (1 - q[small])
+    donor = np.minimum(np.searchsorted(surplus, start, side='right'),
+                       len(large) - 1)
+    prob[small] = q[small]
+    alias[small] = large[donor]
+
+    # Donors keep one minus what they gave beyond their surplus
+    taken = np.searchsorted(start, surplus, side='left')
+    over = np.where(taken > 0, deficit[taken - 1], 0) - surplus
+    prob[large] = 1 - np.clip(over, 0, 1)
+    alias[large[:-1]] = large[1:]
+
+    return prob, alias
+
+def _alias_draw(table, size, random_state):
+    '''
+    Indices drawn from an alias table (see _alias_table). One uniform gives
+    both the column, from its integer part, and the coin, from the rest.
+    '''
+    prob, alias = table
+    u = random_state.uniform(size=size) * len(prob)
+    col = np.minimum(u.astype(int), len(prob) - 1)
+    return np.where(u - col < prob[col], col, alias[col])
+
+def _reject_zeros(draw, size):
+    '''
+    Variates of a distribution truncated at zero, by redrawing zeros.
+    draw(size) returns untruncated variates.
+    '''
+    rvs = np.asarray(draw(size))
+    zero = rvs == 0
+    while np.any(zero):
+        rvs[zero] = draw(np.sum(zero))
+        zero = rvs == 0
+    return rvs
+
+def _hermite_nodes(num_nodes):
+    '''
+    Cached Gauss-Hermite nodes and weights
+    '''
+    if num_nodes not in _hermite_cache:
+        _hermite_cache[num_nodes] = np.polynomial.hermite.hermgauss(num_nodes)
+    return _hermite_cache[num_nodes]
+
 def _ln_choose(n, k):
     '''
     Log binomial coefficient with extended gamma factorials. n and k may be int 
@@ -3801,6 +5912,31 @@ def _ln_choose(n, k):
     gammaln = scipy.special.gammaln
     return gammaln(n + 1) - (gammaln(k + 1) + gammaln(n - k + 1))
 
+def _ssad_args(abundances, cell_fraction):
+    '''
+    Abundances and cell fractions as float arrays of the same length, for
+    the p_absent methods.
+    '''
+    return np.broadcast_arrays(make_array(abundances).astype(float),
+                               make_array(cell_fraction).astype(float))
+
+def _fnbd_ln_p_absent(N, a, k):
+    '''
+    Log probability of zero individuals under the finite negative binomial,
+    ln_L(0) of fnbd.pmf written with gammaln.
+    '''
+    gammaln = scipy.special.gammaln
+    c = k / a
+    return gammaln(N + c - k) - gammaln(c - k) - gammaln(N + c) + gammaln(c)
+
+def _fnbd_ln_p_endemic(N, a, k):
+    '''
+    Log probability that all N individuals are in the cell under the finite
+    negative binomial, ln_L(N) of fnbd.pmf.
+    '''
+    return _ln_choose(N + k - 1, N) + _ln_choose((k / a) - k - 1, 0) - \
+                                               _ln_choose(N + (k / a) - 1, N)
+
 def set_up_and_down(anch, a_list, base=2):
     '''
     Sets the number of upscales and downscales given an a_list.
@@ -3840,7 +5976,7 @@ def set_up_and_down(anch, a_list, base=2):
     
     return upscale, downscale
 
-def _upscale_sar_(up_areas, N, S):
+def _upscale_sar_(up_areas, N, S, base=2):
     '''
     This function is used to upscale from the anchor area.
 
@@ -3850,34 +5986,19 @@ def _upscale_sar_(up_areas, N, S):
 
     S -- Number of species at anchor scale (int)
 
+    base -- Ratio of successive areas (float > 1)
+
     returns:
         1D array of species at a given upscaled area
     '''
 
-    
-    num_ind = np.empty(len(up_areas))
     spp = np.empty(len(up_areas))
-    for i in xrange(len(up_areas)):
-        if i == 0:
-            num_ind[i] = N
-            spp[i] = S
-        else:
-            num_ind[i] = 2 * num_ind[i - 1]
-            N2A = num_ind[i]
-            n = np.linspace(1, N2A, num=N2A)
-            eq1 = lambda x: (sum((x**n)/n) * ((N2A) / ((x - x**(N2A + 1)) / \
-                            (1 - x)) * (1 / x))) - ((N2A) * ((1 - x) / \
-                            (x - x**(N2A + 1))) * (1 - (x**N2A / (N2A + 1))))\
-                            - spp[i - 1]
-            x = scipy.optimize.brentq(eq1, 1e-10, 1 - 1e-10, disp=True)
-            eq2 = lambda S2A: np.log(1 / np.log(1 / x)) * ((N2A) / \
-                                          ((x - x**(N2A + 1)) / (1 - x))) - S2A
-            S2A = scipy.optimize.brentq(eq2, spp[i - 1], 2 * spp[i - 1],\
-                                                                     disp=True)
-            spp[i] = S2A
+    spp[0] = S
+    for i in xrange(1, len(up_areas)):
+        spp[i] = mete_upscale_sar(spp[i - 1], N * base ** (i - 1), base=base)
     return spp
 
-def _downscale_sar_(down_areas, N, S):
+def _downscale_sar_(down_areas, N, S, base=2):
     '''
     This function is used to downscale from the anchor area.
 
@@ -3888,34 +6009,237 @@ def _downscale_sar_(down_areas, N, S):
 
     S -- Number of species at anchor scale (int)
 
+    base -- Ratio of successive areas (float > 1)
+
     returns:
         1D array of species at a given downscaled areas
     '''
 
-    num_ind = np.empty(len(down_areas))
     spp = np.empty(len(down_areas))
-    for i in xrange(len(down_areas)):
-        if i == 0:
-            num_ind[i] = N
-            spp[i] = S
-        else:
-            num_ind[i] = 0.5 * num_ind[i - 1]
-            if num_ind[i] <= 1:
-                raise DownscaleError('Cannot downscale %i iterations from ' 
-                                     % (len(down_areas) - 1) +\
-                                     'anchor scale. One or less individuals' +\
-                                     ' per cell.')
-            N_A = num_ind[i - 1]
-            S_A = spp[i - 1]
-            n = np.linspace(1, N_A, num=N_A)
-            eq1 = lambda x: sum((x**n) / n) - ((S_A / N_A) * sum(x**n))
-            x = scipy.optimize.brentq(eq1, 1e-10, min((sys.float_info[0] / S)\
-                                      **(1/float(N)), 2), disp=True)
-            ShalfA = (S_A * (1 / x)) - ((N_A) * ((1 - x) / (x - x**(N_A + 1)))\
-                     * (1 - ((x**N_A) / (N_A + 1))))
-            spp[i] = ShalfA
+    spp[0] = S
+    for i in xrange(1, len(down_areas)):
+        if N / base ** i <= 1:
+            raise DownscaleError('Cannot downscale %i iterations from ' 
+                                 % (len(down_areas) - 1) +\
+                                 'anchor scale. One or less individuals' +\
+                                 ' per cell.')
+        spp[i] = mete_downscale_sar(spp[i - 1], N / base ** (i - 1),
+                                    base=base)
     return spp[::-1]
 
+class MeteZTable(object):
+    '''
+    Precomputed universal METE SAR slope z against N / S.
+
+    z is the slope of the METE iterative SAR (mete_sar_iter) at the anchor
+    scale, from one halving and one doubling of the area, evaluated at
+    log-spaced values of N / S. Values are held in a memory-mapped .npy file
+    and a .json file holds the table version, axis and the reference n_samp.
+    Points without a solution are NaN.
+
+    Attributes
+    ----------
+    path : str
+        Path to the table files, without extension
+    n_samp : float
+        Number of species at which z was evaluated
+    step : float
+        Spacing of the N / S axis in log10 units
+    log_ratio_start : float
+        log10 of the smallest N / S in the table
+    values : np.memmap
+        1D array of z
+
+    '''
+
+    def __init__(self, path):
+        '''
+        Parameters
+        ----------
+        path : str
+            Path to the table files, without the .npy and .json extensions
+
+        '''
+        meta = json.load(open(path + '.json'))
+        if meta['version'] != Z_TABLE_VERSION:
+            raise ValueError('Table at %s has version %s, expected %i' %
+                             (path, str(meta['version']), Z_TABLE_VERSION))
+        self.path = path
+        self.n_samp = meta['n_samp']
+        self.step = meta['step']
+        self.log_ratio_start = meta['log_ratio_start']
+        self.values = np.load(path + '.npy', mmap_mode='r')
+
+    def z(self, n_over_s):
+        '''
+        Linear interpolation of z in log10(N / S).
+
+        Parameters
+        ----------
+        n_over_s : float or array-like
+            Ratios of individuals to species
+
+        Returns
+        -------
+        : float or np.array
+            Interpolated z. NaN where n_over_s is outside of the table.
+
+        '''
+        log_ratio = np.log10(n_over_s)
+        axis = self.log_ratio_start + self.step * np.arange(len(self.values))
+        return np.interp(log_ratio, axis, self.values, left=np.nan,
+                         right=np.nan)
+
+
+def build_mete_z_table(table_dir=None, n_samp=1000, min_ratio=1.001,
+                       max_ratio=1e9, step=0.005, n_jobs=1):
+    '''
+    Build the on-disk table of universal METE z against N / S.
+
+    Parameters
+    ----------
+    table_dir : str or None
+        Directory in which to save the table. If None,
+        solvers.DEFAULT_GRID_DIR.
+    n_samp : float
+        Number of species at which z is evaluated. z depends only on N / S
+        to within 1e-4 once n_samp is greater than about 100.
+    min_ratio, max_ratio : float
+        Range of N / S covered by the table
+    step : float
+        Spacing of the table in log10 units
+    n_jobs : int
+        Number of processes used to evaluate the table
+
+    Returns
+    -------
+    : MeteZTable
+        The new table
+
+    Notes
+    -----
+    Each point is mete_sar_iter(n_samp=n_samp, tot_obs=n_samp * N / S).
+    univ_curve(num_iter=0). The default table has about 1800 points and
+    builds in a few seconds with one process.
+
+    '''
+    if table_dir is None:
+        table_dir = solvers.DEFAULT_GRID_DIR
+    if not os.path.isdir(table_dir):
+        os.makedirs(table_dir)
+    path = os.path.join(table_dir, Z_TABLE_NAME)
+
+    log_ratio_start = np.log10(min_ratio)
+    num_ratio = int(np.ceil(np.round((np.log10(max_ratio) - log_ratio_start) /
+                                                              step, 8))) + 1
+    ratios = 10 ** (log_ratio_start + step * np.arange(num_ratio))
+    args = [(n_samp, ratio) for ratio in ratios]
+
+    if n_jobs > 1:
+        pool = multiprocessing.Pool(n_jobs)
+        try:
+            values = np.array(pool.map(_mete_z_at, args))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        values = np.array(map(_mete_z_at, args))
+
+    # Write to temporary files of this process and then move, so readers
+    # never see partial data and concurrent builds do not write to the same
+    # temporary file
+    meta = {'version' : Z_TABLE_VERSION, 'n_samp' : n_samp, 'step' : step,
+            'log_ratio_start' : log_ratio_start, 'shape' : [num_ratio],
+            'quantity' : 'mete_sar_iter z against tot_obs / n_samp'}
+    fd, tmp_npy = tempfile.mkstemp(suffix='.npy', dir=table_dir)
+    with os.fdopen(fd, 'wb') as f:
+        np.save(f, values)
+    fd, tmp_json = tempfile.mkstemp(suffix='.json', dir=table_dir)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(meta, f)
+    os.rename(tmp_npy, path + '.npy')
+    os.rename(tmp_json, path + '.json')
+
+    _loaded_z_tables.pop(table_dir, None)
+    return load_mete_z_table(table_dir)
+
+
+def load_mete_z_table(table_dir=None):
+    '''
+    Load the on-disk table of universal METE z.
+
+    Parameters
+    ----------
+    table_dir : str or None
+        Directory containing the table. If None, solvers.DEFAULT_GRID_DIR.
+
+    Returns
+    -------
+    : MeteZTable or None
+        The table, or None if no table of the current version exists
+
+    '''
+    if table_dir is None:
+        table_dir = solvers.DEFAULT_GRID_DIR
+
+    if table_dir not in _loaded_z_tables:
+        path = os.path.join(table_dir, Z_TABLE_NAME)
+        try:
+            _loaded_z_tables[table_dir] = MeteZTable(path)
+        except (IOError, OSError, ValueError):
+            return None
+
+    return _loaded_z_tables[table_dir]
+
+
+def mete_universal_z(n_over_s, table_dir=None):
+    '''
+    Universal METE SAR slope z at the given ratios of N to S, interpolated
+    from the precomputed table.
+
+    Parameters
+    ----------
+    n_over_s : float or array-like
+        Ratios of individuals (N) to species (S) at the anchor scale
+    table_dir : str or None
+        Directory containing the table. If None, solvers.DEFAULT_GRID_DIR.
+
+    Returns
+    -------
+    : float or np.array
+        z at each ratio. NaN outside of the range of the table.
+
+    Notes
+    -----
+    If there is no table in table_dir, the default table is built and saved
+    there first, which takes a few seconds (see build_mete_z_table and
+    utils/make_mete_z_table.py). Pass table_dir to keep it out of
+    solvers.DEFAULT_GRID_DIR.
+
+    z is that of a community of S = 1000 species with the given N / S.
+    Interpolation error is below 1e-5 in z with the default table, but z
+    also depends weakly on S: mete_sar_iter(...).univ_curve differs from it
+    by up to about 0.01 at S = 10, 1e-3 at S = 30 and 1e-5 at S = 100.
+
+    '''
+    table = load_mete_z_table(table_dir)
+    if table is None:
+        table = build_mete_z_table(table_dir)
+    return table.z(n_over_s)
+
+
+def _mete_z_at(args):
+    '''
+    Universal METE z at n_samp and N / S = ratio, or NaN if there is no
+    solution. Module level so that it can be used with multiprocessing.
+    '''
+    n_samp, ratio = args
+    try:
+        return mete_sar_iter(n_samp=n_samp, tot_obs=n_samp * ratio).\
+                                    univ_curve(num_iter=0)[0]['z'][0]
+    except (ValueError, DownscaleError, AssertionError):
+        return np.nan
+
 def _generate_areas_(anchor_area, upscale, downscale, base=2):
     '''
     Utility function that makes the area list
@@ -0,0 +1,941 @@
+#!/usr/bin/python
+
+'''
+Shared Lagrange multiplier solvers for the METE and truncated geometric
+distributions.
+
+The METE distributions (`logser_ut`, `psi`, `nu` in distributions.py) all
+require x = exp(-beta), where beta is the Lagrange multiplier given by Eq. 7.27
+in Harte (2011). Solving for x is by far the most expensive part of these
+distributions and the same community (n_samp, tot_obs) is often solved many
+times, so solutions are memoized in a bounded LRU cache.
+
+The truncated geometric distribution (`tgeo`) is solved for many abundances
+at once, so its solver works on whole arrays instead.
+
+The iterative METE SAR (`mete_sar_iter` in distributions.py) solves for beta
+at every doubling or halving of the area. These solvers work in log space and
+constant memory, so that tot_obs can grow to many orders of magnitude.
+
+Functions
+---------
+- `beta_solver` -- Function whose root in x gives the beta multiplier
+- `beta_solver_closed` -- O(1) memory version of `beta_solver`
+- `trunc_geo_sum` -- Closed form of sum(x**k) for k = 1..N
+- `trunc_log_sum` -- Constant memory evaluation of sum(x**k / k), k = 1..N
+- `mete_x` -- Cached solution for x = exp(-beta) given n_samp and tot_obs
+- `beta_cache_info` -- Hit, miss and size counters of the x cache
+- `clear_beta_cache` -- Empty the x cache and reset its counters
+- `build_mete_grid` -- Build or extend the on-disk lookup grid of x
+- `load_mete_grid` -- Load the on-disk lookup grid of x
+- `grid_x` -- Look up x in the grid and polish it with Newton's method
+- `tgeo_mean_var` -- Mean and variance of the truncated geometric
+- `tgeo_log_norm` -- Log normalizing constant of the truncated geometric
+- `tgeo_lambda` -- Vectorized solution for the log ratio of `tgeo`
+- `mete_downscale_sar` -- Species in a 1 / base cell by iterative METE
+- `mete_upscale_sar` -- Species in a base times larger area by iterative METE
+
+Classes
+-------
+- `MeteGrid` -- Memory-mapped lookup grid of x over (n_samp, tot_obs)
+
+References
+----------
+Harte, J. 2011. Maximum Entropy and Ecology: A Theory of Abundance,
+Distribution, and Energetics. Oxford University Press.
+
+'''
+
+from __future__ import division
+import numpy as np
+import scipy.optimize
+import scipy.special
+import math as m
+import sys
+import os
+import json
+from macroeco.utils.lru_cache import LRUCache
+
+__author__ = "Justin Kitzes and Mark Wilber"
+__copyright__ = "Copyright 2012, Regents of the University of California"
+__credits__ = ["John Harte"]
+__license__ = None
+__version__ = "0.1"
+__maintainer__ = "Justin Kitzes and Mark Wilber"
+__email__ = "jkitzes@berkeley.edu"
+__status__ = "Development"
+
+# Cache of x = exp(-beta) keyed on (n_samp, tot_obs, method)
+beta_cache = LRUCache(maxsize=256)
+
+# Methods available to mete_x
+SOLVER_METHODS = ['sum', 'closed', 'grid']
+
+# Version of the on-disk lookup grid. Grids with other versions are ignored.
+GRID_VERSION = 1
+GRID_NAME = 'mete_x_grid_v%i' % GRID_VERSION
+DEFAULT_GRID_DIR = os.environ.get('MACROECO_GRID_DIR',
+                            os.path.join(os.path.expanduser('~'), '.macroeco'))
+
+# Grids loaded by load_mete_grid, keyed on directory
+_loaded_grids = {}
+
+# Terms summed directly by the iterative SAR sums, largest beta searched
+SAR_NUM_HEAD = 1000
+SAR_MAX_BETA = 50.
+
+# Tables of METE absence probabilities used by the SAR sums, keyed on base
+_absent_tables = {}
+
+# Bernoulli number terms B_2j / (2j)! used in the Euler-Maclaurin tail
+_EM_COEFFS = [1 / 12., -1 / 720., 1 / 30240., -1 / 1209600., 1 / 47900160.]
+
+
+def beta_solver(x, k, tot_obs, n_samp):
+    """ Used with a solver to get the beta lagrange multiplier in the METE
+    distributions.  With a solver, this function
+    returns x and beta = -np.log(x)
+
+    Parameters
+    ----------
+    x : float
+        Lagrange multiplier x = e**-beta
+    k : np.array
+        np.arange(1, tot_obs + 1)
+    tot_obs : float
+        The total number of individuals observed (N in METE, see Harte 2011)
+    n_samp : float
+        The total number of species observed (S in METE, see Harte 2011)
+
+    Returns
+    -------
+    : float
+    """
+
+    # Beta Solver
+    return sum(x ** k / float(tot_obs) * n_samp) -  sum((x ** k) / k)
+
+
+def beta_solver_closed(x, tot_obs, n_samp):
+    """
+    Closed form equivalent of beta_solver that uses constant memory in tot_obs.
+
+    Parameters
+    ----------
+    x : float
+        Lagrange multiplier x = e**-beta
+    tot_obs : float
+        The total number of individuals observed (N in METE, see Harte 2011)
+    n_samp : float
+        The total number of species observed (S in METE, see Harte 2011)
+
+    Returns
+    -------
+    : float
+
+    Notes
+    -----
+    The geometric sum is evaluated in closed form with trunc_geo_sum and the
+    truncated log sum with trunc_log_sum.
+
+    """
+    # Near the upper bracket the geometric sum can overflow to inf, which
+    # still has the correct sign for the root finder
+    with np.errstate(over='ignore'):
+        geo = trunc_geo_sum(x, tot_obs)
+    return (geo * (n_samp / float(tot_obs))) - trunc_log_sum(x, tot_obs)
+
+
+def trunc_geo_sum(x, N):
+    '''
+    Closed form of the truncated geometric sum, sum(x**k) for k = 1..N
+
+    Parameters
+    ----------
+    x : float
+        Ratio of the geometric series. Must be greater than 0.
+    N : float
+        Number of terms in the sum
+
+    Returns
+    -------
+    : float
+
+    Notes
+    -----
+    Uses x * (x**N - 1) / (x - 1) written with expm1 so that it is accurate
+    when x is very close to one.
+
+    '''
+    lx = np.log(x)
+    if lx == 0:
+        return float(N)
+    return x * np.expm1(N * lx) / np.expm1(lx)
+
+
+def trunc_log_sum(x, N, num_direct=50):
+    '''
+    Truncated log series sum, sum(x**k / k) for k = 1..N, in constant memory
+
+    Parameters
+    ----------
+    x : float
+        Must be greater than 0
+    N : float
+        Number of terms in the sum
+    num_direct : int
+        Number of leading terms that are summed directly
+
+    Returns
+    -------
+    : float
+
+    Notes
+    -----
+    The first num_direct terms are summed directly. The remaining terms are
+    evaluated with the Euler-Maclaurin formula. The integral of x**t / t is an
+    exponential integral (scipy.special.exp1 for x < 1 and scipy.special.expi
+    for x > 1). Because beta = -log(x) is small compared to 2 * pi over the
+    range used by the METE solvers, the correction terms decrease quickly and
+    the result agrees with direct summation to near machine precision.
+
+    '''
+    num_direct = int(min(np.floor(N), num_direct))
+    k = np.arange(1, num_direct + 1)
+    direct = np.sum(x ** k / k)
+    if N <= num_direct:
+        return direct
+
+    a = num_direct + 1.
+    b = float(N)
+    beta = -np.log(x)
+
+    # Integral of exp(-beta * t) / t from a to b
+    if beta > 0:
+        integ = scipy.special.exp1(a * beta) - scipy.special.exp1(b * beta)
+    elif beta < 0:
+        integ = scipy.special.expi(-beta * b) - scipy.special.expi(-beta * a)
+    else:
+        integ = np.log(b / a)
+
+    tail = integ + 0.5 * (_log_term_deriv(a, beta, 0) +
+                          _log_term_deriv(b, beta, 0))
+    for j, coeff in enumerate(_EM_COEFFS):
+        order = 2 * j + 1
+        tail += coeff * (_log_term_deriv(b, beta, order) -
+                         _log_term_deriv(a, beta, order))
+
+    return direct + tail
+
+
+def _log_term_deriv(t, beta, order):
+    '''
+    Derivative of exp(-beta * t) / t of the given order with respect to t
+    '''
+    total = 0
+    for i in xrange(order + 1):
+        binom = m.factorial(order) / (m.factorial(i) * m.factorial(order - i))
+        total += binom * (-beta) ** (order - i) * (-1) ** i * \
+                                            m.factorial(i) * t ** (-(i + 1.))
+    return np.exp(-beta * t) * total
+
+
+def mete_x(n_samp, tot_obs, method='sum'):
+    '''
+    Solve for x = exp(-beta) given n_samp (S) and tot_obs (N).
+
+    Solutions are cached on (n_samp, tot_obs, method) so that repeated calls
+    for the same community, from any METE distribution, only solve once.
+
+    Parameters
+    ----------
+    n_samp : float
+        The total number of species observed (S in METE, see Harte 2011)
+    tot_obs : float
+        The total number of individuals observed (N in METE, see Harte 2011)
+    method : str
+        Either 'sum', 'closed' or 'grid'. If 'sum', beta_solver is evaluated
+        over an array of length tot_obs. If 'closed', beta_solver_closed is
+        used, which uses constant memory and is much faster for large tot_obs.
+        If 'grid', x is looked up in the on-disk grid (see grid_x), falling
+        back to 'closed' if the grid cannot provide x.
+
+    Returns
+    -------
+    : float
+        x = exp(-beta)
+
+    Notes
+    -----
+    Realistic values of x are in the range (1/e, 1), but x can occasionally be
+    greater than one, so the maximum stop value of the brentq optimizer is 2.
+    A ValueError is raised if there is no solution in this interval.
+
+    '''
+    if method not in SOLVER_METHODS:
+        raise ValueError("Solver method '%s' not recognized" % method)
+
+    key = (float(n_samp), float(tot_obs), method)
+    tx = beta_cache.get(key)
+    if tx is not None:
+        return tx
+
+    if method == 'grid':
+        tx = grid_x(n_samp, tot_obs)
+        if tx is None:
+            tx = _solve_x(n_samp, tot_obs, 'closed')
+    else:
+        tx = _solve_x(n_samp, tot_obs, method)
+
+    beta_cache.set(key, tx)
+    return tx
+
+
+def _solve_x(n_samp, tot_obs, method):
+    '''
+    Uncached brentq solution for x using the 'sum' or 'closed' method
+    '''
+    start = 0.3
+    stop = _upper_x(n_samp, tot_obs)
+
+    if method == 'sum':
+        k = np.linspace(1, tot_obs, num=tot_obs)
+        return scipy.optimize.brentq(beta_solver, start, stop,
+                                     args = (k, tot_obs, n_samp), disp=True)
+    else:
+        return scipy.optimize.brentq(beta_solver_closed, start, stop,
+                                     args = (tot_obs, n_samp), disp=True)
+
+
+def _upper_x(n_samp, tot_obs):
+    '''
+    Largest x for which n_samp * x ** tot_obs does not overflow, at most 2
+    '''
+    flmax = sys.float_info[0]
+    return min((flmax/n_samp)**(1/float(tot_obs)), 2)
+
+
+def beta_cache_info():
+    '''
+    Usage counters for the cache used by mete_x
+
+    Returns
+    -------
+    : dict
+        Dictionary with keys 'hits', 'misses', 'maxsize' and 'currsize'
+
+    '''
+    return beta_cache.info()
+
+
+def clear_beta_cache():
+    '''
+    Empty the cache used by mete_x and reset its counters
+    '''
+    beta_cache.clear()
+
+
+class MeteGrid(object):
+    '''
+    Precomputed lookup grid of x = exp(-beta) over (n_samp, tot_obs).
+
+    The grid stores b = beta * tot_obs / n_samp, which varies slowly, at
+    log-spaced values of n_samp and of the ratio tot_obs / n_samp. Values are
+    held in a memory-mapped .npy file and a .json file holds the grid version
+    and axes. Cells without a solution are NaN.
+
+    Attributes
+    ----------
+    path : str
+        Path to the grid files, without extension
+    step : float
+        Spacing of both axes in log10 units
+    log_s_start : float
+        log10 of the smallest n_samp on the grid
+    log_ratio_start : float
+        log10 of the smallest tot_obs / n_samp on the grid
+    values : np.memmap
+        2D array of b with n_samp along the rows and tot_obs / n_samp along the
+        columns
+
+    '''
+
+    def __init__(self, path):
+        '''
+        Parameters
+        ----------
+        path : str
+            Path to the grid files, without the .npy and .json extensions
+
+        '''
+        meta = json.load(open(path + '.json'))
+        if meta['version'] != GRID_VERSION:
+            raise ValueError('Grid at %s has version %s, expected %i' %
+                             (path, str(meta['version']), GRID_VERSION))
+        self.path = path
+        self.step = meta['step']
+        self.log_s_start = meta['log_s_start']
+        self.log_ratio_start = meta['log_ratio_start']
+        self.values = np.load(path + '.npy', mmap_mode='r')
+
+    def guess(self, n_samp, tot_obs):
+        '''
+        Bilinear interpolation of x at n_samp and tot_obs.
+
+        Parameters
+        ----------
+        n_samp : float
+            The total number of species observed (S in METE)
+        tot_obs : float
+            The total number of individuals observed (N in METE)
+
+        Returns
+        -------
+        : float or None
+            Interpolated x, or None if the point is off the grid or next to a
+            cell with no solution
+
+        '''
+        if n_samp <= 0 or tot_obs <= n_samp:
+            return None
+
+        i = (np.log10(n_samp) - self.log_s_start) / self.step
+        j = (np.log10(tot_obs / n_samp) - self.log_ratio_start) / self.step
+        num_i, num_j = self.values.shape
+        if i < 0 or j < 0 or i > num_i - 1 or j > num_j - 1:
+            return None
+
+        i0 = min(int(np.floor(i)), num_i - 2)
+        j0 = min(int(np.floor(j)), num_j - 2)
+        di = i - i0
+        dj = j - j0
+        cell = np.array(self.values[i0:i0 + 2, j0:j0 + 2])
+        if np.any(np.isnan(cell)):
+            return None
+
+        b = (cell[0, 0] * (1 - di) * (1 - dj) + cell[1, 0] * di * (1 - dj) +
+             cell[0, 1] * (1 - di) * dj + cell[1, 1] * di * dj)
+        return np.exp(-b * n_samp / tot_obs)
+
+
+def build_mete_grid(grid_dir=None, min_n_samp=2, max_n_samp=1e4,
+                    min_ratio=1.1, max_ratio=1e5, step=0.05):
+    '''
+    Build the on-disk lookup grid of x, or extend an existing one.
+
+    If a grid of the current version and the same step already exists in
+    grid_dir, its values are reused and only the new cells are solved.
+
+    Parameters
+    ----------
+    grid_dir : str or None
+        Directory in which to save the grid. If None, DEFAULT_GRID_DIR.
+    min_n_samp, max_n_samp : float
+        Range of n_samp covered by the grid
+    min_ratio, max_ratio : float
+        Range of tot_obs / n_samp covered by the grid
+    step : float
+        Spacing of the grid in log10 units
+
+    Returns
+    -------
+    : MeteGrid
+        The new grid
+
+    Notes
+    -----
+    Each cell is solved with the 'closed' method with tot_obs rounded to the
+    nearest integer. The default grid has about 7500 cells and builds in
+    under a minute.
+
+    '''
+    if grid_dir is None:
+        grid_dir = DEFAULT_GRID_DIR
+    if not os.path.isdir(grid_dir):
+        os.makedirs(grid_dir)
+    path = os.path.join(grid_dir, GRID_NAME)
+
+    # Reuse an existing, compatible grid
+    old = None
+    if os.path.exists(path + '.json'):
+        try:
+            old = MeteGrid(path)
+        except ValueError:
+            old = None
+        if old is not None and not np.allclose(old.step, step):
+            old = None
+
+    log_s_start = np.log10(min_n_samp)
+    log_ratio_start = np.log10(min_ratio)
+    if old is not None:
+        # Align the new axes with the old ones
+        log_s_start = old.log_s_start - step * max(0,
+            np.ceil(np.round((old.log_s_start - log_s_start) / step, 8)))
+        log_ratio_start = old.log_ratio_start - step * max(0,
+            np.ceil(np.round((old.log_ratio_start - log_ratio_start) / step, 8)))
+        log_s_end = max(np.log10(max_n_samp), old.log_s_start +
+                        step * (old.values.shape[0] - 1))
+        log_ratio_end = max(np.log10(max_ratio), old.log_ratio_start +
+                        step * (old.values.shape[1] - 1))
+    else:
+        log_s_end = np.log10(max_n_samp)
+        log_ratio_end = np.log10(max_ratio)
+
+    num_s = int(np.ceil(np.round((log_s_end - log_s_start) / step, 8))) + 1
+    num_ratio = int(np.ceil(np.round((log_ratio_end - log_ratio_start) / step,
+                                                                      8))) + 1
+    values = np.empty((num_s, num_ratio))
+    solved = np.zeros((num_s, num_ratio), dtype=bool)
+
+    if old is not None:
+        i_off = int(np.round((old.log_s_start - log_s_start) / step))
+        j_off = int(np.round((old.log_ratio_start - log_ratio_start) / step))
+        old_i, old_j = old.values.shape
+        values[i_off:i_off + old_i, j_off:j_off + old_j] = old.values
+        solved[i_off:i_off + old_i, j_off:j_off + old_j] = True
+
+    for i in xrange(num_s):
+        tn_samp = 10 ** (log_s_start + i * step)
+        for j in xrange(num_ratio):
+            if solved[i, j]:
+                continue
+            ttot_obs = np.round(tn_samp * 10 ** (log_ratio_start + j * step))
+            try:
+                tx = _solve_x(tn_samp, ttot_obs, 'closed')
+                values[i, j] = -np.log(tx) * ttot_obs / tn_samp
+            except ValueError:
+                values[i, j] = np.nan
+
+    # Write to temporary files and then move so readers never see partial data
+    tmp_path = path + '.tmp'
+    np.save(tmp_path + '.npy', values)
+    meta = {'version' : GRID_VERSION, 'step' : step,
+            'log_s_start' : log_s_start, 'log_ratio_start' : log_ratio_start,
+            'shape' : [num_s, num_ratio],
+            'quantity' : 'beta * tot_obs / n_samp'}
+    json.dump(meta, open(tmp_path + '.json', 'w'))
+    os.rename(tmp_path + '.npy', path + '.npy')
+    os.rename(tmp_path + '.json', path + '.json')
+
+    _loaded_grids.pop(grid_dir, None)
+    return load_mete_grid(grid_dir)
+
+
+def load_mete_grid(grid_dir=None):
+    '''
+    Load the on-disk lookup grid of x.
+
+    Parameters
+    ----------
+    grid_dir : str or None
+        Directory containing the grid. If None, DEFAULT_GRID_DIR.
+
+    Returns
+    -------
+    : MeteGrid or None
+        The grid, or None if no grid of the current version exists
+
+    '''
+    if grid_dir is None:
+        grid_dir = DEFAULT_GRID_DIR
+
+    if grid_dir not in _loaded_grids:
+        path = os.path.join(grid_dir, GRID_NAME)
+        try:
+            _loaded_grids[grid_dir] = MeteGrid(path)
+        except (IOError, OSError, ValueError):
+            return None
+
+    return _loaded_grids[grid_dir]
+
+
+def grid_x(n_samp, tot_obs, tol=1e-8, max_iter=6, grid_dir=None):
+    '''
+    Look up x = exp(-beta) in the on-disk grid.
+
+    The interpolated value is polished with Newton's method on
+    beta_solver_closed until tot_obs * |dx| / x, the change in the log of
+    x ** tot_obs, is less than tol.
+
+    Parameters
+    ----------
+    n_samp : float
+        The total number of species observed (S in METE)
+    tot_obs : float
+        The total number of individuals observed (N in METE)
+    tol : float
+        Tolerance on the change in log(x ** tot_obs) in the last Newton step
+    max_iter : int
+        Maximum number of Newton steps
+    grid_dir : str or None
+        Directory containing the grid. If None, DEFAULT_GRID_DIR.
+
+    Returns
+    -------
+    : float or None
+        x, or None if there is no grid, the point is off the grid or Newton's
+        method does not reach tol. Callers should then use an exact solver.
+
+    '''
+    grid = load_mete_grid(grid_dir)
+    if grid is None:
+        return None
+
+    tx = grid.guess(n_samp, tot_obs)
+    if tx is None:
+        return None
+
+    stop = _upper_x(n_samp, tot_obs)
+    for i in xrange(max_iter):
+        fval = beta_solver_closed(tx, tot_obs, n_samp)
+        fprime = (n_samp / float(tot_obs)) * _trunc_geo_sum_deriv(tx, tot_obs)\
+                                            - trunc_geo_sum(tx, tot_obs) / tx
+        dx = fval / fprime
+        tx = tx - dx
+        if not (0 < tx < stop) or np.isnan(tx):
+            return None
+        if tot_obs * np.abs(dx) / tx < tol:
+            return tx
+
+    return None
+
+
+def _trunc_geo_sum_deriv(x, N):
+    '''
+    Derivative of trunc_geo_sum with respect to x, sum(k * x**(k - 1))
+    '''
+    lx = np.log(x)
+    if np.abs(N * lx) < 1e-4:
+        return N * (N + 1) / 2.
+    xN = np.exp(N * lx)
+    return (1 - (N + 1) * xN + N * xN * x) / (1 - x) ** 2
+
+
+def tgeo_mean_var(lam, tot_obs):
+    '''
+    Mean and variance of the truncated geometric distribution.
+
+    Parameters
+    ----------
+    lam : float or np.array
+        Log of the ratio x of the distribution, p(n) proportional to x**n
+    tot_obs : float or np.array
+        Upper limit N of the support 0..N
+
+    Returns
+    -------
+    : tuple of np.arrays
+        Mean and variance
+
+    Notes
+    -----
+    Uses the closed forms for x < 1 written with expm1, so that no power of x
+    is ever formed, and the reflection n -> N - n for x > 1. When
+    (N + 1) * |lam| is small the closed forms cancel, and their Taylor series
+    about lam = 0 are used instead.
+
+    '''
+    lam, N = np.broadcast_arrays(np.asarray(lam, dtype=float),
+                                 np.asarray(tot_obs, dtype=float))
+    v = np.abs(lam)
+    M = N + 1
+    small = M * v < 1e-3
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        mean = 1 / np.expm1(v) - M / np.expm1(M * v)
+        var = 1 / (np.expm1(v) * -np.expm1(-v)) - \
+                                   M ** 2 / (np.expm1(M * v) * -np.expm1(-M * v))
+
+    series_mean = N / 2 - v * (M ** 2 - 1) / 12 + v ** 3 * (M ** 4 - 1) / 720
+    series_var = (M ** 2 - 1) / 12 - v ** 2 * (M ** 4 - 1) / 240
+    mean = np.where(small, series_mean, mean)
+    var = np.where(small, series_var, var)
+
+    # Reflect for x > 1
+    mean = np.where(lam > 0, N - mean, mean)
+    return mean, var
+
+
+def tgeo_log_norm(lam, tot_obs):
+    '''
+    Log of the normalizing constant sum(x**k), k = 0..N, of the truncated
+    geometric distribution, with lam = log(x).
+
+    Parameters
+    ----------
+    lam : float or np.array
+        Log of the ratio x of the distribution
+    tot_obs : float or np.array
+        Upper limit N of the support 0..N
+
+    Returns
+    -------
+    : np.array
+        Log normalizing constant
+
+    '''
+    lam, N = np.broadcast_arrays(np.asarray(lam, dtype=float),
+                                 np.asarray(tot_obs, dtype=float))
+    v = np.abs(lam)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_norm = np.log(-np.expm1(-(N + 1) * v)) - np.log(-np.expm1(-v))
+    log_norm = np.where(v == 0, np.log(N + 1), log_norm)
+
+    # Largest term is x**N when x > 1
+    return np.where(lam > 0, N * lam + log_norm, log_norm)
+
+
+def tgeo_lambda(tot_obs, a, tol=1e-14, max_iter=200):
+    '''
+    Log of the ratio x of the truncated geometric distribution with mean
+    N * a, for arrays of N and a.
+
+    Parameters
+    ----------
+    tot_obs : float or np.array
+        Upper limit N of the support 0..N
+    a : float or np.array
+        Fraction of N that is the mean of the distribution
+    tol : float
+        Relative tolerance on lam
+    max_iter : int
+        Maximum number of iterations
+
+    Returns
+    -------
+    : np.array
+        lam = log(x). Nan where there is no solution, i.e. a is not between
+        0 and 1 or N is not positive.
+
+    Notes
+    -----
+    All roots are found together by Newton's method in lam, whose derivative
+    is the variance of the distribution. Each root is kept inside a bracket
+    and a step that leaves it is replaced by bisection. The mean is evaluated
+    in log space by tgeo_mean_var, so large N and x do not overflow.
+
+    '''
+    N, a = np.broadcast_arrays(np.asarray(tot_obs, dtype=float),
+                               np.asarray(a, dtype=float))
+    valid = (a > 0) & (a < 1) & (N > 0)
+    N = np.where(valid, N, 1)
+    target = np.where(valid, N * a, .5)
+
+    # The mean is below 1 / expm1(-lam) for lam < 0, which gives the lower
+    # bracket, and the upper bracket follows by reflection
+    lo = -np.log1p(1 / target) - 1
+    hi = np.log1p(1 / (N - target)) + 1
+
+    # Start from the linearization about lam = 0
+    lam = np.clip(12 * (target - N / 2) / (N * (N + 2)), lo, hi)
+
+    for i in xrange(max_iter):
+        mean, var = tgeo_mean_var(lam, N)
+        f = mean - target
+        lo = np.where(f < 0, lam, lo)
+        hi = np.where(f > 0, lam, hi)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            new_lam = lam - f / var
+        outside = ~((new_lam > lo) & (new_lam < hi))
+        new_lam = np.where(outside, (lo + hi) / 2, new_lam)
+
+        done = np.abs(new_lam - lam) <= tol * np.maximum(1, np.abs(lam))
+        lam = new_lam
+        if np.all(done | (f == 0)):
+            break
+
+    return np.where(valid, lam, np.nan)
+
+
+def mete_downscale_sar(n_samp, tot_obs, base=2):
+    '''
+    Number of species expected in a cell of 1 / base of an area with n_samp
+    species and tot_obs individuals, by method 1 in Harte (2011).
+
+    Parameters
+    ----------
+    n_samp : float
+        The total number of species in the area (S in METE)
+    tot_obs : float
+        The total number of individuals in the area (N in METE)
+    base : float
+        Ratio of the area to the cell. Must be greater than 1.
+
+    Returns
+    -------
+    : float
+        Species in the cell
+
+    Notes
+    -----
+    Solves S / N = sum(x**k / k) / sum(x**k) for beta = -log(x) and returns
+    N * sum(x**k / k * (1 - Pi(0 | k))) / sum(x**k), where Pi(0 | k) is the
+    METE probability that a species with k individuals is absent from the cell
+    (1 / (k + 1) for base 2). All sums are evaluated in log space and in
+    constant memory (see _present_log_sum), so tot_obs may be very large.
+
+    '''
+    _check_sar_base(base)
+    log_target = np.log(n_samp / tot_obs)
+    log_ratio = lambda beta: np.log(_trunc_log_sum_beta(beta, tot_obs)) - \
+                    _log_trunc_geo_sum(beta, tot_obs) - log_target
+    beta = _solve_sar_beta(log_ratio, n_samp, tot_obs)
+    return np.exp(np.log(tot_obs) + np.log(_present_log_sum(beta, tot_obs,
+                                base)) - _log_trunc_geo_sum(beta, tot_obs))
+
+
+def mete_upscale_sar(n_samp, tot_obs, base=2):
+    '''
+    Number of species expected in an area base times larger than a cell with
+    n_samp species and tot_obs individuals, by method 1 in Harte (2011).
+
+    Parameters
+    ----------
+    n_samp : float
+        The total number of species in the cell (S in METE)
+    tot_obs : float
+        The total number of individuals in the cell (N in METE). The larger
+        area has base * tot_obs individuals.
+    base : float
+        Ratio of the larger area to the cell. Must be greater than 1.
+
+    Returns
+    -------
+    : float
+        Species in the larger area
+
+    Notes
+    -----
+    Solves for the beta of the larger area for which mete_downscale_sar
+    returns n_samp, then returns its species number N * sum(x**k / k) /
+    sum(x**k) with N = base * tot_obs. The root is found in log(beta), so
+    the very small beta of large N are resolved to full relative precision.
+
+    '''
+    _check_sar_base(base)
+    N_big = base * tot_obs
+    log_target = np.log(n_samp / N_big)
+    log_ratio = lambda beta: np.log(_present_log_sum(beta, N_big, base)) - \
+                    _log_trunc_geo_sum(beta, N_big) - log_target
+    beta = _solve_sar_beta(log_ratio, n_samp, N_big)
+    return np.exp(np.log(N_big) + np.log(_trunc_log_sum_beta(beta, N_big)) -
+                  _log_trunc_geo_sum(beta, N_big))
+
+
+def _check_sar_base(base):
+    '''
+    Raise ValueError if base is not greater than one
+    '''
+    if not base > 1:
+        raise ValueError('base must be greater than 1, got %s' % str(base))
+
+
+def _solve_sar_beta(log_ratio, n_samp, tot_obs):
+    '''
+    Root in beta of log_ratio, an increasing function of beta. Positive roots
+    are found in log(beta), negative roots down to the smallest beta for
+    which n_samp * x**tot_obs does not overflow.
+    '''
+    at_zero = log_ratio(0.)
+    if at_zero == 0:
+        return 0.
+    if at_zero < 0:
+        log_beta = scipy.optimize.brentq(lambda t: log_ratio(np.exp(t)),
+                        np.log(1e-10 / tot_obs), np.log(SAR_MAX_BETA), disp=True)
+        return np.exp(log_beta)
+    return scipy.optimize.brentq(log_ratio,
+                        -np.log(_upper_x(n_samp, tot_obs)), 0, disp=True)
+
+
+def _log_trunc_geo_sum(beta, N):
+    '''
+    Log of sum(exp(-beta * k)) for k = 1..N, without forming exp(-beta * N)
+    '''
+    if beta > 0:
+        return -beta + np.log(-np.expm1(-N * beta)) - np.log(-np.expm1(-beta))
+    elif beta < 0:
+        return -beta - N * beta + np.log(-np.expm1(N * beta)) - \
+                                                    np.log(np.expm1(-beta))
+    return np.log(N)
+
+
+def _trunc_log_sum_beta(beta, N):
+    '''
+    sum(exp(-beta * k) / k) for k = 1..N. Unlike trunc_log_sum, takes beta
+    itself, which keeps full relative precision when beta is very small.
+    '''
+    num_head = int(min(np.floor(N), SAR_NUM_HEAD))
+    k = np.arange(1, num_head + 1.)
+    head = np.sum(np.exp(-beta * k) / k)
+    if N <= SAR_NUM_HEAD:
+        return head
+    return head + _power_sum(beta, SAR_NUM_HEAD + 1., N, 1)
+
+
+def _present_log_sum(beta, N, base):
+    '''
+    sum(exp(-beta * k) / k * (1 - Pi(0 | k))) for k = 1..N, where Pi(0 | k) is
+    the probability that a species with k individuals is absent from a cell
+    of 1 / base of the area.
+
+    The first SAR_NUM_HEAD terms are summed directly. Beyond them
+    Pi(0 | k) = gamma / k + e / k**2 to within O(1 / k**3), and the remaining
+    terms are the power sums of orders 1, 2 and 3 given by _power_sum.
+    '''
+    p0, gamma, e = _absent_table(base)
+    num_head = int(min(np.floor(N), SAR_NUM_HEAD))
+    k = np.arange(1, num_head + 1.)
+    head = np.sum(np.exp(-beta * k) / k * (1 - p0[:num_head]))
+    if N <= SAR_NUM_HEAD:
+        return head
+
+    a = SAR_NUM_HEAD + 1.
+    return head + _power_sum(beta, a, N, 1) - gamma * _power_sum(beta, a, N, 2)\
+                                            - e * _power_sum(beta, a, N, 3)
+
+
+def _absent_table(base):
+    '''
+    METE probabilities Pi(0 | k) for k = 1..SAR_NUM_HEAD that a species with k
+    individuals is absent from a cell of 1 / base of the area, and the
+    coefficients gamma and e of their expansion gamma / k + e / k**2.
+    '''
+    base = float(base)
+    if base not in _absent_tables:
+        k = np.arange(1, SAR_NUM_HEAD + 1.)
+        k_fit = np.array([SAR_NUM_HEAD, 2. * SAR_NUM_HEAD])
+        p0, p0_fit = [np.exp(-tgeo_log_norm(tgeo_lambda(tk, 1 / base), tk))
+                      for tk in (k, k_fit)]
+
+        # k**2 * Pi(0 | k) = gamma * k + e at both fit points
+        q = k_fit ** 2 * p0_fit
+        gamma = (q[1] - q[0]) / (k_fit[1] - k_fit[0])
+        e = q[0] - gamma * k_fit[0]
+        _absent_tables[base] = (p0, gamma, e)
+    return _absent_tables[base]
+
+
+def _power_sum(beta, a, b, order):
+    '''
+    sum(exp(-beta * k) / k**order) for k = a..b by the Euler-Maclaurin
+    formula, for order >= 1 and a large enough that the terms are smooth.
+    '''
+    a, b = float(a), float(b)
+    f = lambda t: np.exp(-beta * t) * t ** -order
+    df = lambda t: -np.exp(-beta * t) * (beta * t ** -order + order *
+                                         t ** -(order + 1))
+
+    # Integral of exp(-beta * t) / t**p from a to b, reduced to p = 1 by
+    # integration by parts
+    if beta > 0:
+        integ = scipy.special.exp1(a * beta) - scipy.special.exp1(b * beta)
+    elif beta < 0:
+        integ = scipy.special.expi(-beta * b) - scipy.special.expi(-beta * a)
+    else:
+        integ = np.log(b / a)
+    for p in xrange(2, order + 1):
+        integ = ((f(a) * a ** (order - p + 1) - f(b) * b ** (order - p + 1)) -
+                 beta * integ) / (p - 1)
+
+    return integ + 0.5 * (f(a) + f(b)) + (df(b) - df(a)) / 12.
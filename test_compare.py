@@ -548,6 +548,10 @@ class TestCompare(unittest.TestCase):
         smry = ied_c.summary()
         self.assertTrue(smry['observed']['balls'] == [4905, 190])
 
+        # The second IED has E < N, so psi has pdf 0 and AIC inf, not NaN
+        self.assertTrue(np.isfinite(smry['psi']['aic'][0]))
+        self.assertTrue(smry['psi']['aic'][1] == np.inf)
+
     def test_nll(self):
         
         # Test against R result: sum(dnorm(c(1,2,3,4,5), log=TRUE))
@@ -556,6 +560,19 @@ class TestCompare(unittest.TestCase):
         lglk = nll([test_vals])[0]
         self.assertTrue(R_res == np.round(lglk, decimals=5))
 
+        # Log values give the same result
+        lglk = nll([stats.norm.logpdf((1,2,3,4,5))], log=True)[0]
+        self.assertTrue(R_res == np.round(lglk, decimals=5))
+
+        # log_likelihoods uses logpmf, or logpdf when there is no pmf
+        data = [np.array([1, 2, 5, 40])]
+        lmd = dist.logser(n_samp=10, tot_obs=100)
+        self.assertTrue(np.allclose(log_likelihoods(lmd, data)[0],
+                                    np.log(lmd.pmf(data)[0])))
+        lmd = dist.psi(n_samp=10, tot_obs=100, E=1000)
+        self.assertTrue(np.allclose(log_likelihoods(lmd, data)[0],
+                                    np.log(lmd.pdf(data)[0])))
+
     def test_empirical_cdf(self):
         
         #Test against R's ecdf function
@@ -612,6 +629,13 @@ class TestCompare(unittest.TestCase):
         aicw, delta_aic = aic_weights(aic_vals)
         pred = np.array([ 0.47909787,  0.52090213])
         self.assertTrue(np.array_equal(np.round(aicw, decimals=8), pred))
+
+        # Models with infinite AIC, e.g. a pdf of 0 at some data, give no NaN
+        aicw, delta_aic = aic_weights([np.inf, np.inf])
+        self.assertTrue(np.array_equal(aicw, [.5, .5]))
+        self.assertTrue(np.array_equal(delta_aic, [0, 0]))
+        aicw, delta_aic = aic_weights([10, np.inf])
+        self.assertTrue(np.array_equal(aicw, [1, 0]))
          
 
     def test_ks_two_sample(self):
@@ -20,9 +20,16 @@ Weecology functions from https://github.com/weecology/macroecotools.
 
 import unittest
 from macroeco.distributions import *
+import macroeco.distributions as distributions
 import numpy as np
 import scipy.stats as stats
+import scipy.special
+import scipy.integrate as integrate
 import matplotlib.pyplot as plt
+import os
+import json
+import shutil
+import tempfile
 
 # TODO: Need to add fit functions to tests with new fit functions. 
 
@@ -95,6 +102,12 @@ class TestDistributions(unittest.TestCase):
         pmf  = lg.pmf(1) 
         self.assertTrue(np.round(-np.log(lg.var['x'][0]), decimals=7) == 0.0000228)
         
+        # Test that the closed form solver gives the same pmf
+        pmf = logser_ut(n_samp=34, tot_obs=567).pmf(np.arange(1, 568))[0]
+        pmf_closed = logser_ut(n_samp=34, tot_obs=567,
+                               solver='closed').pmf(np.arange(1, 568))[0]
+        self.assertTrue(np.allclose(pmf, pmf_closed, rtol=1e-10, atol=0))
+
         # Check that they don't fail
         logser_ut(n_samp=64, tot_obs=1000).rad()
         logser_ut(n_samp=64, tot_obs=1000).cdf((1,1,2,4,5,7,12))
@@ -158,6 +171,19 @@ class TestDistributions(unittest.TestCase):
             diff1 = np.round(R[i], decimals=5) - np.round(pmf, decimals=5)
             self.assertTrue(abs(diff1) == 0)
 
+        # Test quadrature against adaptive integration
+        eq = lambda t, x, mu, sigma: np.exp(t * x - np.exp(t) - 0.5 *
+                                            ((t - mu) / sigma)**2)
+        n = np.array([0, 1, 2, 5, 17, 100])
+        for mu, sigma in [(1, 1), (2, 3), (1.2, 1.5)]:
+            quad_pmf = np.array([integrate.quad(eq, -np.inf, np.inf,
+                        args=(g, mu, sigma))[0] / (np.sqrt(2 * np.pi) * sigma
+                        * np.exp(scipy.special.gammaln(g + 1))) for g in n])
+            pred = plognorm(mu=mu, sigma=sigma).pmf(n)[0]
+            self.assertTrue(np.allclose(pred, quad_pmf, rtol=1e-6, atol=0))
+            pred = plognorm(mu=mu, sigma=sigma, quad_nodes=40).pmf(n)[0]
+            self.assertTrue(np.allclose(pred, quad_pmf, rtol=1e-4, atol=0))
+
         # Test pmf is zero when mu or sigma negative
         self.assertTrue(sum(np.round(plognorm(mu=-3,sigma=3).\
                                      pmf([1,2,3,4,5])[0], decimals=3)) == 0) 
@@ -168,11 +194,20 @@ class TestDistributions(unittest.TestCase):
         Rmu = 1.31928; Rsigma = 1.18775
         test_vec1 = np.array([1,1,1,1,1,2,2,2,3,3,4,4,5,5,6,6,12,45,67])
         test_plog = plognorm().fit([test_vec1])
-        print test_plog.params
-        self.assertTrue(np.round(test_plog.params['mu'][0], decimals = 5) ==
+        self.assertTrue(np.abs(test_plog.params['mu'][0] - Rmu) < 1e-4)
+        self.assertTrue(np.abs(test_plog.params['sigma'][0] - Rsigma) < 1e-4)
+
+        # The gradient fit converges more tightly than poilog's optim, so
+        # compare with R to 5 decimals only through the fmin fit and check
+        # that the gradient fit's likelihood is at least as good
+        fmin_plog = plognorm().fit([test_vec1], method='fmin')
+        self.assertTrue(np.round(fmin_plog.params['mu'][0], decimals = 5) ==
                             Rmu)
-        self.assertTrue(np.round(test_plog.params['sigma'][0], decimals = 5) ==
+        self.assertTrue(np.round(fmin_plog.params['sigma'][0], decimals = 5) ==
                             Rsigma)
+        grad_nll = -np.sum(np.log(test_plog.pmf(test_vec1)[0]))
+        fmin_nll = -np.sum(np.log(fmin_plog.pmf(test_vec1)[0]))
+        self.assertTrue(grad_nll <= fmin_nll)
 
         # Test that these don't fail
         plognorm().fit([self.abund_list[0]])
@@ -206,6 +241,16 @@ class TestDistributions(unittest.TestCase):
         self.assertTrue(R_fit['mu'] == np.round(mu, decimals=3))
         self.assertTrue(R_fit['sigma'] == np.round(sigma, decimals=3))
 
+        # Gradient fit agrees with the fmin fit
+        for tdata in [sad, self.abund_list[0]]:
+            grad_dist = plognorm_lt().fit([tdata])
+            fmin_dist = plognorm_lt().fit([tdata], method='fmin')
+            self.assertTrue(np.allclose(grad_dist.params['mu'],
+                                        fmin_dist.params['mu'], rtol=1e-3))
+            self.assertTrue(np.allclose(grad_dist.params['sigma'],
+                                        fmin_dist.params['sigma'], rtol=1e-3))
+        self.assertRaises(ValueError, plognorm_lt().fit, [sad], method='bad')
+
         # Test that these don't fail
         plognorm_lt(mu=[2,3], sigma=[2,3]).cdf(5)
         plognorm_lt(mu=2, sigma=2).pmf([2,3,4,5,23])
@@ -351,6 +396,21 @@ class TestDistributions(unittest.TestCase):
         ind = np.abs(diff) <= error
         self.assertTrue(np.all(ind))
 
+        # Same seed gives the same rad, with or without a process pool
+        sugi_dist = sugihara(n_samp=[10, 20], tot_obs=[400, 100])
+        rad1 = sugi_dist.rad(sample_size=500, random_state=2)
+        rad2 = sugi_dist.rad(sample_size=500,
+                             random_state=np.random.RandomState(2))
+        for r1, r2 in zip(rad1, rad2):
+            self.assertTrue(np.array_equal(r1, r2))
+            self.assertTrue(np.all(np.diff(r1) >= 0))
+        rad3 = sugi_dist.rad(sample_size=500, random_state=2, n_jobs=2)
+        rad4 = sugi_dist.rad(sample_size=500, random_state=2, n_jobs=2)
+        for r1, r3, r4 in zip(rad1, rad3, rad4):
+            self.assertTrue(np.array_equal(r3, r4))
+            self.assertTrue(np.allclose(np.sum(r1), np.sum(r3)))
+        self.assertRaises(ValueError, sugi_dist.rad, random_state='a')
+
         # Test that error is raised for cdf, pdf, pmf methods
         self.assertRaises(NotImplementedError, sugihara().pmf, 67)
         self.assertRaises(NotImplementedError, sugihara().cdf, 34)
@@ -405,6 +465,27 @@ class TestDistributions(unittest.TestCase):
         geo_data = np.random.geometric(p, size=10000)
         dist = nbd().fit([geo_data])
         self.assertTrue(np.round(dist.params['k'][0], decimals=1) == 1)
+
+        # Newton fit of many histograms matches fmin and fits one at a time
+        data = [np.random.negative_binomial(k, k / (k + mu), size=200) for k,
+                mu in [(.1, 5), (.5, 20), (2., 3), (8., 50)]]
+        k_newton = nbd().fit(data).params['k']
+        k_fmin = nbd().fit(data, method='fmin').params['k']
+        self.assertTrue(np.all(np.abs(k_newton - k_fmin) / k_fmin < 1e-3))
+        for tdata, tk in zip(data, k_newton):
+            self.assertTrue(nbd().fit([tdata]).params['k'][0] == tk)
+
+        # Score is zero at the fitted k
+        tdata = data[1]
+        score = np.sum(scipy.special.digamma(tdata + k_newton[1]) -
+                       scipy.special.digamma(k_newton[1])) - \
+                       len(tdata) * np.log1p(np.mean(tdata) / k_newton[1])
+        self.assertTrue(np.abs(score) < 1e-8)
+
+        # Underdispersed data go to the upper bound, all zeros to the guess
+        k = nbd().fit([[2, 3, 2, 3, 2], [0, 0, 0]], guess_for_k=.5).params['k']
+        self.assertTrue(k[0] == 1e10 and k[1] == .5)
+        self.assertRaises(ValueError, nbd().fit, data, method='bad')
     
     def test_nbd_lt(self):
         # TODO: test pmf
@@ -458,6 +539,15 @@ class TestDistributions(unittest.TestCase):
         test_cdf = np.round(np.cumsum(test_vals), decimals=7)
         self.assertTrue(np.array_equal(pred_cdf, test_cdf))
 
+        # Newton fit matches fmin on zero truncated data
+        np.random.seed(12)
+        data = [np.random.negative_binomial(k, k / (k + mu), size=400) for k,
+                mu in [(.3, 5), (1., 20), (4., 10)]]
+        data = [tdata[tdata > 0] for tdata in data]
+        k_newton = nbd_lt().fit(data).params['k']
+        k_fmin = nbd_lt().fit(data, method='fmin').params['k']
+        self.assertTrue(np.all(np.abs(k_newton - k_fmin) / k_fmin < 1e-3))
+
         
         
 
@@ -488,6 +578,26 @@ class TestDistributions(unittest.TestCase):
         dist = fnbd().fit([geo_data])
         self.assertTrue(np.round(dist.params['k'][0], decimals=1) == 1)
 
+        # Histogram likelihood over a vector of k matches the pmf
+        tdata = np.random.negative_binomial(.5, .5 / 6.5, size=100)
+        n_uniq, counts = np.unique(tdata, return_counts=True)
+        k = np.array([1e-6, .1, .5, 3, 10])
+        nll = distributions._fnbd_nll(k, n_uniq, counts, np.sum(tdata), .01)
+        for tk, tnll in zip(k, nll):
+            direct = -np.sum(fnbd(tot_obs=np.sum(tdata), n_samp=100,
+                                  k=tk).logpmf(tdata)[0])
+            self.assertTrue(np.abs(tnll - direct) / direct < 1e-10)
+
+        # Profile fit matches the brute force fit and stays in bounds
+        data = [np.random.negative_binomial(k, k / (k + mu), size=200) for k,
+                mu in [(.3, 5), (1., 2), (4., 10)]]
+        k_profile = fnbd().fit(data).params['k']
+        k_brute = fnbd().fit(data, method='brute').params['k']
+        self.assertTrue(np.all(np.abs(k_profile - k_brute) / k_brute < 1e-3))
+        k = fnbd().fit([np.random.poisson(5, size=200)], upper_bnd=2)
+        self.assertTrue(0 < k.params['k'][0] <= 2)
+        self.assertRaises(ValueError, fnbd().fit, data, method='bad')
+
         # Test against published data in Zillio and He 2010
         # Generated plots match exactly with plots in Zillio and He, 2010
         # Code to generate plots: Unquote and run nosetest if you want to see
@@ -604,6 +714,15 @@ class TestDistributions(unittest.TestCase):
         pred_vals = np.round(tg.var['x'], decimals=4)
         self.assertTrue(np.array_equal(x_vals, pred_vals))
 
+        # All abundances solved at once, including large ones
+        N = np.arange(1, 2001)
+        pmf = tgeo(tot_obs=N, n_samp=4).pmf(zip(N))
+        self.assertTrue(len(pmf) == 2000)
+        full = tgeo(tot_obs=[341, 2000], n_samp=4).pmf(np.arange(0, 2001))
+        self.assertTrue(np.abs(np.sum(full[0][:342]) - 1) < 1e-12)
+        self.assertTrue(np.abs(np.sum(full[1]) - 1) < 1e-12)
+        self.assertRaises(ValueError, tgeo(tot_obs=10, n_samp=.5).pmf, 0)
+
         # Test that pdf and cdf give correct values
         check = dist.pmf([1,1,2,3,4,5,12,34,65])
         self.assertTrue(dist.cdf(0)[0][0] == dist.pmf(0)[0][0])
@@ -616,6 +735,57 @@ class TestDistributions(unittest.TestCase):
         self.assertTrue(len(dist.params['tot_obs']) == 4)
     
     
+    def test_p_absent(self):
+
+        # Closed forms match pmf(0)
+        N = np.arange(1, 200)
+        for a in [.01, .3, .5, .9]:
+            for ssad in [binm(), pois(), nbd(k=.7), fnbd(k=.7), geo(), fgeo(),
+                         tgeo(), nbd_lt(k=.7)]:
+                params = dict(ssad.params)
+                params['tot_obs'] = N
+                params['n_samp'] = np.repeat(1 / a, len(N))
+                pmf0 = np.array([tpmf[0] for tpmf in 
+                                 ssad.__class__(**params).pmf(0)])
+                p_abs = ssad.p_absent(N, a)
+                self.assertTrue(len(p_abs) == len(N))
+                self.assertTrue(np.allclose(p_abs, pmf0, rtol=1e-10, atol=0))
+
+        # One cell fraction per abundance and unchanged params
+        dist = nbd(k=[.5, 2], tot_obs=10, n_samp=5)
+        p_abs = dist.p_absent([10, 20], [.5, .25])
+        self.assertTrue(np.allclose(p_abs, [(1 + 5 / .5) ** -.5,
+                                            (1 + 5 / 2.) ** -2]))
+        self.assertTrue(dist.params['tot_obs'] == 10)
+        self.assertRaises(ValueError, tgeo().p_absent, 10, 2)
+
+    def test_p_endemic(self):
+
+        # Vectorized forms match the pmf at n = tot_obs
+        N = np.arange(1, 200)
+        for a in [.01, .3, .5, .9]:
+            for ssad in [binm(), pois(), nbd(k=.7), fnbd(k=.7), geo(), fgeo(),
+                         tgeo(), nbd_lt(k=.7)]:
+                params = dict(ssad.params)
+                params['tot_obs'] = N
+                params['n_samp'] = np.repeat(1 / a, len(N))
+                pmfN = np.array([tpmf[0] for tpmf in 
+                                 ssad.__class__(**params).pmf(zip(N))])
+                p_end = ssad.p_endemic(N, a)
+                self.assertTrue(len(p_end) == len(N))
+                self.assertTrue(np.allclose(p_end, pmfN, rtol=1e-10, atol=0))
+
+        # EAR from gen_sar uses them
+        sad = logser_ut(n_samp=20, tot_obs=300)
+        sad_pmf = sad.pmf(np.arange(1, 301))[0]
+        for ssad in [binm(), tgeo(), fnbd(k=.5)]:
+            ear = gen_sar(sad, ssad, n_samp=20, tot_obs=300).vals([.5, .1],
+                                                                  form='ear')
+            for tear, a in zip(ear['items'], [.5, .1]):
+                direct = np.sum(20 * sad_pmf * ssad.p_endemic(np.arange(1, 301),
+                                                              a))
+                self.assertTrue(np.allclose(tear, direct))
+
     def test_mete_sar_iter(self):
         
         # Check mete sar against EW values
@@ -648,6 +818,18 @@ class TestDistributions(unittest.TestCase):
                                                                  non_iter=True)
         self.assertTrue(len(sar) == 4) 
 
+        # Other bases iterate by powers of base
+        sar = mete_sar_iter(n_samp=34, tot_obs=1000).iter_vals(upscale=2,
+                                                         downscale=2, base=3)
+        self.assertTrue(np.allclose(sar['area'], [1 / 9., 1 / 3., 1, 3, 9]))
+        self.assertTrue(np.all(np.diff(sar['items']) > 0))
+        self.assertTrue(sar['items'][2] == 34)
+
+        # Many doublings from large N
+        sar = mete_sar_iter(n_samp=100, tot_obs=1e5).iter_vals(upscale=20)
+        self.assertTrue(np.all(np.isfinite(sar['items'])))
+        self.assertTrue(np.all(np.diff(sar['items']) > 0))
+
         # Check errors are thrown
         sar = mete_sar_iter(n_samp=34, tot_obs=1000)
 
@@ -686,6 +868,67 @@ class TestDistributions(unittest.TestCase):
         # That vals method is not implemented
         self.assertRaises(NotImplementedError, sar.vals, 4)
 
+        # Batch universal curves match one curve at a time
+        S = np.array([100, 100, 10]); N = np.array([1000, 5000, 200])
+        unis, sars = sar.univ_curve_batch(S, N, num_iter=2)
+        self.assertTrue(unis.shape == (3, 3))
+        for i in xrange(3):
+            uni, spp = mete_sar_iter(n_samp=S[i], tot_obs=N[i]).\
+                                                        univ_curve(num_iter=2)
+            self.assertTrue(np.array_equal(unis['z'][i], uni['z']))
+            self.assertTrue(np.array_equal(sars['items'][i], spp['items']))
+        self.assertTrue(np.all(unis['n_samp'] == S[:, None]))
+        self.assertTrue(sar.params == {'n_samp': 45, 'tot_obs': 5000})
+
+        # 2D broadcasts are flattened into one row per pair
+        unis, sars = sar.univ_curve_batch([10, 100], [[200], [1000]],
+                                          num_iter=2)
+        self.assertTrue(unis.shape == (4, 3))
+        self.assertTrue(np.array_equal(unis['n_samp'][:, 0], [10, 100, 10, 100]))
+        self.assertTrue(np.array_equal(unis['tot_obs'][:, 0],
+                                       [200, 200, 1000, 1000]))
+        uni = mete_sar_iter(n_samp=100, tot_obs=1000).univ_curve(num_iter=2)[0]
+        self.assertTrue(np.array_equal(unis['z'][3], uni['z']))
+
+    def test_mete_universal_z(self):
+        table_dir = tempfile.mkdtemp()
+        try:
+            # No table yet
+            self.assertTrue(load_mete_z_table(table_dir) is None)
+
+            table = build_mete_z_table(table_dir, min_ratio=2, max_ratio=100,
+                                       step=0.02, n_jobs=2)
+            self.assertTrue(len(table.values) == 86)
+            self.assertTrue(np.all(np.isfinite(table.values)))
+
+            # Only the table files are left, whatever the temporary names
+            self.assertTrue(sorted(os.listdir(table_dir)) ==
+                            sorted([distributions.Z_TABLE_NAME + ext for ext
+                                    in ['.npy', '.json']]))
+
+            # Interpolated values agree with the iterative SAR
+            ratios = np.array([2.5, 10, 33.3, 87])
+            z = mete_universal_z(ratios, table_dir=table_dir)
+            for ratio, tz in zip(ratios, z):
+                exact = mete_sar_iter(n_samp=1000, tot_obs=1000 * ratio).\
+                                            univ_curve(num_iter=0)[0]['z'][0]
+                self.assertTrue(np.abs(tz - exact) < 1e-4)
+            self.assertTrue(np.all(np.diff(z) < 0))
+
+            # Single ratios work and points off the table are NaN
+            self.assertTrue(np.abs(mete_universal_z(10, table_dir=table_dir) -
+                                   .3887) < 1e-3)
+            self.assertTrue(np.all(np.isnan(mete_universal_z([1.5, 200],
+                                                    table_dir=table_dir))))
+
+            # Tables of other versions are ignored
+            path = os.path.join(table_dir, 'old')
+            np.save(path + '.npy', table.values)
+            json.dump({'version' : 0}, open(path + '.json', 'w'))
+            self.assertRaises(ValueError, MeteZTable, path)
+        finally:
+            shutil.rmtree(table_dir)
+
     def test_power_law(self):
 
         # Check that fit produces correct result. Predicted species at 1 should
@@ -772,6 +1015,39 @@ class TestDistributions(unittest.TestCase):
         non_iter = gnsar.univ_curve(num_iter=3)
         self.assertTrue(len(itera) == len(non_iter))
 
+        # Batch of anchors broadcasts n_samp against tot_obs
+        unis, sars = gnsar.univ_curve_batch(40, [300, 600], num_iter=3)
+        self.assertTrue(np.allclose(unis['z'][1], non_iter[0]['z'],
+                                                                rtol=1e-10))
+        self.assertTrue(np.all(unis['tot_obs'][0] == 300))
+        self.assertTrue(gnsar.params['tot_obs'] == 600)
+
+    def test_gen_sar_cache(self):
+        # Repeated calls reuse cached sads and occupancy and give the same
+        # values (up to the root solver tolerance) without modifying the sad
+        # or ssad
+        sad = logser(); ssad = binm()
+        gnsar = gen_sar(sad, ssad, n_samp=40, tot_obs=600)
+        for use_rad in [False, True]:
+            v1 = gnsar.vals([.1, .5, 2, 4], use_rad=use_rad)
+            hits = gnsar._occ_cache.hits
+            v2 = gnsar.vals([.1, .5, 2, 4], use_rad=use_rad)
+            self.assertTrue(np.allclose(v1['items'], v2['items'], rtol=1e-10))
+            self.assertTrue(gnsar._occ_cache.hits > hits)
+        self.assertTrue(sad.params == {} and ssad.params == {})
+
+        # Values match an uncached gen_sar
+        fresh = gen_sar(logser(), binm(), n_samp=40, tot_obs=600)
+        v3 = fresh.vals([.1, .5, 2, 4], use_rad=True)
+        self.assertTrue(np.allclose(v2['items'], v3['items'], rtol=1e-10))
+
+        # Timing is recorded for each area
+        sar = gnsar.iter_vals(downscale=1, upscale=1)
+        self.assertTrue(sad.params == {} and ssad.params == {})
+        self.assertTrue(np.array_equal(gnsar.var['timing']['area'],
+                                       sar['area']))
+        self.assertTrue(np.all(gnsar.var['timing']['seconds'] >= 0))
+
     #More testing should be done
     def test_theta(self):
 
@@ -797,6 +1073,24 @@ class TestDistributions(unittest.TestCase):
         # Test rad doesn't throw error
         tht.rad()
 
+        # A vector of species abundances shares lambda_2 and matches
+        # species evaluated one at a time
+        n = np.array([1, 3, 3, 40, 200])
+        tht = theta(n_samp=5, tot_obs=300, E=3000, n=n)
+        rad = tht.rad()
+        cdf = tht.cdf([[1.5, 2], [3], [5], [1, 10, 1.2], [1.01]])
+        self.assertTrue(len(set(tht.var['lambda_2'])) == 1)
+        for i, tn in enumerate(n):
+            single = theta(n_samp=5, tot_obs=300, E=3000, n=tn)
+            self.assertTrue(np.allclose(rad[i], single.rad()[0], rtol=1e-14))
+            self.assertTrue(len(rad[i]) == tn)
+            self.assertTrue(np.allclose(cdf[i], single.cdf(
+                        [[1.5, 2], [3], [5], [1, 10, 1.2], [1.01]][i])[0]))
+
+            # e_max is where the cdf reaches 1 - 1 / (2 * n)
+            self.assertTrue(np.abs(single.cdf(tht.var['e_max'][i])[0][0] -
+                                   (1 - 1 / (2. * tn))) < 1e-12)
+
         # TODO: test fit
 
     def test_psi(self):
@@ -826,6 +1120,62 @@ class TestDistributions(unittest.TestCase):
         # Test rad doesn't throw an error
         ps.rad()
 
+        # Log-space pdf and cdf match the direct formulas where those are
+        # valid, and the pdf matches the sum over abundances it comes from
+        for S, N, E in [(4, 64, 256), (34, 567, 2000), (100, 1e4, 5e4)]:
+            ps = psi(n_samp=S, tot_obs=N, E=E)
+            e = np.array([1, 1.5, 3, E / S, E / 2., E])
+            pdf = ps.pdf(e)[0]
+            cdf = ps.cdf(e)[0]
+            beta, l2 = ps.var['beta'][0], ps.var['lambda_2'][0]
+            l1 = beta - l2
+            sigma = l1 + E * l2
+            norm = (S / (l2 * N)) * (((np.exp(-beta) - np.exp(-beta *
+                    (N + 1))) / (1 - np.exp(-beta))) - ((np.exp(-sigma) -
+                    np.exp(-sigma * (N + 1))) / (1 - np.exp(-sigma))))
+            g = np.exp(-(beta + (e - 1) * l2))
+            old_pdf = (S / (N * norm)) * g * (1 - ((N + 1) * g ** N) +
+                                         (N * g ** (N + 1))) / ((1 - g) ** 2)
+            n = np.arange(1, N + 1)
+            sum_pdf = np.array([np.sum(n * tg ** n) for tg in g]) * S / \
+                                                                    (N * norm)
+            old_cdf = beta * ((1 / (1 - np.exp(l1 + l2 * e))) -
+                              (1 / (1 - np.exp(l1 + l2))))
+            self.assertTrue(np.all(np.abs(pdf - old_pdf) / old_pdf < 1e-10))
+            self.assertTrue(np.all(np.abs(pdf - sum_pdf) / sum_pdf < 1e-12))
+            self.assertTrue(np.all(np.abs(cdf - old_cdf) < 1e-10))
+            self.assertTrue(np.allclose(ps.logpdf(e)[0], np.log(pdf)))
+
+        # Terms in the pdf that cancel near gamma = 0 match direct sums
+        for N in [3, 16, 1000, 1e6]:
+            n = np.arange(1, N + 1)
+            for g in [-1e-6, 0, 1e-9, 1e-6, .7 / N, 2. / N, .5, 5]:
+                direct = np.sum(n * np.exp(-g * n))
+                weight = np.exp(distributions._psi_log_weight(g, N)[0])
+                self.assertTrue(np.abs(weight - direct) / direct < 1e-12)
+
+        # An IED of a million individuals in one call
+        ps = psi(n_samp=100, tot_obs=1e6, E=5e6)
+        ied = ps.rvs(10**6, random_state=2)[0]
+        self.assertTrue(np.all(np.isfinite(ps.logpdf(ied)[0])))
+        e = np.logspace(0, np.log10(5e6), num=20001)
+        pdf = ps.pdf(e)[0]
+        self.assertTrue(np.all(pdf > 0))
+        self.assertTrue(np.abs(np.trapz(pdf, e) - 1) < 1e-3)
+        cdf = ps.cdf(e)[0]
+        self.assertTrue(cdf[0] == 0 and np.all(np.diff(cdf) > -1e-15))
+        rad = ps.rad()[0]
+        self.assertTrue(np.all(np.isfinite(rad)) and np.all(np.diff(rad) < 0))
+
+        # With less than one unit of energy per individual the pdf is 0
+        ps = psi(n_samp=20, tot_obs=990, E=190)
+        self.assertTrue(np.array_equal(ps.pdf([1, 2, 3, 4, 5])[0], np.zeros(5)))
+        self.assertTrue(np.all(ps.logpdf([1, 2, 3])[0] == -np.inf))
+
+        # Errors name the method called
+        self.assertRaisesRegexp(ValueError, 'psi.pdf', psi(n_samp=10,
+                                tot_obs=5, E=100).pdf, 1)
+
     def test_nu(self):
         
         # Test error is raised when pdf called
@@ -852,15 +1202,346 @@ class TestDistributions(unittest.TestCase):
         self.assertTrue(np.round(nudist.cdf(e_max), decimals=1) == 1)
 
 
-        # Test that rad works
+        # Closed form cdf matches numerical integration of the pmf
+        beta = nudist.var['beta'][0]
+        e_min = 1 + 1 / (500 * l2)
+        for te in [1.5, 3, 20, 80]:
+            quad = integrate.quad(nu_pmf_eq, e_min, te, (beta, l2, 50))[0] / \
+                   integrate.quad(nu_pmf_eq, e_min, e_max, (beta, l2, 50))[0]
+            self.assertTrue(np.abs(nudist.cdf(te)[0][0] - quad) < 1e-8)
+
+        # Test that rad works and inverts the cdf
         g = nudist.rad()
         self.assertTrue((len(g[0]) == 50))
+        self.assertTrue(np.allclose(nudist.cdf(g[0])[0], np.arange(.01, 1,
+                                                    .02), rtol=0, atol=1e-12))
 
         # Test fit
         g = nu().fit([([1,2,3,4,5,6,7], [1,2,3,4,5,6,7])])
         self.assertTrue(g.params['tot_obs'][0] == 28)
         self.assertTrue(g.params['n_samp'][0] == 7)
         self.assertTrue(g.params['E'][0] == 28)
+
+    def test_chunked_rad_cdf(self):
+
+        # Chunked evaluation gives the same rad and cdf
+        n = [1, 2, 5, 40, 100, 999, 1000]
+        for dist in [logser_ut(tot_obs=1000, n_samp=40),
+                     plognorm_lt(mu=2, sigma=1.5, tot_obs=1000, n_samp=40),
+                     fnbd(tot_obs=[1000, 1000], n_samp=[40, 20], k=[.3, 2])]:
+            rad = dist.rad()
+            chunk_rad = dist.rad(chunk_size=37)
+            for trad, tchunk in zip(rad, chunk_rad):
+                self.assertTrue(np.array_equal(trad, tchunk))
+            for err in dist.var['rad_trunc_err']:
+                self.assertTrue(0 <= err < 1)
+
+            cdf = dist.cdf(n)
+            chunk_cdf = dist.cdf(n, chunk_size=64)
+            for tcdf, tchunk in zip(cdf, chunk_cdf):
+                self.assertTrue(np.allclose(tcdf, tchunk, rtol=0, atol=1e-10))
+
+        # Evaluation stops once the tail mass is below tail_tol
+        dist = logser_ut(tot_obs=10**6, n_samp=20, solver='closed')
+        cdf = dist.cdf([1, 10**6], chunk_size=1000, tail_tol=1e-3)[0]
+        err = dist.var['cdf_trunc_err'][0]
+        self.assertTrue(0 < err < 1e-3)
+        self.assertTrue(np.abs(cdf[1] - 1) < 1e-3)
+        self.assertTrue(cdf[0] == dist.pmf(1)[0][0])
+
+        # With the default solver, all blocks reuse one normalizing constant
+        dist = logser_ut(tot_obs=10**5, n_samp=50)
+        rad = dist.rad()
+        cdf = dist.cdf([10, 10**4])
+        chunk_rad = dist.rad(chunk_size=1000)
+        chunk_cdf = dist.cdf([10, 10**4], chunk_size=1000)
+        info = dist._norm_tables().info()
+        self.assertTrue(info['misses'] == 1 and info['currsize'] == 1)
+        self.assertTrue(np.array_equal(rad[0], chunk_rad[0]))
+        self.assertTrue(np.allclose(cdf[0], chunk_cdf[0], rtol=0, atol=1e-10))
+
+    def test_pmf_batch(self):
+        # Batch mode matches the per-set pmf and cdf for shared and ragged n,
+        # with and without vectorized kernels
+        S = np.array([5., 10, 20]); N = np.array([50., 400, 100])
+        n = np.arange(1, 20)
+        offsets = [0, 2, 2, 6]
+        flat = np.array([1, 3, 2, 4, 8, 16])
+        dists = [logser(n_samp=S, tot_obs=N), logser_ut(n_samp=S, tot_obs=N),
+                 lognorm(n_samp=S, tot_obs=N, sigma=[.5, 1, 2]),
+                 binm(n_samp=S, tot_obs=N), pois(n_samp=S, tot_obs=N),
+                 nbd(n_samp=S, tot_obs=N, k=[.1, 1, 3]), geo(n_samp=S,
+                 tot_obs=N), nbd_lt(n_samp=S, tot_obs=N, k=[.1, 1, 3]),
+                 tgeo(n_samp=S, tot_obs=N)]
+        for dist in dists:
+            methods = ['pmf']
+            if not isinstance(dist, (logser_ut, tgeo)):
+                methods.append('cdf')
+            for method in methods:
+                vals = getattr(dist, method + '_batch')(n)
+                self.assertTrue(vals.shape == (3, len(n)))
+                self.assertTrue(np.allclose(vals, getattr(dist, method)(n),
+                                            rtol=1e-12, atol=0))
+                vals = getattr(dist, method + '_batch')(flat, offsets)
+                self.assertTrue(vals.shape == (6,))
+                self.assertTrue(np.allclose(vals, np.concatenate(getattr(dist,
+                    method)([flat[:2], flat[2:2], flat[2:]])), rtol=1e-12,
+                    atol=0))
+
+        # Offsets must cover n and match the parameter sets
+        dist = pois(n_samp=S, tot_obs=N)
+        self.assertRaises(ValueError, dist.pmf_batch, flat, [0, 2, 6])
+        self.assertRaises(ValueError, dist.pmf_batch, flat, [0, 2, 2, 5])
+        self.assertRaises(ValueError, dist.pmf_batch, [[1, 2]])
+
+        # expand_n shares one read-only array between parameter sets
+        n = np.arange(5)
+        views = expand_n(n, 3)
+        self.assertTrue(all(np.may_share_memory(n, tn) for tn in views))
+        self.assertTrue(not views[0].flags.writeable)
+
+    def test_logpmf(self):
+        # Log space kernels match the log of pmf and pdf
+        S = np.array([5., 10, 20]); N = np.array([50., 400, 100])
+        n = np.arange(1, 20)
+        dists = [logser(n_samp=S, tot_obs=N), logser_ut(n_samp=S, tot_obs=N),
+                 logser_ut_appx(n_samp=S, tot_obs=N),
+                 plognorm(mu=[.5, 1, 2], sigma=[.5, 1, 2]),
+                 plognorm_lt(mu=[.5, 1, 2], sigma=[.5, 1, 2]),
+                 lognorm(n_samp=S, tot_obs=N, sigma=[.5, 1, 2]),
+                 geo_ser(n_samp=S, tot_obs=N, k=[.1, .5, .9]),
+                 broken_stick(n_samp=S, tot_obs=N), binm(n_samp=S, tot_obs=N),
+                 pois(n_samp=S, tot_obs=N), nbd(n_samp=S, tot_obs=N,
+                 k=[.1, 1, 3]), nbd_lt(n_samp=S, tot_obs=N, k=[.1, 1, 3]),
+                 fnbd(n_samp=S, tot_obs=N, k=[.1, 1, 3]), geo(n_samp=S,
+                 tot_obs=N), fgeo(n_samp=S, tot_obs=N), tgeo(n_samp=S,
+                 tot_obs=N)]
+        for dist in dists:
+            for tlog, tpmf in zip(dist.logpmf(n), dist.pmf(n)):
+                self.assertTrue(np.allclose(tlog, np.log(tpmf), rtol=1e-10,
+                                            atol=1e-10))
+
+        dist = theta(n_samp=S, tot_obs=N, E=N * 10, n=[1, 5, 10])
+        e = np.linspace(1, 30, num=20)
+        for tlog, tpdf in zip(dist.logpdf(e), dist.pdf(e)):
+            self.assertTrue(np.allclose(tlog, np.log(tpdf), rtol=1e-10,
+                                        atol=1e-10))
+
+        # Special cases and zero probabilities give -inf
+        lp = logser_ut(n_samp=5, tot_obs=5).logpmf([1, 2])[0]
+        self.assertTrue(lp[0] == 0 and lp[1] == -np.inf)
+        lp = tgeo(n_samp=1, tot_obs=5).logpmf([3, 5])[0]
+        self.assertTrue(lp[0] == -np.inf and lp[1] == 0)
+        for S in [5, 6]:
+            dist = broken_stick(n_samp=S, tot_obs=50)
+            lp = dist.logpmf([10, 50, 51, 80])[0]
+            self.assertTrue(np.isfinite(lp[0]) and np.all(lp[1:] == -np.inf))
+            with np.errstate(divide='ignore'):
+                log_pmf = np.log(dist.pmf([10, 50, 51, 80])[0])
+            self.assertTrue(np.allclose(lp, log_pmf, rtol=1e-10, atol=1e-10))
+        self.assertTrue(logser(n_samp=5, tot_obs=50).logpmf(0)[0][0] ==
+                                                                    -np.inf)
+        self.assertTrue(plognorm(mu=-1, sigma=1).logpmf(3)[0][0] == -np.inf)
+
+        # Values far in the tails do not underflow
+        lp = logser(n_samp=100, tot_obs=1e6).logpmf(1e8)[0][0]
+        self.assertTrue(np.isfinite(lp) and lp < -745)
+        lp = nbd(n_samp=100, tot_obs=100, k=1).logpmf(2000)[0][0]
+        self.assertTrue(np.abs(lp - (2000 * np.log(.5) + np.log(.5))) < 1e-8)
+        lp = tgeo(n_samp=10, tot_obs=1e5).logpmf(1e5)[0][0]
+        self.assertTrue(np.isfinite(lp))
+
+    def test_rvs(self):
+        # Alias tables reproduce the pmf
+        for tpmf in [np.array([.5, .5]), np.array([0, 1, 0, 3.]),
+                     logser_ut(n_samp=34, tot_obs=5000).pmf(np.arange(1,
+                     5001))[0], np.random.RandomState(0).exponential(size=999)
+                     ** 6]:
+            prob, alias = distributions._alias_table(tpmf)
+            implied = prob.copy()
+            np.add.at(implied, alias, 1 - prob)
+            self.assertTrue(np.all(prob >= 0) and np.all(prob <= 1))
+            self.assertTrue(np.allclose(implied / len(prob), tpmf /
+                                        np.sum(tpmf), rtol=0, atol=1e-14))
+
+        # Sample frequencies match the pmf
+        S = np.array([5., 20]); N = np.array([50., 100])
+        dists = [logser(n_samp=S, tot_obs=N), logser_ut(n_samp=S, tot_obs=N),
+                 plognorm_lt(mu=[.5, 2], sigma=[.5, 2]), pois(n_samp=S,
+                 tot_obs=N), nbd(n_samp=S, tot_obs=N, k=[.1, 3]),
+                 nbd_lt(n_samp=S, tot_obs=N, k=[.1, 3]), fnbd(n_samp=S,
+                 tot_obs=N, k=[.1, 3]), geo(n_samp=S, tot_obs=N),
+                 tgeo(n_samp=S, tot_obs=N)]
+        for dist in dists:
+            n = np.arange(dist.min_supp, 30)
+            rvs = dist.rvs(100000, random_state=1)
+            for trvs, tpmf in zip(rvs, dist.pmf(n)):
+                self.assertTrue(trvs.shape == (100000,))
+                freq = np.bincount(trvs, minlength=30)[n] / 1e5
+                self.assertTrue(np.all(np.abs(freq - tpmf) <
+                                       5 * np.sqrt(tpmf / 1e5) + 1e-5))
+
+        # Draws are reproducible, and alias tables are cached
+        dist = logser_ut(n_samp=S, tot_obs=N)
+        rvs = dist.rvs((10, 3), random_state=2)
+        self.assertTrue(rvs[0].shape == (10, 3))
+        self.assertTrue(np.array_equal(rvs[1], dist.rvs((10, 3),
+                                                         random_state=2)[1]))
+        info = dist._alias_tables().info()
+        self.assertTrue(info['misses'] == 2 and info['hits'] == 2)
+
+        # Continuous variates stay within their support
+        e = theta(n_samp=20, tot_obs=100, E=1000, n=[1, 50]).rvs(1000,
+                                                              random_state=3)
+        self.assertTrue(all(np.all((te >= 1) & (te <= 1000)) for te in e))
+        e = psi(n_samp=20, tot_obs=100, E=1000).rvs(1000, random_state=3)[0]
+        self.assertTrue(np.all((e >= 1) & (e <= 1000)))
+        e = nu(n_samp=20, tot_obs=100, E=1000).rvs(1000, random_state=3)[0]
+        self.assertTrue(np.all((e >= 1) & (e <= 1 + (1000 - 100) / 20.)))
+        rvs = sugihara(n_samp=10, tot_obs=100).rvs(25, random_state=3)[0]
+        self.assertTrue(len(rvs) == 25 and np.all((rvs > 0) & (rvs < 100)))
+
+    def test_lower_truncated(self):
+
+        # A truncated distribution built on the mixin matches direct
+        # renormalization of the base
+        class pois_lt(LowerTruncated, pois):
+            def __init__(self, **kwargs):
+                pois.__init__(self, **kwargs)
+                self.min_supp = 1
+
+        S = np.array([10., 20]); N = np.array([30., 400])
+        n = np.arange(0, 60)
+        dist = pois_lt(n_samp=S, tot_obs=N)
+        base = pois(n_samp=S, tot_obs=N)
+        for tpmf, tlogpmf, tcdf, bpmf, bcdf in zip(dist.pmf(n),
+                    dist.logpmf(n), dist.cdf(n), base.pmf(n), base.cdf(n)):
+            self.assertTrue(tpmf[0] == 0 and tlogpmf[0] == -np.inf)
+            self.assertTrue(tcdf[0] == 0)
+            direct = bpmf[1:] / (1 - bpmf[0])
+            self.assertTrue(np.allclose(tpmf[1:], direct, rtol=1e-12))
+            self.assertTrue(np.allclose(tlogpmf[1:], np.log(direct),
+                                        rtol=1e-12))
+            self.assertTrue(np.allclose(tcdf[1:], np.cumsum(direct),
+                                        rtol=1e-12))
+
+        # p(0) is evaluated once per parameter set
+        info = dist._p0_tables().info()
+        self.assertTrue(info['misses'] == 2 and info['hits'] == 4)
+        self.assertTrue(len(dist.var['mu']) == 2)
+
+        # rvs redraws zeros and rad ranks the truncated pmf
+        rvs = dist.rvs(1000, random_state=5)
+        self.assertTrue(all(np.all(trvs >= 1) for trvs in rvs))
+        self.assertTrue(np.abs(np.mean(rvs[0]) - np.sum(np.arange(1, 60) *
+                                        dist.pmf(np.arange(1, 60))[0])) < .2)
+        rad = dist.rad()
+        self.assertTrue(len(rad[0]) == 10 and np.all(rad[0] >= 1))
+
+        # Existing truncated distributions sit on the mixin
+        for dist in [nbd_lt(n_samp=S, tot_obs=N, k=[.5, 2]),
+                     plognorm_lt(mu=[1, 2], sigma=[1, 2])]:
+            self.assertTrue(isinstance(dist, LowerTruncated))
+            pmf = dist.pmf([0, 1, 2])
+            self.assertTrue(pmf[0][0] == 0 and pmf[1][0] == 0)
+            self.assertTrue(dist._p0_tables().info()['currsize'] == 2)
+
+    def test_cdf_cache(self):
+
+        dist = plognorm_lt(mu=[2, 1], sigma=[1.5, 1])
+        n = [1, 5, 3, 40, 2]
+        cdf = dist.cdf(n)
+        direct = [np.cumsum(dist.pmf(np.arange(1, 41))[i])[np.array(n) - 1]
+                  for i in xrange(2)]
+        for tcdf, tdirect in zip(cdf, direct):
+            self.assertTrue(np.array_equal(tcdf, tdirect))
+        info = dist._cdf_tables().info()
+        self.assertTrue(info['misses'] == 2 and info['currsize'] == 2)
+
+        # Repeated queries within the table reuse it
+        cdf2 = dist.cdf([3, 40])
+        self.assertTrue(dist._cdf_tables().info()['hits'] == 2)
+        self.assertTrue(np.array_equal(cdf2[0], cdf[0][[2, 3]]))
+
+        # New params get a new table
+        dist.params['mu'] = [2, 1.5]
+        cdf3 = dist.cdf(n)
+        self.assertTrue(np.array_equal(cdf3[0], cdf[0]))
+        self.assertTrue(not np.array_equal(cdf3[1], cdf[1]))
+        self.assertTrue(dist._cdf_tables().info()['currsize'] == 3)
+
+        # var follows the current params when switching back to a cached table
+        dist = logser_ut(n_samp=10, tot_obs=100)
+        dist.cdf([10])
+        x_a = dist.var['x'][0]
+        dist.params['tot_obs'] = 1000
+        dist.cdf([10])
+        self.assertTrue(dist.var['x'][0] != x_a)
+        dist.params['tot_obs'] = 100
+        dist.cdf([10])
+        self.assertTrue(dist._cdf_tables().info()['hits'] == 1)
+        self.assertTrue(dist.var['x'][0] == x_a)
+
+        # Attributes that change the pmf are part of the key
+        cdf = dist.cdf([10])[0]
+        dist.solver = 'closed'
+        self.assertTrue(dist._param_key(0) != logser_ut(n_samp=10,
+                                                   tot_obs=100)._param_key(0))
+        self.assertTrue(np.allclose(dist.cdf([10])[0], cdf))
+        self.assertTrue(dist._cdf_tables().info()['currsize'] == 3)
+
+        dist = plognorm(mu=2, sigma=1.5)
+        cdf = dist.cdf([10])[0]
+        dist.quad_nodes = 10
+        self.assertTrue(dist.cdf([10])[0] != cdf)
+        self.assertTrue(np.array_equal(dist.cdf([10])[0],
+                        plognorm(mu=2, sigma=1.5, quad_nodes=10).cdf([10])[0]))
+
+        # n below the support has cdf 0 with a cold or warm table, and
+        # non-integer n take the cdf of floor(n)
+        dist = logser_ut(n_samp=10, tot_obs=100)
+        self.assertTrue(np.array_equal(dist.cdf([0])[0], [0]))
+        full = dist.cdf([50])[0]
+        cdf = dist.cdf([0, -3, 2, 2.5, 50])[0]
+        self.assertTrue(np.array_equal(cdf[:2], [0, 0]))
+        self.assertTrue(cdf[2] == cdf[3] and cdf[4] == full[0])
+        chunk_cdf = dist.cdf([0, -3, 2, 2.5, 50], chunk_size=7)[0]
+        self.assertTrue(np.allclose(chunk_cdf, cdf, rtol=0, atol=1e-10))
+
+        dist = tgeo(tot_obs=20, n_samp=4)
+        dist.cdf([20])
+        cdf = dist.cdf([-1, 3])[0]
+        self.assertTrue(cdf[0] == 0 and cdf[1] == dist.cdf([3])[0][0])
+
+    def test_make_rank_abund(self):
+
+        # Test against a direct step quantile function
+        pmf = logser_ut(tot_obs=300, n_samp=30).pmf(np.arange(1, 301))[0]
+        cum_pmf = np.cumsum(pmf)
+        points = np.arange(1 / 60., 1, 1 / 30.)
+        direct = np.array([np.sum(cum_pmf <= p) + 1 for p in points])
+        rad = make_rank_abund(pmf, 30)
+        self.assertTrue(np.array_equal(rad, direct))
+        self.assertTrue(np.array_equal(make_rank_abund(pmf, 30, min_supp=0),
+                                       direct - 1))
+
+        # Streaming version matches for any chunk size
+        for size in [1, 7, 50, 300]:
+            chunks = (pmf[i:i + size] for i in xrange(0, 300, size))
+            self.assertTrue(np.array_equal(make_rank_abund_stream(chunks, 30),
+                                           rad))
+            chunks = (pmf[i:i + size] for i in xrange(0, 300, size))
+            self.assertTrue(np.array_equal(make_rank_abund_stream(chunks, 30,
+                                               min_supp=0), direct - 1))
+
+        # Streaming stops drawing chunks once all points are placed
+        drawn = []
+        def chunk_gen():
+            for i in xrange(0, 300, 10):
+                drawn.append(i)
+                yield pmf[i:i + 10]
+        make_rank_abund_stream(chunk_gen(), 30)
+        self.assertTrue(len(drawn) < 30)
         
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/python
+
+#Testing solvers
+
+import unittest
+from macroeco.solvers import *
+import macroeco.solvers as solvers
+import numpy as np
+import scipy.optimize
+import sys
+import os
+import shutil
+import tempfile
+
+
+class TestSolvers(unittest.TestCase):
+    '''Test the functions within solvers.py'''
+
+    def setUp(self):
+        clear_beta_cache()
+
+    def test_mete_x(self):
+        # Test that mete_x matches direct solution of beta_solver
+        for S, N in [(4, 16), (34, 567), (64, 1000), (16, 2**8 * 16)]:
+            k = np.linspace(1, N, num=N)
+            stop = min((sys.float_info[0] / S)**(1 / float(N)), 2)
+            tx = scipy.optimize.brentq(beta_solver, 0.3, stop,
+                                       args=(k, N, S), disp=True)
+            self.assertTrue(mete_x(S, N) == tx)
+
+        # Test error when there is no solution
+        self.assertRaises(ValueError, mete_x, 1000, 10)
+
+    def test_trunc_sums(self):
+        # Test closed form sums against direct summation
+        for N in [1, 10, 50, 51, 100, 5000]:
+            k = np.arange(1, N + 1)
+            for x in [0.3, 0.9, 0.999, 0.99999, 1., 1.0001, 1.001]:
+                geo = np.sum(x ** k)
+                lsum = np.sum(x ** k / k)
+                self.assertTrue(np.abs(trunc_geo_sum(x, N) - geo) / geo
+                                                                      < 1e-12)
+                self.assertTrue(np.abs(trunc_log_sum(x, N) - lsum) / lsum
+                                                                      < 1e-12)
+
+    def test_closed_method(self):
+        # Test that closed and sum methods give the same x
+        for S, N in [(4, 16), (34, 567), (64, 1000), (16, 2**8 * 16),
+                     (64, 2**12 * 64)]:
+            self.assertTrue(np.abs(mete_x(S, N, method='closed') -
+                                   mete_x(S, N, method='sum')) < 1e-10)
+
+        # Methods are cached separately
+        self.assertTrue(beta_cache_info()['currsize'] == 10)
+
+        self.assertRaises(ValueError, mete_x, 10, 100, method='bad')
+
+    def test_beta_cache(self):
+        # Repeated calls for the same community hit the cache
+        mete_x(34, 567)
+        mete_x(34, 567)
+        mete_x(34., 567.)
+        info = beta_cache_info()
+        self.assertTrue(info['misses'] == 1)
+        self.assertTrue(info['hits'] == 2)
+        self.assertTrue(info['currsize'] == 1)
+
+        # Cache is bounded
+        maxsize = info['maxsize']
+        for N in xrange(100, 100 + maxsize + 10):
+            mete_x(10, N)
+        self.assertTrue(beta_cache_info()['currsize'] == maxsize)
+
+        # Least recently used entry was evicted
+        mete_x(34, 567)
+        self.assertTrue(beta_cache_info()['misses'] == maxsize + 12)
+
+        clear_beta_cache()
+        info = beta_cache_info()
+        self.assertTrue(info['hits'] == 0 and info['currsize'] == 0)
+
+    def test_mete_grid(self):
+        grid_dir = tempfile.mkdtemp()
+        try:
+            # No grid yet
+            self.assertTrue(load_mete_grid(grid_dir) is None)
+            self.assertTrue(grid_x(10, 100, grid_dir=grid_dir) is None)
+
+            grid = build_mete_grid(grid_dir, max_n_samp=20, max_ratio=100)
+            shape = grid.values.shape
+
+            # Grid values agree with exact solutions
+            for S, N in [(4, 16), (10, 100), (12, 567), (17, 1000)]:
+                tx = grid_x(S, N, grid_dir=grid_dir)
+                self.assertTrue(N * np.abs(tx - mete_x(S, N, method='closed'))
+                                                                      < 1e-6)
+
+            # Off grid points return None
+            self.assertTrue(grid_x(100, 1000, grid_dir=grid_dir) is None)
+            self.assertTrue(grid_x(10, 10000, grid_dir=grid_dir) is None)
+
+            # Extending the grid keeps old values
+            grid2 = build_mete_grid(grid_dir, max_n_samp=40, max_ratio=100)
+            self.assertTrue(grid2.values.shape[0] > shape[0])
+            self.assertTrue(np.array_equal(
+                        np.isnan(grid2.values[:shape[0], :shape[1]]),
+                        np.isnan(grid.values)))
+            self.assertTrue(grid_x(30, 1000, grid_dir=grid_dir) is not None)
+
+            # mete_x uses the default grid and falls back when off grid
+            default_dir = solvers.DEFAULT_GRID_DIR
+            solvers.DEFAULT_GRID_DIR = grid_dir
+            try:
+                self.assertTrue(np.abs(mete_x(30, 1000, method='grid') -
+                                mete_x(30, 1000, method='closed')) < 1e-10)
+                self.assertTrue(mete_x(100, 1e6, method='grid') ==
+                                mete_x(100, 1e6, method='closed'))
+            finally:
+                solvers.DEFAULT_GRID_DIR = default_dir
+        finally:
+            shutil.rmtree(grid_dir)
+
+    def test_tgeo_lambda(self):
+        # Mean of the solved distribution matches N * a
+        N = np.array([1, 2, 10, 60, 340, 1000, 5000])
+        for a in [1e-4, .1, .3, .6, .9, .999]:
+            lam = tgeo_lambda(N, a)
+            for tN, tlam in zip(N, lam):
+                k = np.arange(tN + 1)
+                p = np.exp(tlam * k - tgeo_log_norm(tlam, tN))
+                self.assertTrue(np.abs(np.sum(p) - 1) < 1e-12)
+                self.assertTrue(np.abs(np.sum(k * p) - tN * a) / (tN * a)
+                                                                      < 1e-10)
+
+        # Large N does not overflow
+        mean, var = tgeo_mean_var(tgeo_lambda(1e7, .9), 1e7)
+        self.assertTrue(np.abs(mean - 9e6) / 9e6 < 1e-12)
+
+        # No solution outside 0 < a < 1
+        self.assertTrue(np.all(np.isnan(tgeo_lambda([5, 5, 5], [0, 1, 1.2]))))
+        self.assertTrue(tgeo_lambda(10, .5) == 0)
+
+    def test_mete_sar_steps(self):
+        # Base 2 matches direct summation with Pi(0 | k) = 1 / (k + 1)
+        for S, N in [(4, 16), (34, 1122), (50, 5000)]:
+            k = np.arange(1, N + 1)
+            beta = -np.log(mete_x(S, N, method='sum'))
+            x_k = np.exp(-beta * k)
+            direct = N * np.sum(x_k / (k + 1)) / np.sum(x_k)
+            self.assertTrue(np.abs(mete_downscale_sar(S, N) - direct) / direct
+                                                                      < 1e-8)
+
+        # Other bases match direct summation with the tgeo absence
+        # probabilities, beyond the directly summed terms
+        S, N = 40, 5000
+        beta = -np.log(mete_x(S, N, method='sum'))
+        k = np.arange(1, N + 1.)
+        for base in [3, 4.5]:
+            p0 = np.exp(-tgeo_log_norm(tgeo_lambda(k, 1 / float(base)), k))
+            x_k = np.exp(-beta * k)
+            direct = N * np.sum(x_k / k * (1 - p0)) / np.sum(x_k)
+            self.assertTrue(np.abs(mete_downscale_sar(S, N, base=base) -
+                                   direct) / direct < 1e-8)
+
+        # Upscaling inverts downscaling
+        for base in [2, 3]:
+            for S, N in [(34, 1122), (100, 1e5), (300, 1e10)]:
+                Sbig = mete_upscale_sar(S, N, base=base)
+                self.assertTrue(Sbig > S)
+                self.assertTrue(np.abs(mete_downscale_sar(Sbig, base * N,
+                                                base=base) - S) / S < 1e-10)
+
+        self.assertRaises(ValueError, mete_downscale_sar, 34, 1122, base=1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/python
+
+'''
+A small bounded least-recently-used (LRU) cache.
+
+Used to memoize expensive, repeated calculations (e.g. Lagrange multiplier
+root solves) that are keyed on hashable parameter tuples.
+
+Classes
+-------
+- `LRUCache` -- Bounded mapping that evicts the least recently used entry
+'''
+
+from collections import OrderedDict
+
+__author__ = "Justin Kitzes and Mark Wilber"
+__copyright__ = "Copyright 2012, Regents of the University of California"
+__credits__ = ["John Harte"]
+__license__ = None
+__version__ = "0.1"
+__maintainer__ = "Justin Kitzes and Mark Wilber"
+__email__ = "jkitzes@berkeley.edu"
+__status__ = "Development"
+
+
+class LRUCache(object):
+    '''
+    Bounded cache that discards the least recently used entry when full.
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximum number of entries held in the cache
+    hits : int
+        Number of lookups that found a cached value
+    misses : int
+        Number of lookups that did not find a cached value
+
+    Methods
+    -------
+    get(key, default=None)
+        Returns cached value for key, or default if key is not cached
+    set(key, value)
+        Stores value under key, evicting the oldest entry if needed
+    clear()
+        Removes all entries and resets the hit and miss counters
+    info()
+        Returns a dict with hits, misses, maxsize and currsize
+
+    '''
+
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        '''
+        Look up key, updating the hit and miss counters.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the cached value
+        default : object
+            Returned if key is not in the cache
+
+        Returns
+        -------
+        : object
+            The cached value or default
+
+        '''
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+
+        # Re-insert so that key becomes the most recently used
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        '''
+        Store value under key.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the cached value
+        value : object
+            Value to cache
+
+        '''
+        if key in self._data:
+            self._data.pop(key)
+        elif len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+        self._data[key] = value
+
+    def clear(self):
+        '''
+        Remove all entries and reset the hit and miss counters
+        '''
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        '''
+        Summary of cache usage
+
+        Returns
+        -------
+        : dict
+            Dictionary with keys 'hits', 'misses', 'maxsize' and 'currsize'
+
+        '''
+        return {'hits' : self.hits, 'misses' : self.misses,
+                'maxsize' : self.maxsize, 'currsize' : len(self._data)}
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+'''
+Builds or extends the on-disk lookup grid of the METE Lagrange multiplier
+x = exp(-beta) used by distributions with solver='grid'.
+
+Usage: make_mete_grid.py [-h] [--dir DIR] [--min-s MIN_S] [--max-s MAX_S]
+                         [--min-ratio MIN_RATIO] [--max-ratio MAX_RATIO]
+                         [--step STEP]
+
+If a grid with the same step already exists in DIR, only the new cells are
+solved.
+'''
+
+import argparse
+import time
+from macroeco import solvers
+
+__author__ = "Justin Kitzes and Mark Wilber"
+__copyright__ = "Copyright 2012, Regents of the University of California"
+__credits__ = ["John Harte"]
+__license__ = None
+__version__ = "0.1"
+__maintainer__ = "Justin Kitzes and Mark Wilber"
+__email__ = "jkitzes@berkeley.edu"
+__status__ = "Development"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build or extend the METE ' +
+                                     'x = exp(-beta) lookup grid')
+    parser.add_argument('--dir', default=solvers.DEFAULT_GRID_DIR,
+                        help='Directory of the grid (default %(default)s)')
+    parser.add_argument('--min-s', type=float, default=2,
+                        help='Smallest n_samp (S) on the grid')
+    parser.add_argument('--max-s', type=float, default=1e4,
+                        help='Largest n_samp (S) on the grid')
+    parser.add_argument('--min-ratio', type=float, default=1.1,
+                        help='Smallest tot_obs / n_samp (N / S) on the grid')
+    parser.add_argument('--max-ratio', type=float, default=1e5,
+                        help='Largest tot_obs / n_samp (N / S) on the grid')
+    parser.add_argument('--step', type=float, default=0.05,
+                        help='Grid spacing in log10 units')
+    args = parser.parse_args()
+
+    start = time.time()
+    grid = solvers.build_mete_grid(args.dir, min_n_samp=args.min_s,
+                max_n_samp=args.max_s, min_ratio=args.min_ratio,
+                max_ratio=args.max_ratio, step=args.step)
+    print "Grid of shape %s saved to '%s' in %.1f s" % \
+                    (str(grid.values.shape), grid.path, time.time() - start)
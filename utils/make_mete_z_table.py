@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+
+'''
+Builds the on-disk table of the universal METE SAR slope z against N / S used
+by distributions.mete_universal_z.
+
+Usage: make_mete_z_table.py [-h] [--dir DIR] [--n-samp N_SAMP]
+                            [--min-ratio MIN_RATIO] [--max-ratio MAX_RATIO]
+                            [--step STEP] [--jobs JOBS]
+
+Points are evaluated with distributions.mete_sar_iter in JOBS processes.
+'''
+
+import argparse
+import time
+from macroeco import distributions, solvers
+
+__author__ = "Justin Kitzes and Mark Wilber"
+__copyright__ = "Copyright 2012, Regents of the University of California"
+__credits__ = ["John Harte"]
+__license__ = None
+__version__ = "0.1"
+__maintainer__ = "Justin Kitzes and Mark Wilber"
+__email__ = "jkitzes@berkeley.edu"
+__status__ = "Development"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the universal METE ' +
+                                     'z against N / S table')
+    parser.add_argument('--dir', default=solvers.DEFAULT_GRID_DIR,
+                        help='Directory of the table (default %(default)s)')
+    parser.add_argument('--n-samp', type=float, default=1000,
+                        help='Number of species at which z is evaluated')
+    parser.add_argument('--min-ratio', type=float, default=1.001,
+                        help='Smallest tot_obs / n_samp (N / S) in the table')
+    parser.add_argument('--max-ratio', type=float, default=1e9,
+                        help='Largest tot_obs / n_samp (N / S) in the table')
+    parser.add_argument('--step', type=float, default=0.005,
+                        help='Table spacing in log10 units')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of processes')
+    args = parser.parse_args()
+
+    start = time.time()
+    table = distributions.build_mete_z_table(args.dir, n_samp=args.n_samp,
+                min_ratio=args.min_ratio, max_ratio=args.max_ratio,
+                step=args.step, n_jobs=args.jobs)
+    print "Table of %i points saved to '%s' in %.1f s" % \
+                    (len(table.values), table.path, time.time() - start)